@@ -0,0 +1,54 @@
+"""
+Benchmark the YAML and JSON parser backends against the stdlib/pure-Python ones
+
+Usage:
+    python -m benchmarks.bench_backends [--keys 20000] [--repeat 5]
+"""
+
+import argparse
+import json
+import tempfile
+from pathlib import Path
+
+import yaml
+
+from benchmarks import generators
+from benchmarks.run import time_case
+from sap_config_guard.core import backends
+
+
+def main(argv=None):
+    """Time each available backend on the same synthetic documents"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--keys", type=int, default=20000, help="Leaf values")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case")
+    args = parser.parse_args(argv)
+
+    data = generators.make_nested_config(args.keys, depth=3, list_size=5)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yaml_text = generators.write_config(Path(tmpdir), "yaml", data).read_bytes()
+        json_text = generators.write_config(Path(tmpdir), "json", data).read_bytes()
+
+    cases = {"yaml": [("pyyaml", lambda: yaml.load(yaml_text, Loader=yaml.SafeLoader))]}
+    if backends.YAML_BACKEND == "libyaml":
+        cases["yaml"].append(("libyaml", lambda: backends.load_yaml(yaml_text)))
+    cases["json"] = [
+        (name, lambda loads=loads: loads(json_text))
+        for name, loads in backends.JSON_BACKENDS.items()
+    ]
+
+    print(f"Active: {backends.describe()}")
+    for fmt, variants in cases.items():
+        baseline = None
+        for name, func in variants:
+            best = time_case(func, args.repeat)["best"]
+            baseline = baseline or best
+            print(f"  {fmt:5} {name:8} {best * 1000:9.2f} ms  {baseline / best:5.1f}x")
+
+    # The active backends must parse to the same data as the reference ones
+    assert backends.load_yaml(yaml_text) == yaml.safe_load(yaml_text)
+    assert backends.loads_json(json_text) == json.loads(json_text)
+
+
+if __name__ == "__main__":
+    main()
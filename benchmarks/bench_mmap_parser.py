@@ -0,0 +1,108 @@
+"""
+Benchmark the mmap .env/.properties parser against the previous line loop
+
+Usage:
+    python -m benchmarks.bench_mmap_parser [--megabytes 8] [--repeat 10]
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from sap_config_guard.core import mmap_parser
+
+
+def readline_load_env(file_path):
+    """The line-based _load_env implementation the mmap parser replaced"""
+    config = {}
+    with open(file_path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                value = value.strip("\"'")
+                config[key.strip()] = value
+    return config
+
+
+def readline_load_properties(file_path):
+    """The line-based _load_properties implementation the mmap parser replaced"""
+    config = {}
+    with open(file_path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                config[key.strip()] = value.strip()
+    return config
+
+
+def write_config_file(path, megabytes, quoted):
+    """Write a synthetic config file of roughly the requested size"""
+    target = megabytes * 1024 * 1024
+    written = 0
+    index = 0
+    with open(path, "w") as f:
+        while written < target:
+            value = f"https://host-{index % 97}.example.com/api"
+            if index % 10 == 0:
+                line = f"# section {index}\n"
+            elif quoted:
+                line = f'SAP_PARAM_{index}="{value}"\n'
+            else:
+                line = f"sap.param.{index}={value}\n"
+            f.write(line)
+            written += len(line)
+            index += 1
+
+
+def best_of(func, path, repeat):
+    """Return the fastest of several runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--megabytes", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    cases = {
+        ".env": (
+            True,
+            readline_load_env,
+            mmap_parser.load_env,
+        ),
+        ".properties": (
+            False,
+            readline_load_properties,
+            mmap_parser.load_properties,
+        ),
+    }
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for suffix, (quoted, readline, mapped) in cases.items():
+            path = Path(tmpdir) / f"big{suffix}"
+            write_config_file(path, args.megabytes, quoted)
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+
+            print(f"{suffix} ({size_mb:.1f} MB)")
+            for name, func in (("readline", readline), ("mmap", mapped)):
+                seconds = best_of(func, path, args.repeat)
+                print(
+                    f"  {name:>8}: {seconds * 1000:8.1f} ms  "
+                    f"{size_mb / seconds:7.1f} MB/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Measure CLI startup: import time per module and wall time per command
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 10] [--top 15]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Budget for `import sap_config_guard.cli.main`, also enforced in
+# tests/test_startup.py
+IMPORT_BUDGET_MS = 100
+
+
+def import_times(statement: str) -> List[Tuple[str, int, int]]:
+    """
+    Run a statement under -X importtime
+
+    Returns:
+        List of (module, self microseconds, cumulative microseconds)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:") :].split("|")  # noqa: E203
+        if not fields[0].strip().isdigit():
+            continue  # Header line
+        rows.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+def wall_time(args: List[str], cwd: str, repeat: int) -> float:
+    """Best-of-N wall time of one CLI invocation, in seconds"""
+    cmd = [sys.executable, "-m", "sap_config_guard.cli.main", *args]
+    env: Dict[str, str] = dict(os.environ, SAP_CONFIG_GUARD_CACHE_DIR=cwd)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, env=env, capture_output=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> int:
+    """Report import times and per-command wall times"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per command")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules shown")
+    args = parser.parse_args(argv)
+
+    rows = import_times("import sap_config_guard.cli.main")
+    total = next(cum for name, _, cum in rows if name == "sap_config_guard.cli.main")
+    print(f"import sap_config_guard.cli.main: {total / 1000:.1f} ms")
+    print(f"(budget: {IMPORT_BUDGET_MS} ms)\n\nSlowest modules (self time):")
+    for name, self_us, _ in sorted(rows, key=lambda row: -row[1])[: args.top]:
+        print(f"  {self_us / 1000:7.2f} ms  {name}")
+
+    repo_root = str(Path(__file__).resolve().parent.parent)
+    os.environ["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [repo_root, os.environ.get("PYTHONPATH")])
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / ".env").write_text("SAP_CLIENT=100\n")
+        print("\nWall time per command (best of %d):" % args.repeat)
+        for command in (
+            ["--help"],
+            ["--version"],
+            ["validate", "."],
+            ["diff", ".", "."],
+        ):
+            best = wall_time(command, tmpdir, args.repeat)
+            print(f"  {best * 1000:7.1f} ms  {' '.join(command)}")
+
+    return 0 if total / 1000 <= IMPORT_BUDGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Synthetic configuration generators for the benchmark suite
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+RULE_FAMILIES = ["required", "patterns", "secure", "min_lengths", "forbidden_in_prod"]
+
+
+def make_nested_config(
+    n_keys: int, depth: int = 1, list_size: int = 0, seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Build a nested config dictionary
+
+    Args:
+        n_keys: Number of leaf values
+        depth: Nesting depth of each leaf (1 = flat)
+        list_size: If > 0, every tenth leaf is a list of this many items
+        seed: Random seed for reproducible values
+
+    Returns:
+        Nested dictionary with n_keys leaves
+    """
+    rng = random.Random(seed)
+    data: Dict[str, Any] = {}
+    for index in range(n_keys):
+        node = data
+        for level in range(depth - 1):
+            node = node.setdefault(f"GROUP{level}_{index % (7 + level)}", {})
+        if list_size and index % 10 == 0:
+            value: Any = [f"item{i}" for i in range(list_size)]
+        else:
+            value = f"https://host-{rng.randrange(97)}.example.com/api/{index}"
+        node[f"SAP_PARAM_{index}"] = value
+    return data
+
+
+def flat_config(n_keys: int, seed: int = 0) -> Dict[str, str]:
+    """Build a flat config dictionary of string values"""
+    return make_nested_config(n_keys, depth=1, seed=seed)
+
+
+def write_config(directory: Path, fmt: str, data: Dict[str, Any]) -> Path:
+    """
+    Write a config dictionary in the given format
+
+    Args:
+        directory: Target directory
+        fmt: One of env, properties, yaml, json
+        data: Config data (nested data is only meaningful for yaml/json)
+
+    Returns:
+        Path to the written file
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    if fmt == "env":
+        path = directory / "config.env"
+        path.write_text("".join(f'{k}="{v}"\n' for k, v in data.items()))
+    elif fmt == "properties":
+        path = directory / "config.properties"
+        path.write_text("".join(f"{k}={v}\n" for k, v in data.items()))
+    elif fmt == "yaml":
+        path = directory / "config.yaml"
+        path.write_text(yaml.safe_dump(data))
+    elif fmt == "json":
+        path = directory / "config.json"
+        path.write_text(json.dumps(data))
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+    return path
+
+
+def make_schema(family: str, n_rules: int, keys: List[str]) -> Dict[str, Any]:
+    """
+    Build a schema exercising a single rule family
+
+    Args:
+        family: One of RULE_FAMILIES
+        n_rules: Number of rules (or forbidden terms)
+        keys: Config keys the rules may reference
+
+    Returns:
+        Schema dictionary
+    """
+    targets = keys[:n_rules]
+    schema: Dict[str, Any] = {}
+    if family == "required" or family == "secure":
+        schema[family] = targets
+    elif family == "patterns":
+        schema[family] = {key: r"^https://[a-z0-9.-]+/api/\d+$" for key in targets}
+    elif family == "min_lengths":
+        schema[family] = {key: 12 for key in targets}
+    elif family == "forbidden_in_prod":
+        schema[family] = [f"forbidden-host-{i}.internal" for i in range(n_rules)]
+        schema[family] += ["localhost", "mock"]
+    else:
+        raise ValueError(f"Unknown rule family: {family}")
+    return schema
+
+
+def write_environments(
+    root: Path, n_envs: int, n_keys: int, drift_ratio: float = 0.05, seed: int = 0
+) -> Dict[str, Path]:
+    """
+    Write n_envs .env directories that mostly agree
+
+    Args:
+        root: Directory to create environments in
+        n_envs: Number of environments
+        n_keys: Keys per environment
+        drift_ratio: Fraction of keys that differ or go missing per environment
+        seed: Random seed
+
+    Returns:
+        Dictionary mapping environment names to their directories
+    """
+    rng = random.Random(seed)
+    base = flat_config(n_keys, seed=seed)
+    env_paths = {}
+    for env_index in range(n_envs):
+        config = dict(base)
+        for key in rng.sample(list(base), int(n_keys * drift_ratio)):
+            if rng.random() < 0.5:
+                del config[key]
+            else:
+                config[key] = f"{config[key]}-env{env_index}"
+        env_dir = root / f"env{env_index}"
+        write_config(env_dir, "env", config)
+        env_paths[f"env{env_index}"] = env_dir
+    return env_paths
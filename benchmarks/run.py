@@ -0,0 +1,208 @@
+"""
+Benchmark the loader, validator and diff hot paths
+
+Each case is timed best-of-N on synthetic configs from benchmarks.generators
+and reported as JSON. Given a stored baseline, any case that got slower
+than the tolerance allows fails the run.
+
+Usage:
+    python -m benchmarks.run [--keys 20000] [--repeat 5] [--quick]
+                             [--output results.json]
+                             [--baseline baseline.json] [--tolerance 0.25]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks import generators
+from sap_config_guard import __version__
+from sap_config_guard.core.compiled import CompiledSchema
+from sap_config_guard.core.loader import ConfigLoader
+from sap_config_guard.core.schema import ConfigSchema
+from sap_config_guard.core.validator import ConfigValidator
+from sap_config_guard.diff.env_diff import EnvironmentDiff
+
+Case = Tuple[str, Callable[[], Any]]
+
+FORMATS = ["env", "properties", "yaml", "json"]
+
+
+def time_case(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Run func repeat times with the GC paused and report best and mean"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return {"best": min(timings), "mean": sum(timings) / len(timings)}
+
+
+def build_cases(root: Path, params: Dict[str, int]) -> List[Case]:
+    """
+    Generate the synthetic inputs and the callables that exercise them
+
+    Args:
+        root: Scratch directory for generated files
+        params: Generator parameters (keys, depth, list_size, envs, terms)
+
+    Returns:
+        List of (case name, callable) pairs
+    """
+    cases: List[Case] = []
+    n_keys = params["keys"]
+
+    # Loader, one case per format
+    flat = generators.flat_config(n_keys)
+    nested = generators.make_nested_config(
+        n_keys, depth=params["depth"], list_size=params["list_size"]
+    )
+    for fmt in FORMATS:
+        data = nested if fmt in ("yaml", "json") else flat
+        path = generators.write_config(root / f"load_{fmt}", fmt, data)
+        cases.append((f"loader.{fmt}", lambda p=path: ConfigLoader.load_from_path(p)))
+
+    # Validator, one case per rule family on the same flat config
+    env_dir = root / "load_env"
+    keys = list(flat)
+    for family in generators.RULE_FAMILIES:
+        schema = ConfigSchema()
+        schema.schema = generators.make_schema(family, params["terms"], keys)
+        schema.invalidate()
+        validator = ConfigValidator(schema=schema)
+        cases.append(
+            (
+                f"validator.{family}",
+                lambda v=validator: v.validate(env_dir, environment="prod"),
+            )
+        )
+
+    # Rule evaluation alone, without parsing, for all families at once
+    combined: Dict[str, Any] = {}
+    for family in generators.RULE_FAMILIES:
+        combined.update(generators.make_schema(family, params["terms"], keys))
+    plan = CompiledSchema(combined)
+    cases.append(("validator.plan_check", lambda: plan.check(flat, production=True)))
+
+    # Environment diff
+    env_paths = generators.write_environments(root / "envs", params["envs"], n_keys)
+    cases.append(
+        (
+            "diff.compare_environments",
+            lambda: EnvironmentDiff.compare_environments(env_paths),
+        )
+    )
+
+    return cases
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    """
+    Compare best timings against a baseline
+
+    Args:
+        current: Results of this run
+        baseline: Results of the stored baseline
+        tolerance: Allowed slowdown as a fraction (0.25 = 25% slower)
+
+    Returns:
+        Names of the cases that regressed
+    """
+    regressions = []
+    for name, timing in current.items():
+        if name not in baseline:
+            continue
+        ratio = timing["best"] / baseline[name]["best"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:32} {ratio:6.2f}x{flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Run the benchmark suite"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--keys", type=int, default=20000, help="Keys per config")
+    parser.add_argument("--depth", type=int, default=3, help="Nesting depth")
+    parser.add_argument("--list-size", type=int, default=5, help="List length")
+    parser.add_argument("--envs", type=int, default=4, help="Environments to diff")
+    parser.add_argument(
+        "--terms", type=int, default=200, help="Rules or forbidden terms per family"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case")
+    parser.add_argument(
+        "--quick", action="store_true", help="Small inputs, for smoke testing"
+    )
+    parser.add_argument("--output", "-o", help="Write JSON results to this file")
+    parser.add_argument("--baseline", "-b", help="Baseline JSON to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown vs. baseline before failing (default: 0.25)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.keys, args.terms, args.repeat = 1000, 20, 2
+    params = {
+        "keys": args.keys,
+        "depth": args.depth,
+        "list_size": args.list_size,
+        "envs": args.envs,
+        "terms": args.terms,
+    }
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, func in build_cases(Path(tmpdir), params):
+            results[name] = time_case(func, args.repeat)
+            print(f"{name:34} {results[name]['best'] * 1000:10.2f} ms", file=sys.stderr)
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "params": params,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("params") != params:
+            print(
+                "Warning: baseline was recorded with different params", file=sys.stderr
+            )
+        print(f"\nCompared to {args.baseline}:", file=sys.stderr)
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed", file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
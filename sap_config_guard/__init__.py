@@ -6,7 +6,31 @@ detection for SAP landscapes
 __version__ = "0.1.0"
 __author__ = "SAP Community"
 
-from sap_config_guard.core.validator import validate
-from sap_config_guard.diff.env_diff import compare_environments
+__all__ = [
+    "validate",
+    "compare_environments",
+    "async_validate",
+    "async_compare_environments",
+]
 
-__all__ = ["validate", "compare_environments"]
+
+def __getattr__(name):
+    # Import the validator and diff engine only when first used, so the
+    # CLI and submodule imports do not pay for both
+    if name == "validate":
+        from sap_config_guard.core.validator import validate
+
+        return validate
+    if name == "compare_environments":
+        from sap_config_guard.diff.env_diff import compare_environments
+
+        return compare_environments
+    if name == "async_validate":
+        from sap_config_guard.core.validator import async_validate
+
+        return async_validate
+    if name == "async_compare_environments":
+        from sap_config_guard.diff.env_diff import async_compare_environments
+
+        return async_compare_environments
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,218 @@
+"""
+Output formats for validate and diff results
+
+Every writer emits each result as soon as it is given one, so reports of
+any size are streamed to the output rather than built up in memory.
+"""
+
+import json
+from typing import IO, Any, Dict, Type
+from xml.sax.saxutils import escape, quoteattr
+
+from sap_config_guard import __version__
+
+FORMATS = ("text", "jsonl", "json", "sarif", "junit")
+
+_SARIF_LEVELS = {"error": "error", "warning": "warning", "info": "note"}
+_DIFF_LEVELS = {"missing": "error", "different": "warning", "same": "info"}
+
+
+class ReportWriter:
+    """
+    Base class for result writers
+
+    Call begin() once, write() for each result, then end() with a summary
+    of counts. kind is "validate" (ValidationResult items) or "diff"
+    (DiffResult items), and target names what was checked.
+    """
+
+    def __init__(self, stream: IO[str], kind: str, target: str):
+        self.stream = stream
+        self.kind = kind
+        self.target = target
+        self.count = 0
+
+    def begin(self) -> None:
+        """Write anything that precedes the first result"""
+
+    def write(self, item: Any) -> None:
+        """Write one result"""
+        self.count += 1
+        self._write(item)
+
+    def end(self, summary: Dict[str, Any]) -> None:
+        """Write anything that follows the last result"""
+        self.stream.flush()
+
+    def _write(self, item: Any) -> None:
+        raise NotImplementedError
+
+    def _level(self, item: Any) -> str:
+        """Get the severity of a result as error, warning or info"""
+        if self.kind == "diff":
+            return _DIFF_LEVELS[item.status]
+        return item.level.value
+
+    def _rule(self, item: Any) -> str:
+        """Get the rule id of a result"""
+        if self.kind == "diff":
+            return f"drift-{item.status}"
+        return item.rule
+
+
+class TextWriter(ReportWriter):
+    """Human-readable output, as printed by earlier versions"""
+
+    def _write(self, item: Any) -> None:
+        if self.kind == "validate":
+            print(item, file=self.stream, flush=True)
+            return
+        from sap_config_guard.diff.env_diff import EnvironmentDiff
+
+        if self.count == 1:
+            print("⚠️  Drift detected:\n", file=self.stream)
+        print(EnvironmentDiff.format_diff_line(item), file=self.stream)
+
+    def end(self, summary: Dict[str, Any]) -> None:
+        if not self.count:
+            if self.kind == "validate":
+                print("✅ Configuration is valid!", file=self.stream)
+            else:
+                print("✅ No differences detected", file=self.stream)
+        super().end(summary)
+
+
+class JsonLinesWriter(ReportWriter):
+    """One JSON object per line: each result, then a summary"""
+
+    def _write(self, item: Any) -> None:
+        record = dict(item.to_dict(), message=item.message, type="result")
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+    def end(self, summary: Dict[str, Any]) -> None:
+        record = dict(summary, type="summary", target=self.target)
+        self.stream.write(json.dumps(record) + "\n")
+        super().end(summary)
+
+
+class JsonWriter(ReportWriter):
+    """A single JSON document, written a result at a time"""
+
+    def begin(self) -> None:
+        self.stream.write(
+            f'{{"tool": "sap-config-guard", "version": {json.dumps(__version__)}, '
+            f'"command": {json.dumps(self.kind)}, '
+            f'"target": {json.dumps(self.target)}, "results": ['
+        )
+
+    def _write(self, item: Any) -> None:
+        record = dict(item.to_dict(), message=item.message)
+        separator = "\n  " if self.count == 1 else ",\n  "
+        self.stream.write(separator + json.dumps(record))
+
+    def end(self, summary: Dict[str, Any]) -> None:
+        self.stream.write(f'\n], "summary": {json.dumps(summary)}}}\n')
+        super().end(summary)
+
+
+class SarifWriter(ReportWriter):
+    """SARIF 2.1.0 log with one run, for code-scanning dashboards"""
+
+    def begin(self) -> None:
+        driver = {
+            "name": "sap-config-guard",
+            "version": __version__,
+            "informationUri": "https://github.com/upendra-manike/sap-config-guard",
+        }
+        # Left open at the results array so results can follow one by one
+        self.stream.write(
+            '{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", '
+            '"version": "2.1.0", '
+            f'"runs": [{{"tool": {json.dumps({"driver": driver})}, "results": ['
+        )
+
+    def _write(self, item: Any) -> None:
+        result: Dict[str, Any] = {
+            "ruleId": self._rule(item),
+            "level": _SARIF_LEVELS[self._level(item)],
+            "message": {"text": item.message},
+            "properties": item.to_dict(),
+        }
+        if self.kind == "validate":
+            result["locations"] = [
+                {"physicalLocation": {"artifactLocation": {"uri": self.target}}}
+            ]
+        separator = "\n  " if self.count == 1 else ",\n  "
+        self.stream.write(separator + json.dumps(result))
+
+    def end(self, summary: Dict[str, Any]) -> None:
+        self.stream.write(f'\n], "properties": {json.dumps(summary)}}}]}}\n')
+        super().end(summary)
+
+
+class JUnitWriter(ReportWriter):
+    """
+    JUnit XML, one test case per result
+
+    Validation errors and every drifting key are failures; validation
+    warnings and info are passing test cases with the message in
+    system-out. A run without results gets one passing
+    test case so the suite is never empty.
+    """
+
+    def begin(self) -> None:
+        self.stream.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<testsuites name="sap-config-guard">\n'
+            f"  <testsuite name={quoteattr(f'{self.kind}: {self.target}')}>\n"
+        )
+
+    def _write(self, item: Any) -> None:
+        case = (
+            f"    <testcase classname={quoteattr(self._rule(item))} "
+            f"name={quoteattr(item.key)}>"
+        )
+        if self.kind == "diff":
+            failed = item.status != "same"
+        else:
+            failed = self._level(item) == "error"
+        if failed:
+            body = f'<failure type="error" message={quoteattr(item.message)}/>'
+        else:
+            body = f"<system-out>{escape(item.message)}</system-out>"
+        self.stream.write(f"{case}{body}</testcase>\n")
+
+    def end(self, summary: Dict[str, Any]) -> None:
+        if not self.count:
+            self.stream.write(
+                f"    <testcase classname={quoteattr(self.kind)} "
+                f"name={quoteattr(self.target)}/>\n"
+            )
+        self.stream.write("  </testsuite>\n</testsuites>\n")
+        super().end(summary)
+
+
+_WRITERS: Dict[str, Type[ReportWriter]] = {
+    "text": TextWriter,
+    "jsonl": JsonLinesWriter,
+    "json": JsonWriter,
+    "sarif": SarifWriter,
+    "junit": JUnitWriter,
+}
+
+
+def get_writer(fmt: str, stream: IO[str], kind: str, target: str) -> ReportWriter:
+    """
+    Create the writer for an output format
+
+    Args:
+        fmt: One of FORMATS
+        stream: Text stream to write to
+        kind: "validate" or "diff"
+        target: What was checked (config path or environment list)
+
+    Returns:
+        ReportWriter for the format
+    """
+    return _WRITERS[fmt](stream, kind, target)
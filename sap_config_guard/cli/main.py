@@ -3,11 +3,27 @@ CLI entry point for sap-config-guard
 """
 
 import sys
+import time
 import argparse
 from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from sap_config_guard.core.validator import ConfigValidator
-from sap_config_guard.diff.env_diff import EnvironmentDiff
+from sap_config_guard import __version__
+
+# Subsystems are imported inside the commands that use them, so --help and
+# simple runs do not pay for parsers, pools and the diff engine up front.
+if TYPE_CHECKING:
+    from sap_config_guard.core.schema import ConfigSchema
+
+
+def _load_schema(args) -> "ConfigSchema":
+    """Load the --schema file (or the default), via the compiled-schema cache"""
+    from sap_config_guard.core.cache import SchemaCache
+    from sap_config_guard.core.schema import ConfigSchema
+
+    schema_path = Path(args.schema) if args.schema else None
+    cache = None if args.no_cache else SchemaCache()
+    return ConfigSchema(schema_path, cache=cache)
 
 
 def validate_command(args):
@@ -18,21 +34,51 @@ def validate_command(args):
         print(f"❌ Error: Config path not found: {config_path}")
         sys.exit(1)
 
-    schema_path = Path(args.schema) if args.schema else None
-    validator = ConfigValidator(schema_path=schema_path)
+    if args.recursive and (args.watch or args.stream):
+        print("❌ Error: --recursive cannot be combined with --watch or --stream")
+        sys.exit(1)
+
+    if not (
+        args.no_server or args.watch or args.stream or args.recursive or args.profile
+    ):
+        response = _forward(
+            "validate",
+            config_path=str(config_path.resolve()),
+            schema=str(Path(args.schema).resolve()) if args.schema else None,
+            environment=args.environment,
+            fail_on_warning=args.fail_on_warning,
+            fail_fast=args.fail_fast,
+        )
+        if response is not None:
+            _print_forwarded_results(args, response)
+
+    from sap_config_guard.core.cache import ResultCache
+    from sap_config_guard.core.validator import ConfigValidator
+
+    schema = _load_schema(args)
+
+    if args.watch:
+        if args.format != "text":
+            print("❌ Error: --watch only supports --format text")
+            sys.exit(1)
+        watch_command(args, ConfigValidator(schema=schema), config_path)
+
+    if args.stream:
+        stream_command(args, ConfigValidator(schema=schema), config_path)
+
+    cache = None if args.no_cache else ResultCache()
+    loader = _tree_loader(args)
+    validator = ConfigValidator(schema=schema, cache=cache, loader=loader)
 
     results, is_valid = validator.validate(
         config_path=config_path,
         environment=args.environment,
         fail_on_warning=args.fail_on_warning,
+        fail_fast=args.fail_fast,
     )
 
-    # Print results
-    if results:
-        for result in results:
-            print(result)
-    else:
-        print("✅ Configuration is valid!")
+    _write_validation(args, results)
+    _print_timings(args, loader)
 
     # Exit with appropriate code
     if not is_valid:
@@ -41,12 +87,239 @@ def validate_command(args):
         sys.exit(0)
 
 
-def diff_command(args):
-    """Execute diff command"""
+def _tree_loader(args):
+    """Build a recursive loader for --recursive, else return None"""
+    if not args.recursive:
+        return None
+    from sap_config_guard.core import discovery
+
+    return discovery.TreeLoader(
+        include=args.include or discovery.DEFAULT_INCLUDE,
+        exclude=discovery.DEFAULT_EXCLUDE + tuple(args.exclude or ()),
+        workers=args.parse_workers,
+    )
+
+
+def _print_timings(args, loader):
+    """Print the per-file load timings of a recursive loader on stderr"""
+    if args.timings and loader is not None:
+        print(f"\nSlowest files:\n{loader.report(limit=20)}", file=sys.stderr)
+
+
+def _forward(command: str, **arguments) -> Optional[dict]:
+    """
+    Send a request to the resident server, if one is running
+
+    Returns:
+        The server's response, or None if there is no server to ask
+    """
+    from sap_config_guard.server.client import ServerClient
+
+    client = ServerClient.connect()
+    if client is None:
+        return None
+    try:
+        with client:
+            response = client.request(command, **arguments)
+    except (OSError, ValueError):
+        return None
+    if not response.get("ok"):
+        print(f"❌ Error: {response.get('error')}")
+        sys.exit(1)
+    return response
+
+
+def _print_forwarded_results(args, response: dict):
+    """Print validation results received from the server and exit"""
+    from sap_config_guard.core.results import ValidationResult
+
+    results = map(ValidationResult.from_dict, response["results"])
+    is_valid = _write_validation(args, results)
+    sys.exit(0 if is_valid else 1)
+
+
+def stream_command(args, validator, config_path):
+    """Validate while parsing, printing each result as it is found"""
+    results = validator.iter_validate(config_path, environment=args.environment)
+    is_valid = _write_validation(args, results)
+    sys.exit(0 if is_valid else 1)
+
+
+def _write_validation(args, results) -> bool:
+    """
+    Write validation results in the --format chosen, as they arrive
+
+    Stops consuming results at the first failure with --fail-fast.
+
+    Returns:
+        True if the results make the config valid
+    """
+    from sap_config_guard.cli.formats import get_writer
+    from sap_config_guard.core.results import ValidationLevel
+
+    writer = get_writer(args.format, sys.stdout, "validate", args.config_path)
+    writer.begin()
+    errors = warnings = 0
+    for result in results:
+        if result.level == ValidationLevel.ERROR:
+            errors += 1
+        elif result.level == ValidationLevel.WARNING:
+            warnings += 1
+        writer.write(result)
+        if args.fail_fast and (errors or (args.fail_on_warning and warnings)):
+            break
+
+    is_valid = not errors and (not args.fail_on_warning or not warnings)
+    writer.end({"errors": errors, "warnings": warnings, "is_valid": is_valid})
+    return is_valid
+
+
+def watch_command(args, validator, config_path):
+    """Validate, then keep re-validating as the config changes"""
+    from sap_config_guard.core.watch import ConfigWatcher
+
+    watcher = ConfigWatcher(
+        validator,
+        config_path,
+        environment=args.environment,
+        fail_on_warning=args.fail_on_warning,
+        interval=args.interval,
+    )
+
+    def report(update):
+        stamp = time.strftime("%H:%M:%S")
+        print(f"[{stamp}] {len(update.changed_keys)} key(s) changed")
+        for result in update.results:
+            print(result)
+        if update.is_valid:
+            print("✅ Configuration is valid!")
+        else:
+            print("❌ Configuration is invalid")
+        sys.stdout.flush()
+
+    print(f"👀 Watching {config_path} (Ctrl+C to stop)")
+    try:
+        watcher.run(report)
+    except KeyboardInterrupt:
+        pass
+    sys.exit(0)
+
+
+def _expand_targets(patterns: List[str], manifest: Optional[str] = None) -> List[Path]:
+    """
+    Expand glob patterns and manifest entries into target paths
+
+    Manifest files list one path or glob per line; blank lines and lines
+    starting with '#' are ignored, and relative entries are resolved
+    against the manifest's directory.
+    """
+    import glob
+
+    entries = list(patterns)
+    if manifest:
+        manifest_path = Path(manifest)
+        for line in manifest_path.read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                entry = Path(line)
+                if not entry.is_absolute():
+                    entry = manifest_path.parent / entry
+                entries.append(str(entry))
+
+    targets = []
+    seen = set()
+    for entry in entries:
+        matches = sorted(glob.glob(entry, recursive=True))
+        if not matches and not glob.has_magic(entry):
+            matches = [entry]
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                targets.append(Path(match))
+    return targets
+
+
+def validate_many_command(args):
+    """Execute validate-many command"""
+    from sap_config_guard.core.cache import ResultCache
+    from sap_config_guard.core.validator import ConfigValidator
+
+    try:
+        targets = _expand_targets(args.targets, args.manifest)
+    except OSError as e:
+        print(f"❌ Error: Cannot read manifest: {e}")
+        sys.exit(1)
+
+    if not targets:
+        print("❌ Error: No config targets matched")
+        sys.exit(1)
+
+    cache = None if args.no_cache else ResultCache()
+    validator = ConfigValidator(schema=_load_schema(args), cache=cache)
+
+    failed = 0
+    for config_path, results, is_valid in validator.validate_many(
+        targets,
+        environment=args.environment,
+        fail_on_warning=args.fail_on_warning,
+        workers=args.workers,
+        fail_fast=args.fail_fast,
+    ):
+        if not is_valid:
+            failed += 1
+        print(f"{'✅' if is_valid else '❌'} {config_path}")
+        for result in results:
+            print(f"  {result}")
+        sys.stdout.flush()
+
+    print(f"\nValidated {len(targets)} targets: {failed} failed")
+    sys.exit(1 if failed else 0)
+
+
+def schema_command(args):
+    """Execute schema command"""
+    from sap_config_guard.core.cache import SchemaCache
+    from sap_config_guard.core.schema import ConfigSchema
+
+    schema_path = Path(args.schema_path)
+    if not schema_path.is_file():
+        print(f"❌ Error: Schema file not found: {schema_path}")
+        sys.exit(1)
+
+    cache = SchemaCache()
+    content = schema_path.read_bytes()
+    try:
+        schema = ConfigSchema(schema_path)
+        plan = schema.compile()
+    except Exception as e:
+        print(f"❌ Error: Invalid schema: {e}")
+        sys.exit(1)
+
+    entry = cache.put(content, schema.schema, plan)
+    if entry is None:
+        print(f"❌ Error: Cannot write to cache directory: {cache.directory}")
+        sys.exit(1)
+    print(f"✅ Compiled {len(plan.key_rules)} key rules to {entry}")
+    sys.exit(0)
+
+
+def cache_command(args):
+    """Execute cache command"""
+    from sap_config_guard.core.cache import ResultCache, SchemaCache
+
+    if args.cache_action == "clear":
+        removed = ResultCache().clear()
+        schemas = SchemaCache().clear()
+        print(f"✅ Removed {removed} cached results and {schemas} compiled schemas")
+    sys.exit(0)
+
+
+def _parse_env_paths(arguments: List[str]) -> Dict[str, Path]:
+    """Parse name=path (or name:path, or bare path) environment arguments"""
     env_paths = {}
 
     # Parse environment paths
-    for env_arg in args.environments:
+    for env_arg in arguments:
         if "=" in env_arg:
             env_name, env_path = env_arg.split("=", 1)
             env_paths[env_name] = Path(env_path)
@@ -62,14 +335,19 @@ def diff_command(args):
                 env_paths[env_name] = env_path
 
     # If only paths provided without names, use positional args
-    if len(args.environments) == len(env_paths) and all(
-        "=" not in arg and ":" not in arg for arg in args.environments
+    if len(arguments) == len(env_paths) and all(
+        "=" not in arg and ":" not in arg for arg in arguments
     ):
         # Assume they're in order: dev, qa, prod
-        env_names = ["dev", "qa", "prod"][: len(args.environments)]
-        env_paths = {
-            name: Path(path) for name, path in zip(env_names, args.environments)
-        }
+        env_names = ["dev", "qa", "prod"][: len(arguments)]
+        env_paths = {name: Path(path) for name, path in zip(env_names, arguments)}
+
+    return env_paths
+
+
+def diff_command(args):
+    """Execute diff command"""
+    env_paths = _parse_env_paths(args.environments)
 
     # Validate paths exist
     for env_name, env_path in env_paths.items():
@@ -77,12 +355,52 @@ def diff_command(args):
             print(f"❌ Error: Environment path not found: " f"{env_name} -> {env_path}")
             sys.exit(1)
 
-    # Compare environments
-    results = EnvironmentDiff.compare_environments(env_paths)
+    # Compare environments, on the resident server if one is running
+    response = None
+    if not (args.no_server or args.recursive or args.profile):
+        response = _forward(
+            "diff",
+            environments={
+                name: str(path.resolve()) for name, path in env_paths.items()
+            },
+            jobs=args.jobs,
+        )
+    from sap_config_guard.diff.env_diff import DiffResult, EnvironmentDiff
+
+    if response is not None:
+        results = [
+            DiffResult(
+                item["key"],
+                item["environments"],
+                item["status"],
+                missing_in=tuple(item["missing_in"]),
+            )
+            for item in response["results"]
+        ]
+        errors = response["errors"]
+    else:
+        errors = {}
+        loader = _tree_loader(args)
+        results = EnvironmentDiff.compare_environments(
+            env_paths, loader=loader, jobs=args.jobs, errors=errors
+        )
+        _print_timings(args, loader)
+    _print_load_errors(errors)
+
+    # Write each result as it is formatted, never the whole report at once
+    from sap_config_guard.cli.formats import get_writer
 
-    # Format and print
-    output = EnvironmentDiff.format_diff_results(results, show_same=args.show_same)
-    print(output)
+    target = " ".join(f"{name}={path}" for name, path in env_paths.items())
+    writer = get_writer(args.format, sys.stdout, "diff", target)
+    writer.begin()
+    counts = {"missing": 0, "different": 0}
+    for result in results:
+        if result.status in counts:
+            counts[result.status] += 1
+        elif not args.show_same:
+            continue
+        writer.write(result)
+    writer.end(dict(counts, drift=any(counts.values())))
 
     # Exit with error if drift detected
     if results and any(r.status in ["missing", "different"] for r in results):
@@ -92,6 +410,158 @@ def diff_command(args):
         sys.exit(0)
 
 
+def snapshot_command(args):
+    """Execute snapshot command"""
+    from sap_config_guard.diff.snapshot import Snapshot
+
+    snapshot_path = Path(args.snapshot)
+    env_paths = _parse_env_paths(args.environments)
+
+    previous = None
+    if snapshot_path.exists():
+        try:
+            previous = Snapshot.load(snapshot_path)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error: Cannot read snapshot: {e}")
+            sys.exit(1)
+
+    if args.snapshot_action == "save":
+        if not env_paths:
+            print("❌ Error: No environments given")
+            sys.exit(1)
+        snapshot, errors = Snapshot.capture(
+            env_paths, previous=previous, jobs=args.jobs
+        )
+        _print_load_errors(errors)
+        if errors:
+            sys.exit(1)
+        snapshot.save(snapshot_path)
+        keys = sum(len(snapshot.key_hashes(env)) for env in snapshot.environments)
+        print(
+            f"✅ Saved {len(snapshot.environments)} environments ({keys} keys) "
+            f"to {snapshot_path}"
+        )
+        sys.exit(0)
+
+    # compare
+    if previous is None:
+        print(f"❌ Error: Snapshot not found: {snapshot_path}")
+        sys.exit(1)
+    if not env_paths:
+        env_paths = previous.paths()
+    live, errors = Snapshot.capture(env_paths, previous=previous, jobs=args.jobs)
+    _print_load_errors(errors)
+    try:
+        drift = previous.compare(live)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    # Environments that failed to load were already reported above
+    drift = [d for d in drift if d.key is not None or d.environment not in errors]
+
+    if drift:
+        print("⚠️  Drift since baseline:\n")
+        for change in drift:
+            icon = "❌" if change.status == "removed" else "⚠️ "
+            print(f"  {icon} {change.message}")
+    else:
+        print("✅ No drift since baseline")
+
+    stats = live.stats
+    print(
+        f"\n{stats['reused']} files unchanged, {stats['rehashed']} re-hashed, "
+        f"{stats['parsed']} re-parsed",
+        file=sys.stderr,
+    )
+    sys.exit(1 if errors or (drift and args.fail_on_drift) else 0)
+
+
+def serve_command(args):
+    """Execute serve command"""
+    import signal
+    import threading
+
+    from sap_config_guard.server.client import default_socket_path
+    from sap_config_guard.server.service import (
+        LocalHTTPServer,
+        UnixSocketServer,
+        ValidationService,
+    )
+
+    service = ValidationService()
+    # Compile the default (or given) schema before accepting requests
+    service.validator(args.schema)
+
+    servers = []
+    try:
+        if args.port is not None:
+            servers.append(LocalHTTPServer(args.port, service))
+            print(f"🛰️  Listening on http://127.0.0.1:{servers[-1].server_port}")
+            print(f"🔑 Bearer token in {servers[-1].token_path}")
+        if not args.no_socket:
+            socket_path = Path(args.socket) if args.socket else default_socket_path()
+            servers.append(UnixSocketServer(socket_path, service))
+            print(f"🛰️  Listening on {socket_path}")
+    except OSError as e:
+        print(f"❌ Error: Cannot start server: {e}")
+        sys.exit(1)
+    if not servers:
+        print("❌ Error: Nothing to listen on (give --port or drop --no-socket)")
+        sys.exit(1)
+    sys.stdout.flush()
+
+    # Exit through the finally below, which removes the socket file
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    for server in servers[:-1]:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        servers[-1].serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.server_close()
+    sys.exit(0)
+
+
+def _print_load_errors(errors):
+    """Report per-environment load errors on stderr"""
+    for env_name, error in errors.items():
+        print(f"⚠️  Failed to load {env_name} config: {error}", file=sys.stderr)
+
+
+def _version_string() -> str:
+    """Describe the package version and the active parser backends"""
+    from sap_config_guard.core import backends
+
+    details = ", ".join(f"{fmt}: {name}" for fmt, name in backends.describe().items())
+    return f"sap-config-guard {__version__} ({details})"
+
+
+class _VersionAction(argparse.Action):
+    """--version that only looks up the parser backends when asked"""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, **kwargs):
+        super().__init__(option_strings, dest, nargs=0, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        print(_version_string())
+        parser.exit()
+
+
+def _run_profiled(args) -> None:
+    """Run a command under a Profiler and print its report on stderr"""
+    from sap_config_guard.core.profiling import Profiler
+
+    with Profiler() as profiler:
+        start = time.perf_counter()
+        try:
+            args.func(args)
+        finally:
+            profiler.add_time("total", time.perf_counter() - start)
+            print(profiler.report(args.profile_format), file=sys.stderr)
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -111,14 +581,33 @@ Examples:
   # Validate production with strict mode
   sap-config-guard validate ./config/prod --environment prod --fail-on-warning
 
+  # Re-validate on every save
+  sap-config-guard validate ./config/dev --watch
+
+  # Validate many targets in parallel
+  sap-config-guard validate-many "./clients/*/config" --workers 8
+
   # Compare environments
   sap-config-guard diff dev=./config/dev qa=./config/qa prod=./config/prod
 
   # Compare environments (positional)
   sap-config-guard diff ./config/dev ./config/qa ./config/prod
+
+  # Record a baseline, then report drift against it
+  sap-config-guard snapshot save baseline.snap dev=./config/dev prod=./config/prod
+  sap-config-guard snapshot compare baseline.snap
+
+  # Keep schemas and parsed configs warm; validate/diff forward to it
+  sap-config-guard serve &
         """,
     )
 
+    parser.add_argument(
+        "--version",
+        action=_VersionAction,
+        help="Show version and active parser backends, then exit",
+    )
+
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
     # Validate command
@@ -137,8 +626,158 @@ Examples:
         action="store_true",
         help="Treat warnings as errors",
     )
+    validate_parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first error (or warning with --fail-on-warning), "
+        "running the cheapest rules first",
+    )
+    validate_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the result cache",
+    )
+    validate_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Validate while parsing and print results as they are found "
+        "(bounded memory for very large .env/.properties files)",
+    )
+    validate_parser.add_argument(
+        "--watch",
+        "-w",
+        action="store_true",
+        help="Keep running and re-validate whenever the config changes",
+    )
+    validate_parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between change checks in watch mode (default: 0.5)",
+    )
+    validate_parser.add_argument(
+        "--no-server",
+        action="store_true",
+        help="Run locally even if a resident server is running",
+    )
+    validate_parser.add_argument(
+        "--format",
+        "-f",
+        default="text",
+        choices=["text", "jsonl", "json", "sarif", "junit"],  # formats.FORMATS
+        help="Output format (default: text)",
+    )
+    validate_parser.add_argument(
+        "--recursive",
+        "-r",
+        action="store_true",
+        help="Load config files from every subdirectory; deeper files override "
+        "their parents'",
+    )
+    validate_parser.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help="With --recursive, load only matching files (repeatable; default: "
+        "*.env *.properties *.yaml *.yml *.json)",
+    )
+    validate_parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="GLOB",
+        help="With --recursive, also skip matching files and directories "
+        "(repeatable; .git .svn __pycache__ node_modules are always skipped)",
+    )
+    validate_parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="With --recursive, number of files parsed in parallel",
+    )
+    validate_parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="With --recursive, print per-file load times on stderr",
+    )
+    validate_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time per stage (parse, flatten, rule checks, ...) and "
+        "counters on stderr; runs locally, not on the resident server",
+    )
+    validate_parser.add_argument(
+        "--profile-format",
+        default="text",
+        choices=["text", "json"],
+        help="Format of the --profile report (default: text)",
+    )
     validate_parser.set_defaults(func=validate_command)
 
+    # Validate-many command
+    many_parser = subparsers.add_parser(
+        "validate-many", help="Validate many configurations in parallel"
+    )
+    many_parser.add_argument(
+        "targets",
+        nargs="*",
+        help="Config paths or glob patterns (quote globs to expand recursively)",
+    )
+    many_parser.add_argument(
+        "--manifest",
+        "-m",
+        help="File listing one config path or glob per line",
+    )
+    many_parser.add_argument("--schema", "-s", help="Path to schema YAML file")
+    many_parser.add_argument(
+        "--environment",
+        "-e",
+        default="dev",
+        choices=["dev", "qa", "prod"],
+        help="Environment name (default: dev)",
+    )
+    many_parser.add_argument(
+        "--fail-on-warning",
+        action="store_true",
+        help="Treat warnings as errors",
+    )
+    many_parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop each target at its first error (or warning with --fail-on-warning)",
+    )
+    many_parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    many_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the result cache",
+    )
+    many_parser.set_defaults(func=validate_many_command)
+
+    # Schema command
+    schema_parser = subparsers.add_parser(
+        "schema", help="Prebuild the compiled form of a schema"
+    )
+    schema_parser.add_argument(
+        "schema_action", choices=["compile"], help="Schema action to perform"
+    )
+    schema_parser.add_argument("schema_path", help="Path to schema YAML file")
+    schema_parser.set_defaults(func=schema_command)
+
+    # Cache command
+    cache_parser = subparsers.add_parser(
+        "cache", help="Manage the result and compiled-schema caches"
+    )
+    cache_parser.add_argument(
+        "cache_action", choices=["clear"], help="Cache action to perform"
+    )
+    cache_parser.set_defaults(func=cache_command)
+
     # Diff command
     diff_parser = subparsers.add_parser(
         "diff", help="Compare configurations across environments"
@@ -158,15 +797,132 @@ Examples:
         action="store_true",
         help="Exit with error code if drift is detected",
     )
+    diff_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Number of environments to load concurrently " "(default: all, up to 32)",
+    )
+    diff_parser.add_argument(
+        "--no-server",
+        action="store_true",
+        help="Run locally even if a resident server is running",
+    )
+    diff_parser.add_argument(
+        "--format",
+        "-f",
+        default="text",
+        choices=["text", "jsonl", "json", "sarif", "junit"],  # formats.FORMATS
+        help="Output format (default: text)",
+    )
+    diff_parser.add_argument(
+        "--recursive",
+        "-r",
+        action="store_true",
+        help="Load config files from every subdirectory; deeper files override "
+        "their parents'",
+    )
+    diff_parser.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help="With --recursive, load only matching files (repeatable; default: "
+        "*.env *.properties *.yaml *.yml *.json)",
+    )
+    diff_parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="GLOB",
+        help="With --recursive, also skip matching files and directories "
+        "(repeatable; .git .svn __pycache__ node_modules are always skipped)",
+    )
+    diff_parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="With --recursive, number of files parsed in parallel",
+    )
+    diff_parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="With --recursive, print per-file load times on stderr",
+    )
+    diff_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time per stage (parse, flatten, rule checks, ...) and "
+        "counters on stderr; runs locally, not on the resident server",
+    )
+    diff_parser.add_argument(
+        "--profile-format",
+        default="text",
+        choices=["text", "json"],
+        help="Format of the --profile report (default: text)",
+    )
     diff_parser.set_defaults(func=diff_command)
 
+    # Snapshot command
+    snapshot_parser = subparsers.add_parser(
+        "snapshot", help="Save a baseline snapshot or report drift against one"
+    )
+    snapshot_parser.add_argument("snapshot_action", choices=["save", "compare"])
+    snapshot_parser.add_argument("snapshot", help="Path to snapshot file")
+    snapshot_parser.add_argument(
+        "environments",
+        nargs="*",
+        help="Environment paths (format: name=path or just path); "
+        "compare defaults to the paths stored in the snapshot",
+    )
+    snapshot_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Number of environments to read concurrently " "(default: all, up to 32)",
+    )
+    snapshot_parser.add_argument(
+        "--fail-on-drift",
+        action="store_true",
+        help="Exit with error code if drift since the baseline is detected",
+    )
+    snapshot_parser.set_defaults(func=snapshot_command)
+
+    # Serve command
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a resident server that validate and diff forward to"
+    )
+    serve_parser.add_argument(
+        "--socket",
+        help="Unix socket path (default: $SAP_CONFIG_GUARD_SOCKET or "
+        "server.sock in the cache directory)",
+    )
+    serve_parser.add_argument(
+        "--no-socket",
+        action="store_true",
+        help="Do not listen on a Unix socket (use with --port)",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Also accept JSON POST requests on http://127.0.0.1:PORT",
+    )
+    serve_parser.add_argument(
+        "--schema", "-s", help="Schema YAML file to compile at startup"
+    )
+    serve_parser.set_defaults(func=serve_command)
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    args.func(args)
+    if getattr(args, "profile", False):
+        _run_profiled(args)
+    else:
+        args.func(args)
 
 
 if __name__ == "__main__":
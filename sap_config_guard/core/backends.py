@@ -0,0 +1,106 @@
+"""
+Parser backends for YAML and JSON, picked by what is installed
+
+The parser libraries are imported on first use, so loading only .env or
+.properties files never imports PyYAML or orjson. The module attributes
+YAML_LOADER, YAML_BACKEND, JSON_BACKENDS and JSON_BACKEND resolve the
+backends when first read.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, IO, Tuple, Union
+
+JsonLoads = Callable[[Union[bytes, str]], Any]
+
+_yaml: Dict[str, Any] = {}
+_json: Dict[str, Any] = {}
+
+
+def _yaml_backend() -> Tuple[Any, str]:
+    """Import PyYAML and pick its fastest safe loader"""
+    if not _yaml:
+        import yaml
+
+        # libyaml's C loader is an order of magnitude faster than pure Python
+        if getattr(yaml, "__with_libyaml__", False):
+            _yaml.update(loader=yaml.CSafeLoader, name="libyaml")
+        else:  # pragma: no cover - depends on how PyYAML was built
+            _yaml.update(loader=yaml.SafeLoader, name="pyyaml")
+        _yaml["module"] = yaml
+    return _yaml["loader"], _yaml["name"]
+
+
+def _json_backends() -> Dict[str, JsonLoads]:
+    """Find the installed JSON parsers, keyed by name"""
+    if not _json:
+        backends: Dict[str, JsonLoads] = {"json": json.loads}
+        try:
+            import orjson
+        except ImportError:  # pragma: no cover - optional dependency
+            pass
+        else:
+            backends["orjson"] = orjson.loads
+            _json["orjson_version"] = orjson.__version__
+
+        # Honour $SAP_CONFIG_GUARD_JSON_BACKEND, else prefer orjson
+        requested = os.environ.get("SAP_CONFIG_GUARD_JSON_BACKEND")
+        if requested not in backends:
+            requested = "orjson" if "orjson" in backends else "json"
+        _json.update(backends=backends, name=requested, loads=backends[requested])
+    return _json["backends"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "YAML_LOADER":
+        return _yaml_backend()[0]
+    if name == "YAML_BACKEND":
+        return _yaml_backend()[1]
+    if name == "JSON_BACKENDS":
+        return _json_backends()
+    if name == "JSON_BACKEND":
+        _json_backends()
+        return _json["name"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def load_yaml(stream: Union[str, bytes, IO]) -> Any:
+    """Parse YAML with the safe loader of the active backend"""
+    loader, _ = _yaml_backend()
+    return _yaml["module"].load(stream, Loader=loader)
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """
+    Parse JSON with the active backend
+
+    orjson is stricter than the stdlib (no NaN/Infinity, no integers
+    beyond 64 bits), so documents it rejects are retried with json.
+    """
+    _json_backends()
+    loads = _json["loads"]
+    try:
+        return loads(data)
+    except ValueError:
+        if loads is json.loads:
+            raise
+        return json.loads(data)
+
+
+def load_json_file(file_path: Union[str, "os.PathLike[str]"]) -> Any:
+    """Read and parse a JSON file with the active backend"""
+    with open(file_path, "rb") as f:
+        return loads_json(f.read())
+
+
+def describe() -> Dict[str, str]:
+    """Get the active backend for each format, for --version and diagnostics"""
+    _, yaml_name = _yaml_backend()
+    _json_backends()
+    json_name = _json["name"]
+    if json_name == "orjson":
+        json_name = f"orjson {_json['orjson_version']}"
+    return {
+        "yaml": f"{yaml_name} (PyYAML {_yaml['module'].__version__})",
+        "json": json_name,
+    }
@@ -0,0 +1,360 @@
+"""
+On-disk caches of validation results and compiled schemas
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sap_config_guard import __version__
+from sap_config_guard.core.compiled import CompiledSchema, KeyRules
+from sap_config_guard.core.results import ValidationResult
+
+# Bump when the stored entry layout changes
+CACHE_FORMAT = 2
+SCHEMA_CACHE_FORMAT = 2
+
+# Rules whose results hold no config values; runs with any other result
+# (an invalid pattern or forbidden value quotes the value, which may be a
+# secret) are not written to disk
+_VALUE_FREE_RULES = frozenset(
+    {"required", "secure_missing", "secure_short", "min_length"}
+)
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the cache root directory
+
+    Uses $SAP_CONFIG_GUARD_CACHE_DIR, then $XDG_CACHE_HOME/sap-config-guard,
+    then ~/.cache/sap-config-guard.
+    """
+    override = os.environ.get("SAP_CONFIG_GUARD_CACHE_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "sap-config-guard"
+
+
+def hash_file(file_path: Path) -> str:
+    """Get the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def plan_layout() -> str:
+    """
+    Fingerprint the attribute layout of compiled schemas
+
+    Pickles restore attributes by name, so a plan pickled before an
+    attribute was added, renamed or removed would still load and only
+    fail during validation. SchemaCache mixes this into its keys, so
+    such entries are never looked up.
+
+    Returns:
+        Hex digest of the attribute names of CompiledSchema and the
+        objects it holds
+    """
+    sample = CompiledSchema(
+        {"required": ["K"], "patterns": {"K": "k"}, "forbidden_in_prod": ["x"]}
+    )
+    layout = [
+        sorted(vars(sample)),
+        list(KeyRules._fields),
+        sorted(vars(sample.patterns["K"])),
+        sorted(vars(sample.forbidden_in_prod)),
+    ]
+    return hashlib.sha256(json.dumps(layout).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of validation results
+
+    Each entry is a small JSON file named after its key. Reads refresh the
+    entry's mtime, and writes evict the least recently used entries once
+    the entry count or total size exceeds its bounds.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Cache root directory (default: default_cache_dir())
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total size of cached results
+        """
+        root = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.directory = root / "results"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def key(
+        self,
+        files: Iterable[Path],
+        schema_fingerprint: str,
+        environment: str,
+        fail_on_warning: bool,
+    ) -> str:
+        """
+        Build the cache key for a validation run
+
+        Files are identified by name and content only, so identical trees
+        checked out in different workspaces share cache entries.
+
+        Args:
+            files: Config files in merge order
+            schema_fingerprint: Hash of the schema in use
+            environment: Environment name
+            fail_on_warning: Whether warnings fail validation
+
+        Returns:
+            Hex digest identifying the run
+        """
+        material = [
+            CACHE_FORMAT,
+            __version__,
+            [[path.name, hash_file(path)] for path in files],
+            schema_fingerprint,
+            environment.lower(),
+            bool(fail_on_warning),
+        ]
+        return hashlib.sha256(json.dumps(material).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[List[ValidationResult], bool]]:
+        """
+        Look up cached results
+
+        Args:
+            key: Cache key from key()
+
+        Returns:
+            Tuple of (validation_results, is_valid), or None on a miss
+        """
+        entry = self.directory / f"{key}.json"
+        try:
+            with open(entry, "r") as f:
+                data = json.load(f)
+            results = [ValidationResult.from_dict(item) for item in data["results"]]
+            is_valid = bool(data["is_valid"])
+            os.utime(entry)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return results, is_valid
+
+    def put(self, key: str, results: List[ValidationResult], is_valid: bool) -> None:
+        """
+        Store results and evict old entries if the cache is over budget
+
+        Results that quote config values are never stored, so secrets
+        caught by a pattern or production rule do not end up in the
+        cache directory; such runs are simply validated again next time.
+
+        Args:
+            key: Cache key from key()
+            results: Validation results to store
+            is_valid: Overall validation outcome
+        """
+        if any(result.rule not in _VALUE_FREE_RULES for result in results):
+            return
+        data = {
+            "results": [result.to_dict() for result in results],
+            "is_valid": is_valid,
+        }
+        try:
+            import tempfile
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_name, self.directory / f"{key}.json")
+        except OSError:
+            return
+        self._evict()
+
+    def clear(self) -> int:
+        """
+        Remove every cached result
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for entry in self._entries():
+            try:
+                entry.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _entries(self) -> List[Path]:
+        """List cache entry files"""
+        if not self.directory.is_dir():
+            return []
+        return list(self.directory.glob("*.json"))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within bounds"""
+        stats = []
+        for entry in self._entries():
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            stats.append((st.st_mtime, st.st_size, entry))
+
+        stats.sort(key=lambda item: item[0])
+        count = len(stats)
+        total = sum(size for _, size, _ in stats)
+
+        for _, size, entry in stats:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+            count -= 1
+            total -= size
+
+
+class SchemaCache:
+    """
+    Pickled compiled schemas keyed by schema file content
+
+    Each entry holds the parsed schema dictionary together with its
+    CompiledSchema. Regexes are stored as source and compiled on first
+    use, so loading an entry skips YAML parsing and plan building
+    entirely. Editing the schema file, or changing the plan's attribute
+    layout (see plan_layout), changes the key, so a stale entry is simply
+    never looked up again.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 32):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Cache root directory (default: default_cache_dir())
+            max_entries: Maximum number of compiled schemas kept
+        """
+        root = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.directory = root / "schemas"
+        self.max_entries = max_entries
+
+    def path_for(self, content: bytes) -> Path:
+        """Get the entry path for a schema file's raw bytes"""
+        digest = hashlib.sha256(content)
+        digest.update(
+            f"{SCHEMA_CACHE_FORMAT}:{__version__}:{plan_layout()}".encode("utf-8")
+        )
+        return self.directory / f"{digest.hexdigest()}.pickle"
+
+    def get(self, content: bytes) -> Optional[Tuple[Dict[str, Any], CompiledSchema]]:
+        """
+        Look up the compiled form of a schema
+
+        Args:
+            content: Raw bytes of the schema file
+
+        Returns:
+            Tuple of (schema dictionary, CompiledSchema), or None on a miss
+        """
+        import pickle
+
+        entry = self.path_for(content)
+        try:
+            with open(entry, "rb") as f:
+                schema, plan = pickle.load(f)
+            os.utime(entry)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return None
+        except (AttributeError, ImportError):
+            # Written by an incompatible version of this package
+            return None
+        if not isinstance(plan, CompiledSchema):
+            return None
+        return schema, plan
+
+    def put(
+        self, content: bytes, schema: Dict[str, Any], plan: CompiledSchema
+    ) -> Optional[Path]:
+        """
+        Store a compiled schema
+
+        Args:
+            content: Raw bytes of the schema file
+            schema: Parsed schema dictionary
+            plan: CompiledSchema built from it
+
+        Returns:
+            Path of the written entry, or None if it could not be written
+        """
+        import pickle
+        import tempfile
+
+        entry = self.path_for(content)
+        try:
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((schema, plan), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, entry)
+        except OSError:
+            return None
+        self._evict()
+        return entry
+
+    def clear(self) -> int:
+        """
+        Remove every compiled schema
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for entry in self._entries():
+            try:
+                entry.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _entries(self) -> List[Path]:
+        """List cache entry files"""
+        if not self.directory.is_dir():
+            return []
+        return list(self.directory.glob("*.pickle"))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond max_entries"""
+        entries = []
+        for entry in self._entries():
+            try:
+                entries.append((entry.stat().st_mtime, entry))
+            except OSError:
+                continue
+        entries.sort(key=lambda item: item[0])
+        for _, entry in entries[: max(0, len(entries) - self.max_entries)]:
+            try:
+                entry.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,482 @@
+"""
+Compiled validation plan built once from a ConfigSchema
+"""
+
+import hashlib
+import json
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Match,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+from sap_config_guard.core import profiling
+from sap_config_guard.core.results import (
+    ValidationLevel,
+    ValidationResult,
+    ValidationSummary,
+)
+from sap_config_guard.core.scanner import ForbiddenScanner
+
+# config.get of the mapping being checked
+_Getter = Callable[[str], Optional[str]]
+
+# Secure values shorter than this are reported as suspicious
+SECURE_MIN_LENGTH = 4
+
+
+class LazyPattern:
+    """
+    A regex that pickles as its source and compiles on first use
+
+    A freshly compiled schema passes in the compiled regex, so invalid
+    patterns still fail fast; an unpickled plan compiles each pattern
+    only when a value is first matched against it. After that, match()
+    is the compiled regex's own bound method.
+    """
+
+    def __init__(self, pattern: str, compiled: Optional[Pattern] = None):
+        self.pattern = pattern
+        if compiled is not None:
+            self.match = compiled.match
+
+    def match(self, string: str) -> Optional[Match]:
+        compiled = re.compile(self.pattern)
+        self.match = compiled.match
+        return compiled.match(string)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        return LazyPattern, (self.pattern,)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, LazyPattern) and other.pattern == self.pattern
+
+    def __hash__(self) -> int:
+        return hash(self.pattern)
+
+    def __repr__(self) -> str:
+        return f"LazyPattern({self.pattern!r})"
+
+
+class KeyRules(NamedTuple):
+    """All rules the schema attaches to a single configuration key"""
+
+    required: bool
+    secure: bool
+    pattern: Optional[LazyPattern]
+    min_length: Optional[int]
+
+
+class CompiledSchema:
+    """
+    Validation plan compiled from a schema
+
+    Regex patterns are compiled once and every per-key rule is indexed by
+    key for incremental and streaming checks. A full check runs each rule
+    family over its own keys, in schema order, followed (in production)
+    by one pass over the config values.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Compile a raw schema dictionary
+
+        Args:
+            schema: Schema dictionary as loaded from YAML
+        """
+        schema = schema or {}
+        self.fingerprint = hashlib.sha256(
+            json.dumps(schema, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        self.required: Tuple[str, ...] = tuple(schema.get("required") or ())
+        self.secure: Tuple[str, ...] = tuple(schema.get("secure") or ())
+        self.patterns: Dict[str, LazyPattern] = {
+            key: LazyPattern(str(pattern), re.compile(str(pattern)))
+            for key, pattern in (schema.get("patterns") or {}).items()
+        }
+        self.min_lengths: Dict[str, int] = {
+            key: int(length)
+            for key, length in (schema.get("min_lengths") or {}).items()
+        }
+        self.forbidden_in_prod = ForbiddenScanner(schema.get("forbidden_in_prod") or ())
+
+        # Keys any non-production rule reads; loaders may skip the rest
+        self.projection: FrozenSet[str] = frozenset(
+            (*self.required, *self.patterns, *self.secure, *self.min_lengths)
+        )
+
+        required = set(self.required)
+        secure = set(self.secure)
+        self.key_rules: Dict[str, KeyRules] = {}
+        for key in (*self.required, *self.patterns, *self.secure, *self.min_lengths):
+            if key not in self.key_rules:
+                self.key_rules[key] = KeyRules(
+                    required=key in required,
+                    secure=key in secure,
+                    pattern=self.patterns.get(key),
+                    min_length=self.min_lengths.get(key),
+                )
+
+    def validate_pattern(self, key: str, value: str) -> bool:
+        """Return True if value matches the pattern for key (or none is set)"""
+        pattern = self.patterns.get(key)
+        if pattern is None:
+            return True
+        return pattern.match(str(value)) is not None
+
+    def is_forbidden_in_prod(self, value: str) -> bool:
+        """Return True if value contains a term forbidden in production"""
+        return self.forbidden_in_prod.find(value) is not None
+
+    def check(
+        self, config: Mapping[str, str], production: bool = False
+    ) -> List[ValidationResult]:
+        """
+        Apply every rule in the plan to a flattened config
+
+        Args:
+            config: Flattened configuration dictionary
+            production: Whether production-only rules apply
+
+        Returns:
+            List of ValidationResult objects, grouped by rule family
+        """
+        if profiling.active() is not None:
+            return self._check_profiled(config, production)
+
+        get = config.get
+        results = self._check_required(get)
+        results.extend(self._check_patterns(get))
+        results.extend(self._check_secure(get))
+        results.extend(self._check_min_lengths(get))
+        if production:
+            results.extend(self.check_production(config))
+        return results
+
+    def first_failure(
+        self,
+        config: Mapping[str, str],
+        production: bool = False,
+        fail_on_warning: bool = False,
+    ) -> Optional[ValidationResult]:
+        """
+        Find one result that makes the config invalid, cheapest rules first
+
+        Rules run in order of cost: required-key lookups, then length
+        checks, then regex patterns, then (in production) the scan of
+        every value, and the search stops at the first failure. Secure
+        key warnings are only looked for when fail_on_warning is set.
+
+        Args:
+            config: Flattened configuration dictionary
+            production: Whether production-only rules apply
+            fail_on_warning: If True, the first warning also fails
+
+        Returns:
+            The first failing ValidationResult, or None if the config is
+            valid
+        """
+        get = config.get
+        for key in self.required:
+            if not get(key):
+                return _missing_required(key)
+
+        for key, min_length in self.min_lengths.items():
+            value = get(key)
+            if value is not None and len(value) < min_length:
+                return _value_too_short(key, min_length)
+
+        if fail_on_warning:
+            for key in self.secure:
+                value = get(key)
+                if not value:
+                    return _secure_missing(key)
+                if len(value) < SECURE_MIN_LENGTH:
+                    return _secure_too_short(key)
+
+        for key, pattern in self.patterns.items():
+            value = get(key)
+            if value is not None and pattern.match(str(value)) is None:
+                return _invalid_pattern(key, value, pattern)
+
+        if production and self.forbidden_in_prod:
+            find = self.forbidden_in_prod.find
+            for key, value in config.items():
+                term = find(value)
+                if term is not None:
+                    return _production_violation(key, value, term)
+        return None
+
+    def count(
+        self, config: Mapping[str, str], production: bool = False
+    ) -> ValidationSummary:
+        """
+        Count the results check() would return, by level
+
+        The production scan, which can report every value, only counts
+        matches and builds no results.
+
+        Args:
+            config: Flattened configuration dictionary
+            production: Whether production-only rules apply
+
+        Returns:
+            ValidationSummary of the results
+        """
+        summary = ValidationSummary()
+        get = config.get
+        for family in (
+            self._check_required,
+            self._check_patterns,
+            self._check_secure,
+            self._check_min_lengths,
+        ):
+            for result in family(get):
+                summary.add(result.level)
+
+        if production and self.forbidden_in_prod:
+            find = self.forbidden_in_prod.find
+            for value in config.values():
+                if find(value) is not None:
+                    summary.errors += 1
+        return summary
+
+    def check_keys(
+        self,
+        config: Mapping[str, str],
+        keys: Iterable[str],
+        production: bool = False,
+    ) -> Dict[str, List[ValidationResult]]:
+        """
+        Re-run only the rules attached to the given keys
+
+        Every rule is a function of a single key's value, so after a
+        change only the changed keys need to be checked again.
+
+        Args:
+            config: Flattened configuration dictionary
+            keys: Keys to check
+            production: Whether production-only rules apply
+
+        Returns:
+            Dictionary mapping each key to its validation results
+        """
+        find = self.forbidden_in_prod.find
+        checked: Dict[str, List[ValidationResult]] = {}
+
+        for key in keys:
+            value = config.get(key)
+            buckets: Tuple[List[ValidationResult], ...] = ([], [], [], [])
+            rules = self.key_rules.get(key)
+            if rules is not None:
+                self._apply_key_rules(key, rules, value, buckets)
+
+            results = [result for bucket in buckets for result in bucket]
+            if production and value is not None and self.forbidden_in_prod:
+                term = find(value)
+                if term is not None:
+                    results.append(_production_violation(key, value, term))
+            checked[key] = results
+
+        return checked
+
+    def check_stream(
+        self, pairs: Iterable[Tuple[str, str]], production: bool = False
+    ) -> Iterator[ValidationResult]:
+        """
+        Validate (key, value) pairs as they are produced
+
+        The last definition of a key wins, as with load_from_path, so
+        verdicts are final only once the pairs run out. Only the last
+        value of each schema key and the pending production violations
+        are held (memory is bounded by the schema and the violations,
+        not the config), and results are yielded at the end of input.
+        They are the same results as check() on the loaded config, in the
+        same order, except that production violations come in the order
+        their keys first violated rather than the order the keys were
+        first defined (tracking that would mean holding every key).
+
+        Args:
+            pairs: Iterable of (key, value) pairs, e.g. ConfigLoader.iter_pairs()
+            production: Whether production-only rules apply
+
+        Yields:
+            ValidationResult objects
+        """
+        key_rules = self.key_rules
+        scan = production and bool(self.forbidden_in_prod)
+        find = self.forbidden_in_prod.find if scan else None
+        last_seen: Dict[str, str] = {}
+        # Keeps each key at the position of its first violation; a later
+        # clean definition leaves None in place of the violation
+        violations: Dict[str, Optional[ValidationResult]] = {}
+
+        for key, value in pairs:
+            if key in key_rules:
+                last_seen[key] = value
+            if find is not None:
+                term = find(value)
+                if term is not None:
+                    violations[key] = _production_violation(key, value, term)
+                elif key in violations:
+                    violations[key] = None
+
+        yield from self.check(last_seen)
+        for violation in violations.values():
+            if violation is not None:
+                yield violation
+
+    def _check_required(self, get: _Getter) -> List[ValidationResult]:
+        """Check required keys, in schema order"""
+        return [_missing_required(key) for key in self.required if not get(key)]
+
+    def _check_patterns(self, get: _Getter) -> List[ValidationResult]:
+        """Check values against their patterns, in schema order"""
+        results = []
+        for key, pattern in self.patterns.items():
+            value = get(key)
+            if value is not None and pattern.match(str(value)) is None:
+                results.append(_invalid_pattern(key, value, pattern))
+        return results
+
+    def _check_secure(self, get: _Getter) -> List[ValidationResult]:
+        """Check secure keys are set and not suspiciously short"""
+        results = []
+        for key in self.secure:
+            value = get(key)
+            if not value:
+                results.append(_secure_missing(key))
+            elif len(value) < SECURE_MIN_LENGTH:
+                results.append(_secure_too_short(key))
+        return results
+
+    def _check_min_lengths(self, get: _Getter) -> List[ValidationResult]:
+        """Check minimum value lengths, in schema order"""
+        results = []
+        for key, min_length in self.min_lengths.items():
+            value = get(key)
+            if value is not None and len(value) < min_length:
+                results.append(_value_too_short(key, min_length))
+        return results
+
+    def _check_profiled(
+        self, config: Mapping[str, str], production: bool
+    ) -> List[ValidationResult]:
+        """
+        Same as check(), but timing each rule family as its own stage
+
+        Runs while a Profiler is active. Results are identical to check().
+        """
+        get = config.get
+        with profiling.stage("check.required"):
+            results = self._check_required(get)
+        with profiling.stage("check.patterns"):
+            results.extend(self._check_patterns(get))
+        with profiling.stage("check.secure"):
+            results.extend(self._check_secure(get))
+        with profiling.stage("check.min_lengths"):
+            results.extend(self._check_min_lengths(get))
+        profiling.count(
+            "rules_evaluated",
+            len(self.required)
+            + len(self.patterns)
+            + len(self.secure)
+            + len(self.min_lengths),
+        )
+
+        if production:
+            with profiling.stage("check.production"):
+                results.extend(self.check_production(config))
+            profiling.count("values_scanned", len(config))
+        return results
+
+    @staticmethod
+    def _apply_key_rules(
+        key: str,
+        rules: KeyRules,
+        value: Optional[str],
+        buckets: Tuple[List[ValidationResult], ...],
+    ) -> None:
+        """Apply one key's rules, appending to the per-family buckets"""
+        required, patterns, secure, lengths = buckets
+
+        if rules.required and not value:
+            required.append(_missing_required(key))
+
+        if value is None:
+            if rules.secure:
+                secure.append(_secure_missing(key))
+            return
+
+        if rules.pattern is not None and rules.pattern.match(str(value)) is None:
+            patterns.append(_invalid_pattern(key, value, rules.pattern))
+
+        if rules.secure:
+            if not value:
+                secure.append(_secure_missing(key))
+            elif len(value) < SECURE_MIN_LENGTH:
+                secure.append(_secure_too_short(key))
+
+        if rules.min_length is not None and len(value) < rules.min_length:
+            lengths.append(_value_too_short(key, rules.min_length))
+
+    def check_production(self, config: Mapping[str, str]) -> List[ValidationResult]:
+        """Check every config value against the production rules"""
+        results: List[ValidationResult] = []
+        if not self.forbidden_in_prod:
+            return results
+
+        find = self.forbidden_in_prod.find
+        for key, value in config.items():
+            term = find(value)
+            if term is not None:
+                results.append(_production_violation(key, value, term))
+
+        return results
+
+
+def _missing_required(key: str) -> ValidationResult:
+    """Build the result for a missing or empty required key"""
+    return ValidationResult(ValidationLevel.ERROR, key, rule="required")
+
+
+def _invalid_pattern(key: str, value: str, pattern: LazyPattern) -> ValidationResult:
+    """Build the result for a value that does not match its pattern"""
+    return ValidationResult(
+        ValidationLevel.ERROR, key, rule="pattern", args=(value, pattern.pattern)
+    )
+
+
+def _secure_missing(key: str) -> ValidationResult:
+    """Build the result for a missing or empty secure key"""
+    return ValidationResult(ValidationLevel.WARNING, key, rule="secure_missing")
+
+
+def _secure_too_short(key: str) -> ValidationResult:
+    """Build the result for a suspiciously short secure value"""
+    return ValidationResult(ValidationLevel.WARNING, key, rule="secure_short")
+
+
+def _value_too_short(key: str, min_length: int) -> ValidationResult:
+    """Build the result for a value below its minimum length"""
+    return ValidationResult(
+        ValidationLevel.ERROR, key, rule="min_length", args=(min_length,)
+    )
+
+
+def _production_violation(key: str, value: str, term: str) -> ValidationResult:
+    """Build the result for a forbidden production value"""
+    return ValidationResult(
+        ValidationLevel.ERROR, key, rule="forbidden_in_prod", args=(value, term)
+    )
@@ -0,0 +1,203 @@
+"""
+Recursive config discovery with parallel parsing and per-file timings
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import AbstractSet, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sap_config_guard.core import profiling
+from sap_config_guard.core.loader import CONFIG_FILE_NAMES, ConfigLoader
+
+DEFAULT_INCLUDE = ("*.env", "*.properties", "*.yaml", "*.yml", "*.json")
+DEFAULT_EXCLUDE = (".git", ".svn", "__pycache__", "node_modules")
+
+# Within one directory, the well-known names merge first, in this order
+_NAME_RANK = {name: rank for rank, name in enumerate(CONFIG_FILE_NAMES)}
+
+
+@dataclass
+class FileTiming:
+    """Time spent loading one config file"""
+
+    path: Path
+    seconds: float
+    size: int
+    keys: int
+
+
+def _matches(patterns: Iterable[str], name: str, rel_path: str) -> bool:
+    """Match a glob against the name, or the relative path if it has a '/'"""
+    return any(
+        fnmatchcase(rel_path if "/" in pattern else name, pattern)
+        for pattern in patterns
+    )
+
+
+def discover_files(
+    root: Path,
+    include: Sequence[str] = DEFAULT_INCLUDE,
+    exclude: Sequence[str] = DEFAULT_EXCLUDE,
+) -> List[Path]:
+    """
+    Find config files below a directory, in merge order
+
+    Directories are walked with os.scandir, without following symlinks.
+    Files are ordered by depth, so a nested directory's files merge after
+    (and override) those of its parents; siblings are ordered by path.
+    Within one directory, .env, config.env, config.properties,
+    config.yaml, config.yml and config.json come first, then the rest by
+    name.
+
+    Args:
+        root: Directory to search
+        include: Globs a file must match; a glob without '/' is matched
+                 against the file name, one with '/' against the path
+                 relative to root
+        exclude: Globs for files and directories to skip (matched the
+                 same way); an excluded directory is not entered
+
+    Returns:
+        List of file paths
+    """
+    found: List[Tuple[int, str, int, str, Path]] = []
+    stack: List[Tuple[str, str, int]] = [(str(root), "", 0)]
+    while stack:
+        dir_path, rel_dir, depth = stack.pop()
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                rel_path = f"{rel_dir}{entry.name}"
+                if _matches(exclude, entry.name, rel_path):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, f"{rel_path}/", depth + 1))
+                elif entry.is_file() and _matches(include, entry.name, rel_path):
+                    rank = _NAME_RANK.get(entry.name, len(_NAME_RANK))
+                    found.append((depth, rel_dir, rank, entry.name, Path(entry.path)))
+
+    found.sort(key=lambda item: item[:4])
+    return [item[4] for item in found]
+
+
+def _timed_load(
+    file_path: Path, keys: Optional[AbstractSet[str]]
+) -> Tuple[Dict[str, str], float]:
+    """Load one file and measure how long it took"""
+    start = time.perf_counter()
+    config = ConfigLoader._load_file(file_path, keys)
+    return config, time.perf_counter() - start
+
+
+class TreeLoader:
+    """
+    Config loader that searches directories recursively
+
+    A drop-in replacement for ConfigLoader wherever a loader is accepted
+    (ConfigValidator, EnvironmentDiff, ConfigMatrix). Files are found
+    with discover_files(), parsed in parallel, and merged in discovery
+    order. Every load appends a FileTiming per file to self.timings.
+    """
+
+    def __init__(
+        self,
+        include: Sequence[str] = DEFAULT_INCLUDE,
+        exclude: Sequence[str] = DEFAULT_EXCLUDE,
+        workers: Optional[int] = None,
+        processes: bool = False,
+    ):
+        """
+        Initialize loader
+
+        Args:
+            include: Globs for files to load (see discover_files)
+            exclude: Globs for files and directories to skip
+            workers: Number of parallel parsers (default: up to 32,
+                     by CPU count); 1 parses serially
+            processes: Parse in worker processes instead of threads, for
+                       large CPU-bound YAML/JSON trees
+        """
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.processes = processes
+        self.timings: List[FileTiming] = []
+        self._lock = threading.Lock()
+
+    def config_files(self, config_path: Path) -> List[Path]:
+        """List the files load_from_path would read, in merge order"""
+        if config_path.is_file():
+            return [config_path]
+        if config_path.is_dir():
+            return discover_files(config_path, self.include, self.exclude)
+        raise FileNotFoundError(f"Config path not found: {config_path}")
+
+    def load_from_path(
+        self, config_path: Path, keys: Optional[AbstractSet[str]] = None
+    ) -> Dict[str, str]:
+        """
+        Load and merge every config file below a path
+
+        Args:
+            config_path: Path to config file or directory
+            keys: Key projection, as for ConfigLoader.load_from_path
+
+        Returns:
+            Dictionary of key-value pairs
+        """
+        with profiling.stage("load"):
+            files = self.config_files(config_path)
+            loaded = self._load_files(files, keys)
+
+        config: Dict[str, str] = {}
+        timings = []
+        for file_path, (file_config, seconds) in zip(files, loaded):
+            config.update(file_config)
+            timings.append(
+                FileTiming(
+                    file_path, seconds, file_path.stat().st_size, len(file_config)
+                )
+            )
+        with self._lock:
+            self.timings.extend(timings)
+        return config
+
+    def _load_files(
+        self, files: List[Path], keys: Optional[AbstractSet[str]]
+    ) -> List[Tuple[Dict[str, str], float]]:
+        """Load each file with its timing, in parallel if configured"""
+        workers = min(self.workers, len(files))
+        if workers <= 1:
+            return [_timed_load(file_path, keys) for file_path in files]
+
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if self.processes:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_timed_load, files, [keys] * len(files)))
+        load = profiling.in_context(_timed_load)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(load, files, [keys] * len(files)))
+
+    def report(self, limit: Optional[int] = None) -> str:
+        """
+        Format the recorded timings, slowest file first
+
+        Args:
+            limit: Number of files to list (default: all)
+
+        Returns:
+            Report text, one file per line followed by a total
+        """
+        with self._lock:
+            timings = sorted(self.timings, key=lambda t: t.seconds, reverse=True)
+        total = sum(t.seconds for t in timings)
+        lines = [
+            f"{t.seconds * 1000:9.2f} ms {t.size:>10} B {t.keys:>7} keys  {t.path}"
+            for t in timings[:limit]
+        ]
+        lines.append(f"{total * 1000:9.2f} ms total parse time, {len(timings)} files")
+        return "\n".join(lines)
@@ -2,151 +2,416 @@
 Configuration file loader supporting multiple formats
 """
 
+import os
 import json
-import yaml
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any
+from typing import AbstractSet, Dict, Iterator, List, Any, Optional, Set, Tuple
+
+from sap_config_guard.core import backends, mmap_parser, profiling
+
+# Common config file names, in the order a directory's files are merged
+CONFIG_FILE_NAMES = (
+    ".env",
+    "config.env",
+    "config.properties",
+    "config.yaml",
+    "config.yml",
+    "config.json",
+)
 
 
 class ConfigLoader:
     """Load configuration from various file formats"""
 
     @staticmethod
-    def load_from_path(config_path: Path) -> Dict[str, str]:
+    def load_from_path(
+        config_path: Path, keys: Optional[AbstractSet[str]] = None
+    ) -> Dict[str, str]:
         """
         Load configuration from a file or directory
 
         Args:
             config_path: Path to config file or directory
+            keys: Key projection; if given, only these keys are loaded and
+                  nested subtrees that cannot contain them are skipped
 
         Returns:
             Dictionary of key-value pairs
         """
-        if config_path.is_file():
-            return ConfigLoader._load_file(config_path)
-        elif config_path.is_dir():
-            return ConfigLoader._load_directory(config_path)
-        else:
-            raise FileNotFoundError(f"Config path not found: {config_path}")
+        with profiling.stage("load"):
+            if config_path.is_file():
+                return ConfigLoader._load_file(config_path, keys)
+            elif config_path.is_dir():
+                return ConfigLoader._load_directory(config_path, keys)
+            else:
+                raise FileNotFoundError(f"Config path not found: {config_path}")
 
     @staticmethod
-    def _load_file(file_path: Path) -> Dict[str, str]:
+    def _load_file(
+        file_path: Path, keys: Optional[AbstractSet[str]] = None
+    ) -> Dict[str, str]:
         """Load configuration from a single file"""
         suffix = file_path.suffix.lower()
 
         if suffix == ".json":
-            return ConfigLoader._load_json(file_path)
+            config = ConfigLoader._load_json(file_path, keys)
         elif suffix in [".yaml", ".yml"]:
-            return ConfigLoader._load_yaml(file_path)
+            config = ConfigLoader._load_yaml(file_path, keys)
         elif suffix == ".properties":
-            return ConfigLoader._load_properties(file_path)
-        elif suffix == ".env":
-            return ConfigLoader._load_env(file_path)
+            config = ConfigLoader._load_properties(file_path, keys)
         else:
-            # Try as .env file
-            return ConfigLoader._load_env(file_path)
+            # .env, or anything else tried as .env
+            config = ConfigLoader._load_env(file_path, keys)
+
+        if profiling.active() is not None:
+            profiling.count("files")
+            profiling.count("bytes", os.path.getsize(file_path))
+            profiling.count("keys", len(config))
+        return config
 
     @staticmethod
-    def _load_directory(dir_path: Path) -> Dict[str, str]:
-        """Load configuration from directory
-        (all .env, .properties, .yaml, .json files)
+    def config_files(config_path: Path) -> List[Path]:
         """
-        config = {}
+        List the files load_from_path would read, in merge order
+
+        Args:
+            config_path: Path to config file or directory
+
+        Returns:
+            List of file paths
+        """
+        if config_path.is_file():
+            return [config_path]
+        elif config_path.is_dir():
+            return ConfigLoader._directory_files(config_path)
+        else:
+            raise FileNotFoundError(f"Config path not found: {config_path}")
+
+    @staticmethod
+    def _directory_files(dir_path: Path) -> List[Path]:
+        """List config files in a directory, in merge order"""
+        files = []
 
-        # Common config file names
-        config_files = [
-            ".env",
-            "config.env",
-            "config.properties",
-            "config.yaml",
-            "config.yml",
-            "config.json",
-        ]
-
-        for file_name in config_files:
+        for file_name in CONFIG_FILE_NAMES:
             file_path = dir_path / file_name
             if file_path.exists():
-                file_config = ConfigLoader._load_file(file_path)
-                config.update(file_config)
+                files.append(file_path)
 
         # Also load all .env files in directory
         for env_file in dir_path.glob("*.env"):
             if env_file.name not in [".env", "config.env"]:
-                file_config = ConfigLoader._load_file(env_file)
-                config.update(file_config)
+                files.append(env_file)
+
+        return files
+
+    @staticmethod
+    def _load_directory(
+        dir_path: Path, keys: Optional[AbstractSet[str]] = None
+    ) -> Dict[str, str]:
+        """Load configuration from directory
+        (all .env, .properties, .yaml, .json files)
+        """
+        config = {}
+
+        for file_path in ConfigLoader._directory_files(dir_path):
+            config.update(ConfigLoader._load_file(file_path, keys))
 
         return config
 
     @staticmethod
-    def _load_json(file_path: Path) -> Dict[str, str]:
+    def _load_json(
+        file_path: Path, keys: Optional[AbstractSet[str]] = None
+    ) -> Dict[str, str]:
         """Load JSON configuration file"""
-        with open(file_path, "r") as f:
-            data = json.load(f)
-            return ConfigLoader._flatten_dict(data)
+        with profiling.stage("load.parse.json"):
+            data = backends.load_json_file(file_path)
+        with profiling.stage("load.flatten"):
+            return ConfigLoader._flatten_dict(data, keys=keys)
 
     @staticmethod
-    def _load_yaml(file_path: Path) -> Dict[str, str]:
+    def _load_yaml(
+        file_path: Path, keys: Optional[AbstractSet[str]] = None
+    ) -> Dict[str, str]:
         """Load YAML configuration file"""
-        with open(file_path, "r") as f:
-            data = yaml.safe_load(f)
-            return ConfigLoader._flatten_dict(data)
+        with profiling.stage("load.parse.yaml"):
+            with open(file_path, "rb") as f:
+                data = backends.load_yaml(f)
+        with profiling.stage("load.flatten"):
+            return ConfigLoader._flatten_dict(data, keys=keys)
 
     @staticmethod
-    def _load_properties(file_path: Path) -> Dict[str, str]:
+    def _load_properties(
+        file_path: Path, keys: Optional[AbstractSet[str]] = None
+    ) -> Dict[str, str]:
         """Load Java properties file"""
-        config = {}
-        with open(file_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    config[key.strip()] = value.strip()
-        return config
+        with profiling.stage("load.parse.properties"):
+            return mmap_parser.load_properties(file_path, keys)
 
     @staticmethod
-    def _load_env(file_path: Path) -> Dict[str, str]:
+    def _load_env(
+        file_path: Path, keys: Optional[AbstractSet[str]] = None
+    ) -> Dict[str, str]:
         """Load .env file"""
-        config = {}
-        with open(file_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    # Remove quotes if present
-                    value = value.strip("\"'")
-                    config[key.strip()] = value
-        return config
+        with profiling.stage("load.parse.env"):
+            return mmap_parser.load_env(file_path, keys)
+
+    @staticmethod
+    def iter_pairs(config_path: Path) -> Iterator[Tuple[str, str]]:
+        """
+        Yield key-value pairs from a file or directory as they are parsed
+
+        .env and .properties files are read line by line, so memory stays
+        bounded however large the file is. YAML and JSON files are parsed
+        whole and then yielded. Keys defined more than once are yielded
+        once per definition, in merge order.
+
+        Args:
+            config_path: Path to config file or directory
+
+        Yields:
+            (key, value) tuples
+        """
+        for file_path in ConfigLoader.config_files(config_path):
+            suffix = file_path.suffix.lower()
+            if suffix == ".properties":
+                yield from ConfigLoader._iter_properties(file_path)
+            elif suffix in [".json", ".yaml", ".yml"]:
+                yield from ConfigLoader._load_file(file_path).items()
+            else:
+                yield from ConfigLoader._iter_env(file_path)
+
+    @staticmethod
+    def _iter_properties(file_path: Path) -> Iterator[Tuple[str, str]]:
+        """Yield key-value pairs from a Java properties file"""
+        return mmap_parser.iter_properties(file_path)
+
+    @staticmethod
+    def _iter_env(file_path: Path) -> Iterator[Tuple[str, str]]:
+        """Yield key-value pairs from a .env file"""
+        return mmap_parser.iter_env(file_path)
 
     @staticmethod
     def _flatten_dict(
-        data: Any, parent_key: str = "", sep: str = "_"
+        data: Any,
+        parent_key: str = "",
+        sep: str = "_",
+        max_depth: Optional[int] = None,
+        list_mode: str = "join",
+        keys: Optional[AbstractSet[str]] = None,
     ) -> Dict[str, str]:
         """
-        Flatten nested dictionary to dot-notation keys
+        Flatten nested dictionary to separator-joined keys
 
         Args:
             data: Dictionary or value to flatten
             parent_key: Parent key prefix
             sep: Separator for nested keys
+            max_depth: See iter_flat_items
+            list_mode: See iter_flat_items
+            keys: See iter_flat_items
 
         Returns:
             Flattened dictionary with string values
         """
-        items = []
+        return dict(
+            ConfigLoader.iter_flat_items(
+                data,
+                parent_key,
+                sep=sep,
+                max_depth=max_depth,
+                list_mode=list_mode,
+                keys=keys,
+            )
+        )
+
+    @staticmethod
+    def iter_flat_items(
+        data: Any,
+        parent_key: str = "",
+        sep: str = "_",
+        max_depth: Optional[int] = None,
+        list_mode: str = "join",
+        keys: Optional[AbstractSet[str]] = None,
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily yield the flattened (key path, value) pairs of nested data
+
+        The tree is walked depth-first with an explicit stack, so deep
+        documents cannot hit the recursion limit, and a subtree is only
+        visited when the consumer asks for the pairs inside it.
+
+        Args:
+            data: Dictionary or value to flatten
+            parent_key: Parent key prefix
+            sep: Separator for nested keys
+            max_depth: Number of key levels to expand (default: all);
+                       deeper subtrees are yielded as one JSON value
+            list_mode: "join" to store lists as comma-separated strings,
+                       "index" to expand them into key{sep}0, key{sep}1, ...
+            keys: Key projection; only these keys are yielded, and subtrees
+                  whose path is not a prefix of one are never entered
+
+        Yields:
+            (key, value) pairs with string values
+        """
+        if list_mode not in ("join", "index"):
+            raise ValueError(f"Unknown list_mode: {list_mode}")
+        index_lists = list_mode == "index"
+        containers = (dict, list) if index_lists else dict
+
+        if not isinstance(data, containers):
+            if keys is None or parent_key in keys:
+                yield parent_key, str(data)
+            return
 
-        if isinstance(data, dict):
-            for key, value in data.items():
-                new_key = f"{parent_key}{sep}{key}" if parent_key else key
-                if isinstance(value, dict):
-                    items.extend(
-                        ConfigLoader._flatten_dict(value, new_key, sep=sep).items()
-                    )
+        # Key paths that have a projected key below them
+        prefixes = None if keys is None else _key_prefixes(keys, sep)
+
+        stack = [(parent_key, 1, _children(data))]
+        while stack:
+            prefix, depth, children = stack[-1]
+            for key, value in children:
+                new_key = f"{prefix}{sep}{key}" if prefix else str(key)
+                if isinstance(value, containers):
+                    if max_depth is None or depth < max_depth:
+                        if prefixes is None or new_key in prefixes:
+                            # Descend; this level resumes once the child is done
+                            stack.append((new_key, depth + 1, _children(value)))
+                            break
+                    elif keys is None or new_key in keys:
+                        yield new_key, json.dumps(value, default=str)
+                elif keys is not None and new_key not in keys:
+                    continue
                 elif isinstance(value, list):
                     # Convert lists to comma-separated strings
-                    items.append((new_key, ",".join(str(v) for v in value)))
+                    yield new_key, ",".join(str(v) for v in value)
                 else:
-                    items.append((new_key, str(value)))
-        else:
-            items.append((parent_key, str(data)))
+                    yield new_key, str(value)
+            else:
+                stack.pop()
+
+
+def _key_prefixes(keys: AbstractSet[str], sep: str) -> Set[str]:
+    """Get every separator-delimited prefix of the given keys"""
+    prefixes = set()
+    for key in keys:
+        index = key.find(sep)
+        while index != -1:
+            prefixes.add(key[:index])
+            index = key.find(sep, index + 1)
+    return prefixes
+
+
+def _children(node: Any) -> Iterator[Tuple[Any, Any]]:
+    """Iterate the (key, value) children of a dict or list"""
+    if isinstance(node, dict):
+        return iter(node.items())
+    return enumerate(node)
+
+
+class CachingConfigLoader:
+    """
+    Config loader that memoizes parsed files by stat metadata
+
+    Each file's flattened dictionary is kept together with its
+    (mtime_ns, size, inode) signature, so reloading an unchanged file
+    costs a single stat() call. Use one instance per long-running
+    process (watch mode, services, repeated diffs).
+    """
+
+    def __init__(self, max_files: int = 4096):
+        """
+        Initialize loader
+
+        Args:
+            max_files: Maximum number of parsed files to keep
+                       (least recently used are dropped first)
+        """
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+        # abspath -> ((mtime_ns, size, inode), flattened config)
+        self._files: Dict[str, Tuple[Tuple[int, int, int], Dict[str, str]]]
+        self._files = OrderedDict()
+        # Guards _files and the counters when environments load in threads
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Ship settings, not parsed contents, to worker processes
+        return {"max_files": self.max_files}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def load_from_path(
+        self, config_path: Path, keys: Optional[AbstractSet[str]] = None
+    ) -> Dict[str, str]:
+        """
+        Load configuration from a file or directory
+
+        Args:
+            config_path: Path to config file or directory
+            keys: Accepted for compatibility with ConfigLoader; files are
+                  always parsed and cached in full so every projection
+                  can reuse them, and extra keys are returned
+
+        Returns:
+            Dictionary of key-value pairs
+        """
+        config: Dict[str, str] = {}
+        with profiling.stage("load"):
+            for file_path in ConfigLoader.config_files(config_path):
+                config.update(self.load_file(file_path))
+        return config
+
+    def config_files(self, config_path: Path) -> List[Path]:
+        """List the files load_from_path would read, in merge order"""
+        return ConfigLoader.config_files(config_path)
+
+    def load_file(self, file_path: Path) -> Dict[str, str]:
+        """
+        Load a single file, reusing the cached parse if it is unchanged
 
-        return dict(items)
+        The returned dictionary is shared with the cache and must not be
+        modified.
+
+        Args:
+            file_path: Path to config file
+
+        Returns:
+            Dictionary of key-value pairs
+        """
+        st = os.stat(file_path)
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cache_key = os.path.abspath(file_path)
+
+        with self._lock:
+            entry = self._files.get(cache_key)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                self._files.move_to_end(cache_key)
+                return entry[1]
+            self.misses += 1
+
+        config = ConfigLoader._load_file(Path(file_path))
+        with self._lock:
+            self._files[cache_key] = (signature, config)
+            self._files.move_to_end(cache_key)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return config
+
+    def invalidate(self, file_path: Optional[Path] = None) -> None:
+        """
+        Drop cached parses
+
+        Args:
+            file_path: File to forget (default: forget everything)
+        """
+        with self._lock:
+            if file_path is None:
+                self._files.clear()
+            else:
+                self._files.pop(os.path.abspath(file_path), None)
@@ -0,0 +1,246 @@
+"""
+Columnar storage for many environments' configurations
+"""
+
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    ItemsView,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from sap_config_guard.core import profiling
+from sap_config_guard.core.loader import ConfigLoader
+
+# Value index of a key an environment does not define
+MISSING = -1
+
+
+class ConfigMatrix:
+    """
+    Configurations of several environments in one compact table
+
+    Every key string is stored once in a shared key table and every
+    distinct value once in a value pool. Each environment is then just an
+    array of 32-bit value indices, one per key (MISSING where undefined),
+    so landscapes that repeat the same keys, URLs and client numbers
+    across dozens of systems take a fraction of the memory of one dict
+    per environment, and comparing a key across environments compares
+    small integers.
+    """
+
+    def __init__(self):
+        """Create an empty matrix"""
+        self.keys: List[str] = []
+        self.values: List[str] = []
+        self._key_ids: Dict[str, int] = {}
+        self._value_ids: Dict[str, int] = {}
+        self._columns: Dict[str, array] = {}
+
+    @classmethod
+    def from_configs(
+        cls, env_configs: Mapping[str, Mapping[str, str]]
+    ) -> "ConfigMatrix":
+        """
+        Build a matrix from flattened configs
+
+        Args:
+            env_configs: Dictionary mapping environment names to configs
+
+        Returns:
+            ConfigMatrix holding every environment, in the given order
+        """
+        matrix = cls()
+        for env_name, config in env_configs.items():
+            matrix.add(env_name, config)
+        return matrix
+
+    @classmethod
+    def from_paths(
+        cls,
+        env_paths: Mapping[str, Path],
+        jobs: Optional[int] = None,
+        loader: Optional[Any] = None,
+    ) -> Tuple["ConfigMatrix", Dict[str, Exception]]:
+        """
+        Load environments straight into a matrix
+
+        Files are parsed concurrently, but at most jobs loads are in
+        flight at a time and each parsed dictionary is folded into the
+        matrix and released in environment order before the next load is
+        submitted, so no more than jobs per-environment dicts exist at
+        once.
+
+        Args:
+            env_paths: Dictionary mapping environment names to config paths
+            jobs: Number of loader threads (default: one per environment,
+                  capped at 32)
+            loader: Config loader (default: ConfigLoader)
+
+        Returns:
+            Tuple of (matrix, errors); an environment that failed to load
+            is added empty and its exception stored in errors
+        """
+        loader = loader or ConfigLoader
+        matrix = cls()
+        errors: Dict[str, Exception] = {}
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = max(1, jobs or min(32, len(env_paths)))
+        pending = iter(env_paths.items())
+        load = profiling.in_context(loader.load_from_path)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures: Deque[Tuple[str, Any]] = deque()
+
+            def submit_next() -> None:
+                item = next(pending, None)
+                if item is not None:
+                    env_name, env_path = item
+                    futures.append((env_name, pool.submit(load, env_path)))
+
+            for _ in range(workers):
+                submit_next()
+            while futures:
+                # Popping drops the future, and with it the parsed dict
+                env_name, future = futures.popleft()
+                try:
+                    config = future.result()
+                except Exception as e:
+                    errors[env_name] = e
+                    config = {}
+                matrix.add(env_name, config)
+                del config, future
+                submit_next()
+        return matrix, errors
+
+    @property
+    def environments(self) -> List[str]:
+        """Environment names, in insertion order"""
+        return list(self._columns)
+
+    def add(self, env_name: str, config: Mapping[str, str]) -> None:
+        """
+        Add (or replace) an environment
+
+        The config can be discarded afterwards; the matrix keeps only
+        indices into its shared tables.
+
+        Args:
+            env_name: Environment name
+            config: Flattened configuration dictionary
+        """
+        key_ids = self._key_ids
+        value_ids = self._value_ids
+        keys = self.keys
+        values = self.values
+
+        column = array("i", [MISSING]) * (len(keys) + len(config))
+        for key, value in config.items():
+            key_id = key_ids.get(key)
+            if key_id is None:
+                key_id = key_ids[key] = len(keys)
+                keys.append(key)
+            value_id = value_ids.get(value)
+            if value_id is None:
+                value_id = value_ids[value] = len(values)
+                values.append(value)
+            column[key_id] = value_id
+        del column[len(keys) :]  # noqa: E203
+        self._columns[env_name] = column
+
+    def column(self, env_name: str) -> array:
+        """
+        Get an environment's value indices, one per key in self.keys
+
+        Args:
+            env_name: Environment name
+
+        Returns:
+            array of value indices (MISSING where the key is undefined)
+        """
+        column = self._columns[env_name]
+        if len(column) < len(self.keys):
+            # Keys added after this environment are missing from it
+            column.extend(array("i", [MISSING]) * (len(self.keys) - len(column)))
+        return column
+
+    def rows(self) -> Iterator[Tuple[str, Tuple[int, ...]]]:
+        """
+        Yield each key with its value indices across environments
+
+        Yields:
+            (key, value indices in environment order) tuples
+        """
+        columns = [self.column(env_name) for env_name in self._columns]
+        return zip(self.keys, zip(*columns))
+
+    def get(self, env_name: str, key: str) -> Optional[str]:
+        """Get one value, or None if the environment does not define key"""
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            return None
+        column = self.column(env_name)
+        value_id = column[key_id]
+        return None if value_id == MISSING else self.values[value_id]
+
+    def config(self, env_name: str) -> "EnvironmentView":
+        """Get a read-only mapping view of one environment"""
+        return EnvironmentView(self, env_name)
+
+    def to_dict(self, env_name: str) -> Dict[str, str]:
+        """Materialize one environment as a plain dictionary"""
+        return dict(self.config(env_name).items())
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __contains__(self, env_name: object) -> bool:
+        return env_name in self._columns
+
+
+class EnvironmentView(Mapping):
+    """Read-only mapping over one environment of a ConfigMatrix"""
+
+    def __init__(self, matrix: ConfigMatrix, env_name: str):
+        self._matrix = matrix
+        self._column = matrix.column(env_name)
+
+    def __getitem__(self, key: str) -> str:
+        key_id = self._matrix._key_ids[key]
+        if key_id >= len(self._column) or self._column[key_id] == MISSING:
+            raise KeyError(key)
+        return self._matrix.values[self._column[key_id]]
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self._matrix.keys
+        for key_id, value_id in enumerate(self._column):
+            if value_id != MISSING:
+                yield keys[key_id]
+
+    def __len__(self) -> int:
+        return len(self._column) - self._column.count(MISSING)
+
+    def items(self) -> "EnvironmentItems":
+        return EnvironmentItems(self)
+
+
+class EnvironmentItems(ItemsView):
+    """Items view of an EnvironmentView that iterates without key lookups"""
+
+    _mapping: EnvironmentView
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        view = self._mapping
+        keys = view._matrix.keys
+        values = view._matrix.values
+        for key_id, value_id in enumerate(view._column):
+            if value_id != MISSING:
+                yield keys[key_id], values[value_id]
@@ -0,0 +1,202 @@
+"""
+Memory-mapped parser for .env and .properties files
+"""
+
+import mmap
+import re
+from itertools import chain, repeat
+from pathlib import Path
+from typing import AbstractSet, Dict, Iterator, List, Optional, Tuple, Union
+
+Buffer = Union[bytes, mmap.mmap]
+Pairs = List[Tuple[str, str]]
+
+# Size of the newline-aligned window decoded at a time
+CHUNK_SIZE = 1 << 20
+
+QUOTES = "\"'"
+_ESCAPED_QUOTE = re.compile(r'\\(["\\])')
+# Line endings recognised like universal newlines: \n, \r\n and \r
+_NEWLINE = re.compile(r"\r\n?|\n")
+
+
+def load_env(
+    file_path: Path, keys: Optional[AbstractSet[str]] = None
+) -> Dict[str, str]:
+    """
+    Load a .env file
+
+    Understands ``export KEY=value``, trailing-backslash line continuations
+    and quoted values (``\\"`` and ``\\\\`` are unescaped inside double
+    quotes; single quotes are literal).
+
+    Args:
+        file_path: Path to .env file
+        keys: If given, only these keys are kept
+
+    Returns:
+        Dictionary of key-value pairs
+    """
+    config: Dict[str, str] = {}
+    for pairs in _iter_batches(file_path, env=True, keys=keys):
+        config.update(pairs)
+    return config
+
+
+def load_properties(
+    file_path: Path, keys: Optional[AbstractSet[str]] = None
+) -> Dict[str, str]:
+    """
+    Load a Java properties file
+
+    Understands trailing-backslash line continuations.
+
+    Args:
+        file_path: Path to .properties file
+        keys: If given, only these keys are kept
+
+    Returns:
+        Dictionary of key-value pairs
+    """
+    config: Dict[str, str] = {}
+    for pairs in _iter_batches(file_path, env=False, keys=keys):
+        config.update(pairs)
+    return config
+
+
+def iter_env(file_path: Path) -> Iterator[Tuple[str, str]]:
+    """Yield key-value pairs from a .env file (see load_env)"""
+    return chain.from_iterable(_iter_batches(file_path, env=True))
+
+
+def iter_properties(file_path: Path) -> Iterator[Tuple[str, str]]:
+    """Yield key-value pairs from a Java properties file (see load_properties)"""
+    return chain.from_iterable(_iter_batches(file_path, env=False))
+
+
+def _iter_batches(
+    file_path: Path, env: bool, keys: Optional[AbstractSet[str]] = None
+) -> Iterator[Pairs]:
+    """
+    Map the file and yield its key-value pairs one window at a time
+
+    The map is decoded one newline-aligned window of about CHUNK_SIZE bytes
+    at a time, so memory stays bounded, a UTF-8 sequence is never split and
+    a window never ends inside a continued line. LF, CRLF and CR-only line
+    endings are all recognised, as with universal newlines. With keys,
+    values of other keys are skipped without being unquoted.
+    """
+    with open(file_path, "rb") as f:
+        try:
+            buf: Buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and non-regular files cannot be mapped
+            buf = f.read()
+        try:
+            size = len(buf)
+            pos = 0
+            while pos < size:
+                cut = _window_end(buf, pos, size)
+                text = buf[pos:cut].decode("utf-8")
+                lines = _NEWLINE.split(text) if "\r" in text else text.split("\n")
+                yield _parse_lines(lines, env, keys)
+                pos = cut + 1
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+
+def _window_end(buf: Buffer, pos: int, size: int) -> int:
+    """Find the newline that ends the window starting at pos"""
+    cut = pos + CHUNK_SIZE
+    if cut >= size:
+        return size
+    newline = buf.rfind(b"\n", pos, cut)
+    newline = max(newline, buf.rfind(b"\r", max(pos, newline), cut))
+    if newline == -1:
+        newline = _find_newline(buf, cut, size)
+    while newline != -1:
+        # Keep continued lines inside one window
+        tail = buf[max(pos, newline - 256) : newline]  # noqa: E203
+        if not tail.rstrip().endswith(b"\\"):
+            break
+        newline = _find_newline(buf, newline + 1, size)
+    return size if newline == -1 else newline
+
+
+def _find_newline(buf: Buffer, start: int, size: int) -> int:
+    """Find the first LF or CR at or after start, or -1"""
+    newline = buf.find(b"\n", start)
+    # Only look for \r before that \n, so LF files are not rescanned
+    carriage = buf.find(b"\r", start, size if newline == -1 else newline)
+    return newline if carriage == -1 else carriage
+
+
+def _parse_lines(
+    lines: List[str], env: bool, keys: Optional[AbstractSet[str]] = None
+) -> Pairs:
+    """Parse key=value lines, pulling continuation lines from the same iterator"""
+    pairs: Pairs = []
+    append = pairs.append
+    remaining = iter(lines)
+
+    for key, sep, value in map(str.partition, remaining, repeat("=")):
+        if not sep:
+            continue
+        key = key.strip()
+        if not key or key[0] == "#":
+            continue
+        if env and key[:6] == "export" and key[6:7].isspace():
+            key = key[7:].lstrip()
+
+        if keys is not None and key not in keys:
+            if "\\" in value:
+                # Still consume any continuation lines
+                _parse_escaped(value.strip(), remaining, env)
+            continue
+
+        # Both formats trim the value (KEY = v loads "v"); quoting keeps
+        # spaces in .env values
+        value = value.strip()
+        if "\\" in value:
+            value = _parse_escaped(value, remaining, env)
+        elif env:
+            value = value.strip(QUOTES)
+
+        append((key, value))
+
+    return pairs
+
+
+def _parse_escaped(value: str, lines: Iterator[str], env: bool) -> str:
+    """Handle a value containing backslashes: continuations and escapes"""
+    if not (env and value[0] in QUOTES):
+        while value.endswith("\\") and (len(value) - len(value.rstrip("\\"))) % 2:
+            # Join the next physical line, dropping the backslash
+            value = value[:-1] + next(lines, "").strip()
+    if env and value:
+        value = _unquote(value)
+    return value
+
+
+def _unquote(value: str) -> str:
+    """Strip .env quoting from a value"""
+    quote = value[0]
+    if quote == "'":
+        closing = value.find("'", 1)
+        if closing != -1:
+            return value[1:closing]
+    elif quote == '"':
+        closing = value.find('"', 1)
+        while closing != -1:
+            escape = closing - 1
+            while escape > 0 and value[escape] == "\\":
+                escape -= 1
+            if (closing - 1 - escape) % 2 == 0:
+                inner = value[1:closing]
+                if "\\" in inner:
+                    inner = _ESCAPED_QUOTE.sub(r"\1", inner)
+                return inner
+            closing = value.find('"', closing + 1)
+    # Unbalanced or unquoted: drop stray quote characters at either end
+    return value.strip(QUOTES)
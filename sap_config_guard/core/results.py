@@ -0,0 +1,162 @@
+"""
+Validation result types shared by the validator and compiled rule plans
+"""
+
+from enum import Enum
+from typing import Any, Dict, Tuple
+
+
+class ValidationLevel(Enum):
+    """Validation severity levels"""
+
+    ERROR = "error"
+    WARNING = "warning"
+    INFO = "info"
+
+
+# Message template for each rule id; {key} is the result's key and {0},
+# {1}, ... its args
+RULE_MESSAGES: Dict[str, str] = {
+    "required": "Missing required key: {key}",
+    "pattern": "Invalid pattern: {key} = {0} (expected pattern: {1})",
+    "secure_missing": "Secure key missing or empty: {key}",
+    "secure_short": "Secure key seems too short: {key}",
+    "min_length": "Value too short: {key} must be at least {0} characters",
+    "forbidden_in_prod": (
+        "Production violation: {key} contains forbidden value '{1}' (found in: {0})"
+    ),
+    "config_load": "Failed to load configuration: {0}",
+    "worker_failed": "Validation worker failed: {0}",
+    "message": "{0}",
+}
+
+_ICONS = {
+    ValidationLevel.ERROR: "❌",
+    ValidationLevel.WARNING: "⚠️",
+    ValidationLevel.INFO: "ℹ️",
+}
+
+
+class ValidationResult:
+    """
+    Result of a validation check
+
+    A result holds its rule id and the values the message refers to, and
+    renders the message only when it is read, so large runs keep one
+    small record per violation instead of one formatted string.
+    """
+
+    __slots__ = ("level", "key", "rule", "args")
+
+    def __init__(
+        self,
+        level: ValidationLevel,
+        key: str,
+        message: str = "",
+        rule: str = "message",
+        args: Tuple[Any, ...] = (),
+    ):
+        """
+        Initialize result
+
+        Args:
+            level: Severity
+            key: Config key the result is about
+            message: Fixed message text (for results without a rule id)
+            rule: Rule id, a key of RULE_MESSAGES
+            args: Values the rule's message template refers to
+        """
+        self.level = level
+        self.key = key
+        self.rule = rule
+        self.args = (message,) if rule == "message" else args
+
+    @property
+    def message(self) -> str:
+        """Human-readable description, rendered on each access"""
+        return RULE_MESSAGES[self.rule].format(*self.args, key=self.key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-serializable form (see from_dict)"""
+        return {
+            "level": self.level.value,
+            "key": self.key,
+            "rule": self.rule,
+            "args": list(self.args),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ValidationResult":
+        """Rebuild a result from to_dict() output"""
+        return cls(
+            ValidationLevel(data["level"]),
+            data["key"],
+            rule=data["rule"],
+            args=tuple(data["args"]),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ValidationResult):
+            return NotImplemented
+        return (self.level, self.key, self.rule, self.args) == (
+            other.level,
+            other.key,
+            other.rule,
+            other.args,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.level, self.key, self.rule, self.args))
+
+    def __str__(self) -> str:
+        return f"{_ICONS[self.level]} {self.message}"
+
+    def __repr__(self) -> str:
+        return f"ValidationResult({self.level.value}, " f"{self.key}, {self.message})"
+
+
+class ValidationSummary:
+    """Counts of results by level, for callers that only need pass/fail"""
+
+    __slots__ = ("errors", "warnings", "infos")
+
+    def __init__(self, errors: int = 0, warnings: int = 0, infos: int = 0):
+        self.errors = errors
+        self.warnings = warnings
+        self.infos = infos
+
+    def add(self, level: ValidationLevel) -> None:
+        """Count one result"""
+        if level is ValidationLevel.ERROR:
+            self.errors += 1
+        elif level is ValidationLevel.WARNING:
+            self.warnings += 1
+        else:
+            self.infos += 1
+
+    @property
+    def total(self) -> int:
+        """Number of results counted"""
+        return self.errors + self.warnings + self.infos
+
+    def is_valid(self, fail_on_warning: bool = False) -> bool:
+        """Return True if nothing counted fails validation"""
+        return not self.errors and not (fail_on_warning and self.warnings)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ValidationSummary):
+            return NotImplemented
+        return (self.errors, self.warnings, self.infos) == (
+            other.errors,
+            other.warnings,
+            other.infos,
+        )
+
+    def __str__(self) -> str:
+        return f"{self.errors} errors, {self.warnings} warnings, {self.infos} info"
+
+    def __repr__(self) -> str:
+        return (
+            f"ValidationSummary(errors={self.errors}, "
+            f"warnings={self.warnings}, infos={self.infos})"
+        )
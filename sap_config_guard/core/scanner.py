@@ -0,0 +1,86 @@
+"""
+Multi-term substring scanner for production rules
+"""
+
+import re
+from typing import Any, Dict, Iterable, Optional, Pattern
+
+
+class ForbiddenScanner:
+    """
+    Find forbidden terms in values with a single precompiled regex
+
+    The terms are folded into a trie and emitted as one regex with shared
+    prefixes factored out, so each position in a value is tried against at
+    most one path of the trie instead of every term. Matching is
+    case-insensitive and reports the leftmost, longest term found.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        """
+        Build the scanner
+
+        Args:
+            terms: Forbidden substrings (empty terms are ignored)
+        """
+        self.terms = tuple(sorted({str(term).lower() for term in terms if term}))
+        self._source = _trie_pattern(self.terms) if self.terms else None
+        self._regex: Optional[Pattern] = (
+            re.compile(self._source) if self._source else None
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Ship the regex source; it is compiled again on first use
+        return {"terms": self.terms, "_source": self._source, "_regex": None}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+    def find(self, value: str) -> Optional[str]:
+        """
+        Find the first forbidden term in a value
+
+        Args:
+            value: Value to scan
+
+        Returns:
+            The matched term, or None if the value is clean
+        """
+        if self._regex is None:
+            if self._source is None:
+                return None
+            self._regex = re.compile(self._source)
+        match = self._regex.search(str(value).lower())
+        return match.group(0) if match else None
+
+    def __bool__(self) -> bool:
+        return self._source is not None
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Build a regex matching any of the terms, with common prefixes merged"""
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End-of-term marker
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: Dict[str, dict]) -> str:
+    """Render one trie node (and its children) as a regex fragment"""
+    branches = [
+        re.escape(char) + _node_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+
+    terminal = "" in node
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if terminal else group
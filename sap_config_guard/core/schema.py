@@ -2,25 +2,38 @@
 Schema definitions and validation rules for SAP configurations
 """
 
-import re
 from typing import Dict, List, Optional, Any
 from pathlib import Path
-import yaml
+
+from sap_config_guard.core import backends
+from sap_config_guard.core.cache import SchemaCache
+from sap_config_guard.core.compiled import CompiledSchema
 
 
 class ConfigSchema:
     """Schema definition for SAP configuration validation"""
 
-    def __init__(self, schema_path: Optional[Path] = None):
+    def __init__(
+        self, schema_path: Optional[Path] = None, cache: Optional[SchemaCache] = None
+    ):
         """
         Initialize schema from file or use defaults
 
         Args:
             schema_path: Path to YAML schema file
+            cache: SchemaCache to load the compiled schema from (and store
+                   it in) instead of parsing and compiling the YAML
         """
+        self._compiled: Optional[CompiledSchema] = None
         if schema_path and schema_path.exists():
-            with open(schema_path, "r") as f:
-                self.schema = yaml.safe_load(f)
+            content = schema_path.read_bytes()
+            cached = cache.get(content) if cache is not None else None
+            if cached is not None:
+                self.schema, self._compiled = cached
+            else:
+                self.schema = backends.load_yaml(content)
+                if cache is not None:
+                    cache.put(content, self.schema, self.compile())
         else:
             self.schema = self._default_schema()
 
@@ -70,6 +83,24 @@ class ConfigSchema:
         """Get minimum length requirements"""
         return self.schema.get("min_lengths", {})
 
+    def compile(self) -> CompiledSchema:
+        """
+        Get the compiled validation plan for this schema
+
+        The plan is built on first use and reused afterwards; call
+        ``invalidate()`` after mutating ``self.schema`` in place.
+
+        Returns:
+            CompiledSchema instance
+        """
+        if self._compiled is None:
+            self._compiled = CompiledSchema(self.schema)
+        return self._compiled
+
+    def invalidate(self) -> None:
+        """Drop the compiled plan so it is rebuilt on next use"""
+        self._compiled = None
+
     def validate_pattern(self, key: str, value: str) -> bool:
         """
         Validate value against pattern for key
@@ -81,23 +112,30 @@ class ConfigSchema:
         Returns:
             True if pattern matches
         """
-        patterns = self.get_patterns()
-        if key not in patterns:
-            return True  # No pattern defined
-
-        pattern = patterns[key]
-        return bool(re.match(pattern, str(value)))
+        return self.compile().validate_pattern(key, value)
 
     def is_forbidden_in_prod(self, value: str) -> bool:
         """
         Check if value is forbidden in production
 
+        Terms match as case-insensitive substrings; empty terms are ignored.
+
         Args:
             value: Configuration value to check
 
         Returns:
             True if value contains forbidden strings
         """
-        value_lower = str(value).lower()
-        forbidden = self.get_forbidden_in_prod()
-        return any(forbidden_item in value_lower for forbidden_item in forbidden)
+        return self.compile().is_forbidden_in_prod(value)
+
+    def find_forbidden_in_prod(self, value: str) -> Optional[str]:
+        """
+        Find which production-forbidden term a value contains
+
+        Args:
+            value: Configuration value to check
+
+        Returns:
+            The matched forbidden term, or None if the value is allowed
+        """
+        return self.compile().forbidden_in_prod.find(value)
@@ -2,41 +2,41 @@
 Core validation engine for SAP configurations
 """
 
+import os
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from enum import Enum
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Tuple,
+    Optional,
+)
+
+from sap_config_guard.core import profiling
+from sap_config_guard.core.cache import ResultCache
 from sap_config_guard.core.schema import ConfigSchema
 from sap_config_guard.core.loader import ConfigLoader
+from sap_config_guard.core.results import (
+    ValidationLevel,
+    ValidationResult,
+    ValidationSummary,
+)
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
-class ValidationLevel(Enum):
-    """Validation severity levels"""
-
-    ERROR = "error"
-    WARNING = "warning"
-    INFO = "info"
+    from sap_config_guard.core.matrix import ConfigMatrix
 
+# Outcome of validating one target: (config_path, results, is_valid)
+TargetResult = Tuple[Path, List[ValidationResult], bool]
 
-class ValidationResult:
-    """Result of a validation check"""
-
-    def __init__(self, level: ValidationLevel, key: str, message: str):
-        self.level = level
-        self.key = key
-        self.message = message
-
-    def __str__(self) -> str:
-        if self.level == ValidationLevel.ERROR:
-            icon = "❌"
-        elif self.level == ValidationLevel.WARNING:
-            icon = "⚠️"
-        else:
-            icon = "ℹ️"
-        return f"{icon} {self.message}"
-
-    def __repr__(self) -> str:
-        return f"ValidationResult({self.level.value}, " f"{self.key}, {self.message})"
+# Per-process validator used by validate_many workers
+_worker_validator: Optional["ConfigValidator"] = None
 
 
 class ConfigValidator:
@@ -46,6 +46,8 @@ class ConfigValidator:
         self,
         schema: Optional[ConfigSchema] = None,
         schema_path: Optional[Path] = None,
+        cache: Optional[ResultCache] = None,
+        loader: Optional[Any] = None,
     ):
         """
         Initialize validator
@@ -53,17 +55,25 @@ class ConfigValidator:
         Args:
             schema: ConfigSchema instance (optional)
             schema_path: Path to schema YAML file (optional)
+            cache: ResultCache to reuse results for unchanged configs
+                   (optional)
+            loader: Config loader (default: ConfigLoader); pass a
+                    CachingConfigLoader to reuse parses across calls
         """
         if schema:
             self.schema = schema
         else:
             self.schema = ConfigSchema(schema_path)
+        self.plan = self.schema.compile()
+        self.cache = cache
+        self.loader = loader or ConfigLoader
 
     def validate(
         self,
         config_path: Path,
         environment: str = "dev",
         fail_on_warning: bool = False,
+        fail_fast: bool = False,
     ) -> Tuple[List[ValidationResult], bool]:
         """
         Validate configuration file or directory
@@ -72,144 +82,257 @@ class ConfigValidator:
             config_path: Path to config file or directory
             environment: Environment name (dev, qa, prod)
             fail_on_warning: If True, warnings are treated as errors
+            fail_fast: If True, stop at the first failing result (see
+                       validate_config); the result cache is not used
 
         Returns:
             Tuple of (validation_results, is_valid)
         """
-        # Load configuration
+        cache_key = None
+        if self.cache is not None and not fail_fast:
+            try:
+                cache_key = self.cache.key(
+                    self.loader.config_files(config_path),
+                    self.plan.fingerprint,
+                    environment,
+                    fail_on_warning,
+                )
+            except OSError:
+                cache_key = None
+            else:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    profiling.count("cache_hits")
+                    return cached
+
+        # Load configuration; outside prod only the keys the schema
+        # references are needed, so the loader can skip everything else
+        production = environment.lower() == "prod"
+        keys = None if production else self.plan.projection
         try:
-            config = ConfigLoader.load_from_path(config_path)
+            config = self.loader.load_from_path(config_path, keys=keys)
         except Exception as e:
-            return [
-                ValidationResult(
-                    ValidationLevel.ERROR,
-                    "config_load",
-                    f"Failed to load configuration: {str(e)}",
-                )
-            ], False
+            return [_load_failure(e)], False
 
-        results = []
+        results, is_valid = self.validate_config(
+            config, environment, fail_on_warning, fail_fast
+        )
 
-        # Check required keys
-        results.extend(self._check_required_keys(config))
+        if cache_key is not None:
+            self.cache.put(cache_key, results, is_valid)
 
-        # Check patterns
-        results.extend(self._check_patterns(config))
+        return results, is_valid
 
-        # Check secure keys (warnings if missing)
-        results.extend(self._check_secure_keys(config))
+    def validate_config(
+        self,
+        config: Mapping[str, str],
+        environment: str = "dev",
+        fail_on_warning: bool = False,
+        fail_fast: bool = False,
+    ) -> Tuple[List[ValidationResult], bool]:
+        """
+        Validate an already-loaded, flattened configuration
+
+        Args:
+            config: Flattened configuration mapping (a dict or a
+                    ConfigMatrix environment view)
+            environment: Environment name (dev, qa, prod)
+            fail_on_warning: If True, warnings are treated as errors
+            fail_fast: If True, run the cheapest rules first and stop at
+                       the first error (or warning, with fail_on_warning);
+                       results then hold at most that one failure
 
-        # Check minimum lengths
-        results.extend(self._check_min_lengths(config))
+        Returns:
+            Tuple of (validation_results, is_valid)
+        """
+        production = environment.lower() == "prod"
+        if fail_fast:
+            failure = self.plan.first_failure(config, production, fail_on_warning)
+            if failure is None:
+                return [], True
+            return [failure], False
 
-        # Environment-specific checks
-        if environment.lower() == "prod":
-            results.extend(self._check_production_rules(config))
+        results = self.plan.check(config, production=production)
 
         # Determine if valid
-        has_errors = any(r.level == ValidationLevel.ERROR for r in results)
-        has_warnings = any(r.level == ValidationLevel.WARNING for r in results)
-
-        is_valid = not has_errors and (not fail_on_warning or not has_warnings)
+        levels = {r.level for r in results}
+        is_valid = ValidationLevel.ERROR not in levels and not (
+            fail_on_warning and ValidationLevel.WARNING in levels
+        )
 
         return results, is_valid
 
-    def _check_required_keys(self, config: Dict[str, str]) -> List[ValidationResult]:
-        """Check for missing required keys"""
-        results = []
-        required = self.schema.get_required_keys()
-
-        for key in required:
-            if key not in config or not config[key]:
-                results.append(
-                    ValidationResult(
-                        ValidationLevel.ERROR,
-                        key,
-                        f"Missing required key: {key}",
-                    )
-                )
+    def summarize(
+        self,
+        config_path: Path,
+        environment: str = "dev",
+        fail_on_warning: bool = False,
+    ) -> Tuple[ValidationSummary, bool]:
+        """
+        Count validation results by level without keeping the results
+
+        Use this when only pass/fail matters: the production scan counts
+        matches instead of building a result for each one.
+
+        Args:
+            config_path: Path to config file or directory
+            environment: Environment name (dev, qa, prod)
+            fail_on_warning: If True, warnings are treated as errors
+
+        Returns:
+            Tuple of (summary, is_valid)
+        """
+        production = environment.lower() == "prod"
+        keys = None if production else self.plan.projection
+        try:
+            config = self.loader.load_from_path(config_path, keys=keys)
+        except Exception:
+            summary = ValidationSummary(errors=1)
+        else:
+            summary = self.plan.count(config, production=production)
+        return summary, summary.is_valid(fail_on_warning)
+
+    def validate_matrix(
+        self,
+        matrix: "ConfigMatrix",
+        fail_on_warning: bool = False,
+    ) -> Dict[str, Tuple[List[ValidationResult], bool]]:
+        """
+        Validate every environment held in a ConfigMatrix
+
+        Each environment is validated under its own name, so one called
+        "prod" gets the production rules.
+
+        Args:
+            matrix: ConfigMatrix holding the environments
+            fail_on_warning: If True, warnings are treated as errors
+
+        Returns:
+            Dictionary mapping environment names to (results, is_valid)
+        """
+        return {
+            env_name: self.validate_config(
+                matrix.config(env_name), env_name, fail_on_warning
+            )
+            for env_name in matrix.environments
+        }
+
+    def iter_validate(
+        self,
+        config_path: Path,
+        environment: str = "dev",
+    ) -> Iterator[ValidationResult]:
+        """
+        Validate while parsing, without holding the whole config
 
-        return results
+        Memory stays bounded for huge .env/.properties files. As the last
+        definition of a key wins, results are yielded once the input has
+        been read, and match what validate() reports (production
+        violations in the order their keys first violated).
 
-    def _check_patterns(self, config: Dict[str, str]) -> List[ValidationResult]:
-        """Check values against regex patterns"""
-        results = []
-        patterns = self.schema.get_patterns()
+        Args:
+            config_path: Path to config file or directory
+            environment: Environment name (dev, qa, prod)
 
-        for key, pattern in patterns.items():
-            if key in config:
-                value = config[key]
-                if not self.schema.validate_pattern(key, value):
-                    results.append(
+        Yields:
+            ValidationResult objects
+        """
+        pairs = ConfigLoader.iter_pairs(config_path)
+        stream = self.plan.check_stream(pairs, production=environment.lower() == "prod")
+        try:
+            yield from stream
+        except Exception as e:
+            yield _load_failure(e)
+
+    def validate_many(
+        self,
+        config_paths: Iterable[Path],
+        environment: str = "dev",
+        fail_on_warning: bool = False,
+        workers: Optional[int] = None,
+        fail_fast: bool = False,
+    ) -> Iterator[TargetResult]:
+        """
+        Validate many configuration targets, fanning out to a process pool
+
+        Results are yielded as each target completes, so their order is
+        not the input order when more than one worker is used.
+
+        Args:
+            config_paths: Paths to config files or directories
+            environment: Environment name (dev, qa, prod)
+            fail_on_warning: If True, warnings are treated as errors
+            workers: Number of worker processes (default: CPU count);
+                     1 validates in the current process
+            fail_fast: If True, stop each target at its first failure
+
+        Yields:
+            Tuples of (config_path, validation_results, is_valid)
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        paths = [Path(p) for p in config_paths]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(paths)))
+
+        if workers == 1:
+            for path in paths:
+                results, is_valid = self.validate(
+                    path, environment, fail_on_warning, fail_fast
+                )
+                yield path, results, is_valid
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.schema, self.cache, self.loader),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _validate_in_worker, path, environment, fail_on_warning, fail_fast
+                ): path
+                for path in paths
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield path, [
                         ValidationResult(
                             ValidationLevel.ERROR,
-                            key,
-                            f"Invalid pattern: {key} = {value} "
-                            f"(expected pattern: {pattern})",
+                            "config_load",
+                            rule="worker_failed",
+                            args=(str(e),),
                         )
-                    )
-
-        return results
-
-    def _check_secure_keys(self, config: Dict[str, str]) -> List[ValidationResult]:
-        """Check secure keys (warn if missing or empty)"""
-        results = []
-        secure_keys = self.schema.get_secure_keys()
-
-        for key in secure_keys:
-            if key not in config or not config[key]:
-                results.append(
-                    ValidationResult(
-                        ValidationLevel.WARNING,
-                        key,
-                        f"Secure key missing or empty: {key}",
-                    )
-                )
-            elif len(config[key]) < 4:  # Suspiciously short
-                results.append(
-                    ValidationResult(
-                        ValidationLevel.WARNING,
-                        key,
-                        f"Secure key seems too short: {key}",
-                    )
-                )
+                    ], False
 
-        return results
-
-    def _check_min_lengths(self, config: Dict[str, str]) -> List[ValidationResult]:
-        """Check minimum length requirements"""
-        results = []
-        min_lengths = self.schema.get_min_lengths()
-
-        for key, min_length in min_lengths.items():
-            if key in config and len(config[key]) < min_length:
-                results.append(
-                    ValidationResult(
-                        ValidationLevel.ERROR,
-                        key,
-                        f"Value too short: {key} must be at least "
-                        f"{min_length} characters",
-                    )
-                )
 
-        return results
-
-    def _check_production_rules(self, config: Dict[str, str]) -> List[ValidationResult]:
-        """Check production-specific rules"""
-        results = []
-
-        for key, value in config.items():
-            if self.schema.is_forbidden_in_prod(value):
-                results.append(
-                    ValidationResult(
-                        ValidationLevel.ERROR,
-                        key,
-                        f"Production violation: {key} contains "
-                        f"forbidden value (found in: {value})",
-                    )
-                )
+def _load_failure(error: Exception) -> ValidationResult:
+    """Build the result for a config that could not be loaded"""
+    return ValidationResult(
+        ValidationLevel.ERROR, "config_load", rule="config_load", args=(str(error),)
+    )
+
+
+def _init_worker(
+    schema: ConfigSchema, cache: Optional[ResultCache], loader: Any
+) -> None:
+    """Build the validator once per worker process"""
+    global _worker_validator
+    _worker_validator = ConfigValidator(schema=schema, cache=cache, loader=loader)
+
 
-        return results
+def _validate_in_worker(
+    config_path: Path, environment: str, fail_on_warning: bool, fail_fast: bool
+) -> TargetResult:
+    """Validate a single target inside a worker process"""
+    results, is_valid = _worker_validator.validate(
+        config_path, environment, fail_on_warning, fail_fast
+    )
+    return config_path, results, is_valid
 
 
 def validate(
@@ -217,6 +340,7 @@ def validate(
     schema_path: Optional[str] = None,
     environment: str = "dev",
     fail_on_warning: bool = False,
+    fail_fast: bool = False,
 ) -> Tuple[List[ValidationResult], bool]:
     """
     Convenience function to validate configuration
@@ -226,6 +350,7 @@ def validate(
         schema_path: Optional path to schema YAML file
         environment: Environment name (dev, qa, prod)
         fail_on_warning: If True, warnings are treated as errors
+        fail_fast: If True, stop at the first failing result
 
     Returns:
         Tuple of (validation_results, is_valid)
@@ -234,4 +359,61 @@ def validate(
     schema_path_obj = Path(schema_path) if schema_path else None
 
     validator = ConfigValidator(schema_path=schema_path_obj)
-    return validator.validate(config_path_obj, environment, fail_on_warning)
+    return validator.validate(config_path_obj, environment, fail_on_warning, fail_fast)
+
+
+async def async_validate(
+    config_path: str,
+    schema_path: Optional[str] = None,
+    environment: str = "dev",
+    fail_on_warning: bool = False,
+    fail_fast: bool = False,
+    *,
+    validator: Optional[ConfigValidator] = None,
+    executor: Optional["Executor"] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[List[ValidationResult], bool]:
+    """
+    Validate configuration without blocking the event loop
+
+    Reading, parsing and checking run in an executor. The call can be
+    cancelled or time out while waiting; work already running in a
+    thread finishes in the background and its result is discarded.
+
+    Args:
+        config_path: Path to config file or directory
+        schema_path: Optional path to schema YAML file (ignored if
+                     validator is given)
+        environment: Environment name (dev, qa, prod)
+        fail_on_warning: If True, warnings are treated as errors
+        fail_fast: If True, stop at the first failing result
+        validator: Validator to reuse across calls (default: build one,
+                   also in the executor)
+        executor: Executor to run in (default: the loop's thread pool);
+                  a ProcessPoolExecutor spreads parsing across cores
+        timeout: Seconds to wait before raising asyncio.TimeoutError
+
+    Returns:
+        Tuple of (validation_results, is_valid)
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+
+    async def run() -> Tuple[List[ValidationResult], bool]:
+        active = validator
+        if active is None:
+            schema_path_obj = Path(schema_path) if schema_path else None
+            active = await loop.run_in_executor(
+                executor, partial(ConfigValidator, schema_path=schema_path_obj)
+            )
+        return await loop.run_in_executor(
+            executor,
+            profiling.in_context(active.validate),
+            Path(config_path),
+            environment,
+            fail_on_warning,
+            fail_fast,
+        )
+
+    return await asyncio.wait_for(run(), timeout)
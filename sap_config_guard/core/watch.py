@@ -0,0 +1,167 @@
+"""
+Watch mode: re-validate configurations incrementally as files change
+"""
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sap_config_guard.core.loader import CachingConfigLoader
+from sap_config_guard.core.results import ValidationLevel, ValidationResult
+from sap_config_guard.core.validator import ConfigValidator
+
+
+@dataclass
+class WatchUpdate:
+    """Validation state after a detected change"""
+
+    changed_keys: List[str]
+    results: List[ValidationResult]
+    is_valid: bool
+
+
+class ConfigWatcher:
+    """
+    Poll a config path and re-validate only the keys that changed
+
+    Files are reloaded through a CachingConfigLoader, so a poll where
+    nothing changed costs one stat() per file. When a file does change,
+    the old and new flattened configs are diffed and only the rules
+    attached to the changed keys are re-run.
+    """
+
+    def __init__(
+        self,
+        validator: ConfigValidator,
+        config_path: Path,
+        environment: str = "dev",
+        fail_on_warning: bool = False,
+        interval: float = 0.5,
+    ):
+        """
+        Initialize watcher
+
+        Args:
+            validator: Validator holding the compiled schema
+            config_path: Path to config file or directory
+            environment: Environment name (dev, qa, prod)
+            fail_on_warning: If True, warnings are treated as errors
+            interval: Seconds between polls in run()
+        """
+        self.validator = validator
+        self.config_path = config_path
+        self.production = environment.lower() == "prod"
+        self.fail_on_warning = fail_on_warning
+        self.interval = interval
+        if isinstance(validator.loader, CachingConfigLoader):
+            self.loader = validator.loader
+        else:
+            self.loader = CachingConfigLoader()
+
+        self._files: List[Path] = []
+        self._config: Dict[str, str] = {}
+        self._by_key: Dict[str, List[ValidationResult]] = {}
+        self._load_error: Optional[ValidationResult] = None
+
+    def start(self) -> WatchUpdate:
+        """
+        Load and fully validate the config
+
+        Returns:
+            WatchUpdate covering every key
+        """
+        self._files = []
+        self._config = {}
+        self._by_key = {}
+        return self._refresh(force=True)
+
+    def poll(self) -> Optional[WatchUpdate]:
+        """
+        Check for changes and re-validate the affected keys
+
+        Returns:
+            WatchUpdate if anything changed, otherwise None
+        """
+        return self._refresh(force=False)
+
+    def run(
+        self,
+        callback: Callable[[WatchUpdate], None],
+        max_polls: Optional[int] = None,
+    ) -> None:
+        """
+        Validate, then poll until interrupted
+
+        Args:
+            callback: Called with the initial state and every update
+            max_polls: Stop after this many polls (default: run forever)
+        """
+        callback(self.start())
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            time.sleep(self.interval)
+            polls += 1
+            update = self.poll()
+            if update is not None:
+                callback(update)
+
+    def results(self) -> List[ValidationResult]:
+        """Get the current validation results"""
+        if self._load_error is not None:
+            return [self._load_error]
+        return [result for results in self._by_key.values() for result in results]
+
+    def _refresh(self, force: bool) -> Optional[WatchUpdate]:
+        """Reload the config and re-check changed keys"""
+        misses = self.loader.misses
+        try:
+            files = self.loader.config_files(self.config_path)
+            config = self.loader.load_from_path(self.config_path)
+        except Exception as e:
+            error = ValidationResult(
+                ValidationLevel.ERROR, "config_load", rule="config_load", args=(str(e),)
+            )
+            if self._load_error == error:
+                return None
+            self._load_error = error
+            return WatchUpdate(["config_load"], [error], False)
+
+        recovered = self._load_error is not None
+        self._load_error = None
+        if not force and not recovered:
+            if self.loader.misses == misses and files == self._files:
+                return None
+
+        plan = self.validator.plan
+        if force:
+            changed = list(config)
+            affected = list(plan.key_rules)
+            if self.production:
+                affected.extend(key for key in config if key not in plan.key_rules)
+        else:
+            old = self._config
+            changed = [key for key in config if old.get(key) != config[key]]
+            changed.extend(key for key in old if key not in config)
+            if not changed and not recovered:
+                self._files = files
+                return None
+            if self.production:
+                affected = changed
+            else:
+                affected = [key for key in changed if key in plan.key_rules]
+
+        self._files = files
+        self._config = config
+        for key, results in plan.check_keys(config, affected, self.production).items():
+            if results:
+                self._by_key[key] = results
+            else:
+                self._by_key.pop(key, None)
+
+        results = self.results()
+        has_errors = any(r.level == ValidationLevel.ERROR for r in results)
+        has_warnings = any(r.level == ValidationLevel.WARNING for r in results)
+        is_valid = not has_errors and (not self.fail_on_warning or not has_warnings)
+
+        return WatchUpdate(changed, results, is_valid)
@@ -2,28 +2,147 @@
 Environment diff and drift detection
 """
 
+import sys
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
+from itertools import repeat
 
-from sap_config_guard.core.loader import ConfigLoader
+from sap_config_guard.core import profiling
+
+# The loader and matrix are imported where used, so formatting results
+# received from the resident server does not load the parsers
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from sap_config_guard.core.matrix import ConfigMatrix
+
+# Placeholder for a key an environment does not define
+_MISSING = object()
 
 
 @dataclass
 class DiffResult:
-    """Result of environment comparison"""
+    """
+    Result of environment comparison
+
+    message is built from the other fields on first access unless one is
+    passed in, so large diffs do not format a string per drifting key.
+    """
 
     key: str
     environments: Dict[str, str]
     status: str  # 'missing', 'different', 'same'
-    message: str
+    message: Optional[str] = None  # type: ignore[assignment]
+    missing_in: Tuple[str, ...] = ()
+
+    # Backing store for the message property defined below (not a field)
+    _message = None
+
+    def _build_message(self) -> str:
+        """Describe the result"""
+        if self.status == "missing":
+            return f"Key '{self.key}' missing in: {', '.join(self.missing_in)}"
+        if self.status == "different":
+            value_str = ", ".join(
+                f"{env}={val}" for env, val in self.environments.items()
+            )
+            return f"Key '{self.key}' differs: {value_str}"
+        return f"Key '{self.key}' is consistent across environments"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-serializable form"""
+        return {
+            "key": self.key,
+            "status": self.status,
+            "environments": self.environments,
+            "missing_in": list(self.missing_in),
+        }
+
+
+def _get_message(self: DiffResult) -> str:
+    if self._message is None:
+        self._message = self._build_message()
+    return self._message
+
+
+def _set_message(self: DiffResult, value: Optional[str]) -> None:
+    self._message = value
+
+
+# Installed after @dataclass has read the field default, so the generated
+# __init__ still takes message as an optional argument
+DiffResult.message = property(  # type: ignore[assignment]
+    _get_message, _set_message, doc="Human-readable description"
+)
 
 
 class EnvironmentDiff:
     """Compare configurations across environments"""
 
     @staticmethod
-    def compare_environments(env_paths: Dict[str, Path]) -> List[DiffResult]:
+    def load_environments(
+        env_paths: Dict[str, Path],
+        jobs: Optional[int] = None,
+        loader: Optional[Any] = None,
+    ) -> Tuple[Dict[str, Dict[str, str]], Dict[str, Exception]]:
+        """
+        Load every environment's config concurrently
+
+        Loading is I/O bound, so a thread pool lets the latencies of
+        network-mounted config shares overlap instead of adding up.
+
+        Args:
+            env_paths: Dictionary mapping environment names to config paths
+            jobs: Number of loader threads (default: one per environment,
+                  capped at 32); 1 loads serially
+            loader: Config loader (default: ConfigLoader)
+
+        Returns:
+            Tuple of (configs, errors). configs keeps the order of
+            env_paths and holds an empty dict for an environment that
+            failed; errors maps those environments to their exception.
+        """
+        if loader is None:
+            from sap_config_guard.core.loader import ConfigLoader
+
+            loader = ConfigLoader
+        loaded: Dict[str, Dict[str, str]] = {}
+        errors: Dict[str, Exception] = {}
+
+        if jobs is None:
+            jobs = min(32, len(env_paths))
+        if jobs <= 1 or len(env_paths) <= 1:
+            for env_name, env_path in env_paths.items():
+                try:
+                    loaded[env_name] = loader.load_from_path(env_path)
+                except Exception as e:
+                    errors[env_name] = e
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            load = profiling.in_context(loader.load_from_path)
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                futures = {
+                    env_name: pool.submit(load, env_path)
+                    for env_name, env_path in env_paths.items()
+                }
+                for env_name, future in futures.items():
+                    try:
+                        loaded[env_name] = future.result()
+                    except Exception as e:
+                        errors[env_name] = e
+
+        configs = {env_name: loaded.get(env_name, {}) for env_name in env_paths}
+        return configs, errors
+
+    @staticmethod
+    def compare_environments(
+        env_paths: Dict[str, Path],
+        loader: Optional[Any] = None,
+        jobs: Optional[int] = None,
+        errors: Optional[Dict[str, Exception]] = None,
+    ) -> List[DiffResult]:
         """
         Compare configurations across multiple environments
 
@@ -31,68 +150,187 @@ class EnvironmentDiff:
             env_paths: Dictionary mapping environment names to config paths
                       e.g., {'dev': Path('./config/dev'),
                              'qa': Path('./config/qa')}
+            loader: Config loader (default: ConfigLoader); pass a
+                    CachingConfigLoader to skip re-parsing unchanged files
+            jobs: Number of loader threads (see load_environments)
+            errors: If given, load failures are stored here by environment
+                    name instead of being printed as warnings
+
+        Returns:
+            List of DiffResult objects
+        """
+        with profiling.stage("diff.load"):
+            env_configs, load_errors = EnvironmentDiff.load_environments(
+                env_paths, jobs=jobs, loader=loader
+            )
+        EnvironmentDiff._report_load_errors(load_errors, errors)
+        with profiling.stage("diff.compare"):
+            return EnvironmentDiff.compare_configs(env_configs)
+
+    @staticmethod
+    async def async_compare_environments(
+        env_paths: Dict[str, Path],
+        loader: Optional[Any] = None,
+        errors: Optional[Dict[str, Exception]] = None,
+        executor: Optional["Executor"] = None,
+        timeout: Optional[float] = None,
+    ) -> List[DiffResult]:
+        """
+        Compare configurations across environments without blocking the
+        event loop
+
+        Each environment is loaded as its own executor job, so loads
+        overlap with each other and with other coroutines, and the
+        comparison itself runs in the executor too. On cancellation or
+        timeout, loads that have not started are dropped; ones already
+        running finish in the background.
+
+        Args:
+            env_paths: Dictionary mapping environment names to config paths
+            loader: Config loader (default: ConfigLoader)
+            errors: If given, load failures are stored here by environment
+                    name instead of being printed as warnings
+            executor: Executor to run in (default: the loop's thread pool)
+            timeout: Seconds to wait before raising asyncio.TimeoutError
 
         Returns:
             List of DiffResult objects
         """
-        # Load all environment configs
-        env_configs = {}
-        for env_name, env_path in env_paths.items():
-            try:
-                env_configs[env_name] = ConfigLoader.load_from_path(env_path)
-            except Exception as e:
-                env_configs[env_name] = {}
-                print(f"Warning: Failed to load {env_name} config: {e}")
-
-        # Get all unique keys across environments
-        all_keys: Set[str] = set()
-        for config in env_configs.values():
-            all_keys.update(config.keys())
+        import asyncio
+
+        if loader is None:
+            from sap_config_guard.core.loader import ConfigLoader
+
+            loader = ConfigLoader
+        loop = asyncio.get_running_loop()
+
+        async def run() -> List[DiffResult]:
+            load = profiling.in_context(loader.load_from_path)
+            outcomes = await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, load, env_path)
+                    for env_path in env_paths.values()
+                ),
+                return_exceptions=True,
+            )
+            env_configs: Dict[str, Dict[str, str]] = {}
+            load_errors: Dict[str, Exception] = {}
+            for env_name, outcome in zip(env_paths, outcomes):
+                if isinstance(outcome, Exception):
+                    load_errors[env_name] = outcome
+                    outcome = {}
+                env_configs[env_name] = outcome
+            EnvironmentDiff._report_load_errors(load_errors, errors)
+            return await loop.run_in_executor(
+                executor,
+                profiling.in_context(EnvironmentDiff.compare_configs),
+                env_configs,
+            )
+
+        return await asyncio.wait_for(run(), timeout)
+
+    @staticmethod
+    def _report_load_errors(
+        load_errors: Dict[str, Exception],
+        errors: Optional[Dict[str, Exception]],
+    ) -> None:
+        """Store load errors in errors, or print them if it is None"""
+        if errors is not None:
+            errors.update(load_errors)
+        else:
+            for env_name, e in load_errors.items():
+                print(
+                    f"Warning: Failed to load {env_name} config: {e}", file=sys.stderr
+                )
+
+    @staticmethod
+    def compare_configs(
+        env_configs: Mapping[str, Mapping[str, str]],
+    ) -> List[DiffResult]:
+        """
+        Compare already-loaded configurations across environments
+
+        The configs are laid out as columns over the sorted union of keys,
+        so each key becomes one row of values. A row whose values all equal
+        the first is skipped with a single tuple count; only rows that
+        drift are walked to build their DiffResult.
+
+        Args:
+            env_configs: Dictionary mapping environment names to flattened
+                         configs, in display order
+
+        Returns:
+            List of DiffResult objects, sorted by key
+        """
+        env_names = list(env_configs)
+        configs = list(env_configs.values())
+        n_envs = len(configs)
+        keys = sorted(set().union(*configs))
+        profiling.count("keys_compared", len(keys))
+        columns = [list(map(config.get, keys, repeat(_MISSING))) for config in configs]
 
         results = []
+        for key, row in zip(keys, zip(*columns)):
+            if row.count(row[0]) == n_envs:
+                continue
 
-        # Compare each key across environments
-        for key in sorted(all_keys):
             key_values = {}
-            present_in = []
+            missing_in = []
+            for env_name, value in zip(env_names, row):
+                if value is _MISSING:
+                    missing_in.append(env_name)
+                else:
+                    key_values[env_name] = value
 
-            for env_name, config in env_configs.items():
-                if key in config:
-                    key_values[env_name] = config[key]
-                    present_in.append(env_name)
-
-            # Check if key is missing in some environments
-            if len(present_in) < len(env_paths):
-                missing_in = set(env_paths.keys()) - set(present_in)
+            if missing_in:
                 results.append(
-                    DiffResult(
-                        key=key,
-                        environments=key_values,
-                        status="missing",
-                        message=(
-                            f"Key '{key}' missing in: " f"{', '.join(missing_in)}"
-                        ),
-                    )
+                    DiffResult(key, key_values, "missing", missing_in=tuple(missing_in))
                 )
-            # Check if values differ
-            elif len(set(key_values.values())) > 1:
-                value_str = ", ".join(f"{env}={val}" for env, val in key_values.items())
+            else:
+                results.append(DiffResult(key, key_values, "different"))
+
+        return results
+
+    @staticmethod
+    def compare_matrix(matrix: "ConfigMatrix") -> List[DiffResult]:
+        """
+        Compare the environments held in a ConfigMatrix
+
+        Values are compared by their index in the shared value pool, so
+        each key's check is a count over a tuple of small integers.
+
+        Args:
+            matrix: ConfigMatrix holding the environments to compare
+
+        Returns:
+            List of DiffResult objects, sorted by key
+        """
+        from sap_config_guard.core.matrix import MISSING
+
+        env_names = matrix.environments
+        n_envs = len(env_names)
+        values = matrix.values
+
+        drifting = sorted(
+            (key, row) for key, row in matrix.rows() if row.count(row[0]) != n_envs
+        )
+
+        results = []
+        for key, row in drifting:
+            key_values = {}
+            missing_in = []
+            for env_name, value_id in zip(env_names, row):
+                if value_id == MISSING:
+                    missing_in.append(env_name)
+                else:
+                    key_values[env_name] = values[value_id]
+
+            if missing_in:
                 results.append(
-                    DiffResult(
-                        key=key,
-                        environments=key_values,
-                        status="different",
-                        message=f"Key '{key}' differs: {value_str}",
-                    )
+                    DiffResult(key, key_values, "missing", missing_in=tuple(missing_in))
                 )
-            # Values are the same (optional - can be filtered)
-            # else:
-            #     results.append(DiffResult(
-            #         key=key,
-            #         environments=key_values,
-            #         status='same',
-            #         message=f"Key '{key}' is consistent across environments"
-            #     ))
+            else:
+                results.append(DiffResult(key, key_values, "different"))
 
         return results
 
@@ -118,16 +356,16 @@ class EnvironmentDiff:
         for result in results:
             if result.status == "same" and not show_same:
                 continue
-
-            if result.status == "missing":
-                output.append(f"  ❌ {result.message}")
-            elif result.status == "different":
-                output.append(f"  ⚠️  {result.message}")
-            elif result.status == "same":
-                output.append(f"  ✅ {result.message}")
+            output.append(EnvironmentDiff.format_diff_line(result))
 
         return "\n".join(output)
 
+    @staticmethod
+    def format_diff_line(result: DiffResult) -> str:
+        """Format one diff result as a report line"""
+        icon = {"missing": "❌", "different": "⚠️ ", "same": "✅"}[result.status]
+        return f"  {icon} {result.message}"
+
 
 def compare_environments(env_paths: Dict[str, str]) -> List[DiffResult]:
     """
@@ -142,3 +380,23 @@ def compare_environments(env_paths: Dict[str, str]) -> List[DiffResult]:
     """
     env_paths_obj = {env: Path(path) for env, path in env_paths.items()}
     return EnvironmentDiff.compare_environments(env_paths_obj)
+
+
+async def async_compare_environments(
+    env_paths: Dict[str, str], timeout: Optional[float] = None
+) -> List[DiffResult]:
+    """
+    Convenience coroutine to compare environments without blocking
+
+    Args:
+        env_paths: Dictionary mapping environment names to config paths
+                  (strings)
+        timeout: Seconds to wait before raising asyncio.TimeoutError
+
+    Returns:
+        List of DiffResult objects
+    """
+    env_paths_obj = {env: Path(path) for env, path in env_paths.items()}
+    return await EnvironmentDiff.async_compare_environments(
+        env_paths_obj, timeout=timeout
+    )
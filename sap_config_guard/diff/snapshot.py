@@ -0,0 +1,326 @@
+"""
+Baseline snapshots of environment configs and drift against them
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sap_config_guard import __version__
+from sap_config_guard.core.cache import default_cache_dir
+from sap_config_guard.core.loader import ConfigLoader
+
+# Leading bytes of every snapshot file; the digit is the layout version
+SNAPSHOT_MAGIC = b"SCGSNAP2"
+
+# Environment variable holding a shared snapshot key (see snapshot_key)
+SNAPSHOT_KEY_ENV = "SAP_CONFIG_GUARD_SNAPSHOT_KEY"
+
+
+def snapshot_key() -> bytes:
+    """
+    Get the secret that snapshot hashes are keyed with
+
+    Uses $SAP_CONFIG_GUARD_SNAPSHOT_KEY if set, so machines that save and
+    compare the same snapshot (e.g. CI jobs) can share it. Otherwise a
+    random key is kept in snapshot.key in the cache directory, created
+    with 0600 permissions on first use.
+
+    Returns:
+        32-byte key
+    """
+    override = os.environ.get(SNAPSHOT_KEY_ENV)
+    if override:
+        return hashlib.sha256(override.encode("utf-8")).digest()
+
+    key_path = default_cache_dir() / "snapshot.key"
+    try:
+        return key_path.read_bytes()
+    except FileNotFoundError:
+        pass
+    key_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=key_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(secrets.token_bytes(32))
+        # Publish atomically; if another process got there first, use its key
+        try:
+            os.link(tmp_name, key_path)
+        except FileExistsError:
+            pass
+    finally:
+        os.unlink(tmp_name)
+    return key_path.read_bytes()
+
+
+def hash_value(value: str, key: bytes) -> str:
+    """Get the short keyed digest stored for a config value"""
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=8, key=key).hexdigest()
+
+
+def key_id(key: bytes) -> str:
+    """Get a non-secret identifier of a snapshot key"""
+    return hashlib.blake2b(b"snapshot-key-id", digest_size=8, key=key).hexdigest()
+
+
+@dataclass
+class BaselineDrift:
+    """A key, or a whole environment, that changed since the baseline"""
+
+    environment: str
+    key: Optional[str]  # None when the whole environment was added or removed
+    status: str  # 'added', 'removed', 'changed'
+
+    @property
+    def message(self) -> str:
+        """Human-readable description"""
+        if self.key is None:
+            if self.status == "removed":
+                return (
+                    f"Environment '{self.environment}' is in the baseline "
+                    "but was not captured"
+                )
+            return f"Environment '{self.environment}' is not in the baseline"
+        if self.status == "changed":
+            return f"Key '{self.key}' changed in {self.environment} since baseline"
+        return f"Key '{self.key}' {self.status} in {self.environment} since baseline"
+
+
+@dataclass
+class Snapshot:
+    """
+    Per-key value hashes of several environments at one point in time
+
+    Values and file contents are stored only as BLAKE2b digests keyed
+    with snapshot_key(), which is kept outside the snapshot, so values
+    cannot be recovered from a snapshot by hashing guesses without the
+    key. Each file's stat signature and content digest are kept as
+    well, which lets a later capture reuse the stored key hashes for
+    files that did not change.
+    """
+
+    # env -> {"path": str, "files": [file record, ...]}
+    environments: Dict[str, Dict[str, Any]]
+    created: float = field(default_factory=time.time)
+    # key_id() of the key the hashes were made with
+    key_id: Optional[str] = None
+    # Files reused from the previous snapshot, re-hashed only, or parsed
+    stats: Dict[str, int] = field(
+        default_factory=lambda: {"reused": 0, "rehashed": 0, "parsed": 0},
+        compare=False,
+    )
+
+    @classmethod
+    def capture(
+        cls,
+        env_paths: Mapping[str, Path],
+        previous: Optional["Snapshot"] = None,
+        jobs: Optional[int] = None,
+        key: Optional[bytes] = None,
+    ) -> Tuple["Snapshot", Dict[str, Exception]]:
+        """
+        Capture the current state of environments
+
+        A file whose stat signature matches the previous snapshot is not
+        opened at all; one whose signature changed is hashed, and only
+        parsed again if its content hash changed too.
+
+        Args:
+            env_paths: Dictionary mapping environment names to config paths
+            previous: Earlier snapshot to reuse unchanged files from
+                      (ignored if it was made with another key)
+            jobs: Number of environments captured concurrently
+                  (default: one per environment, capped at 32)
+            key: Hash key (default: snapshot_key())
+
+        Returns:
+            Tuple of (snapshot, errors by environment name)
+        """
+        if key is None:
+            key = snapshot_key()
+        snapshot = cls({}, key_id=key_id(key))
+        errors: Dict[str, Exception] = {}
+        previous_files: Dict[str, Dict[str, Any]] = {}
+        if previous is not None and previous.key_id == snapshot.key_id:
+            for env in previous.environments.values():
+                for record in env["files"]:
+                    previous_files[record["path"]] = record
+
+        workers = max(1, jobs or min(32, len(env_paths) or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                env_name: pool.submit(
+                    _capture_files, Path(env_path), previous_files, key
+                )
+                for env_name, env_path in env_paths.items()
+            }
+            for env_name, future in futures.items():
+                try:
+                    records, stats = future.result()
+                except Exception as e:
+                    errors[env_name] = e
+                    continue
+                snapshot.environments[env_name] = {
+                    "path": os.path.abspath(env_paths[env_name]),
+                    "files": records,
+                }
+                for name, count in stats.items():
+                    snapshot.stats[name] += count
+
+        return snapshot, errors
+
+    def key_hashes(self, env_name: str) -> Dict[str, str]:
+        """
+        Get the merged per-key hashes of one environment
+
+        Files are layered in load order, so later files override earlier
+        ones exactly as ConfigLoader.load_from_path does.
+        """
+        merged: Dict[str, str] = {}
+        for record in self.environments[env_name]["files"]:
+            merged.update(record["keys"])
+        return merged
+
+    def paths(self) -> Dict[str, Path]:
+        """Get the config path recorded for each environment"""
+        return {name: Path(env["path"]) for name, env in self.environments.items()}
+
+    def compare(self, live: "Snapshot") -> List[BaselineDrift]:
+        """
+        Compare a live capture against this baseline
+
+        An environment present on only one side is reported once, with
+        key None, ahead of the key-level drift of the others.
+
+        Args:
+            live: Snapshot of the current state
+
+        Returns:
+            List of BaselineDrift objects, by environment then key
+
+        Raises:
+            ValueError: If the snapshots were hashed with different keys
+        """
+        if live.key_id != self.key_id:
+            raise ValueError(
+                "Snapshot was saved with a different key; set "
+                f"${SNAPSHOT_KEY_ENV} to the key it was saved with"
+            )
+        drift: List[BaselineDrift] = [
+            BaselineDrift(env_name, None, "removed")
+            for env_name in self.environments
+            if env_name not in live.environments
+        ]
+        drift.extend(
+            BaselineDrift(env_name, None, "added")
+            for env_name in live.environments
+            if env_name not in self.environments
+        )
+        for env_name in live.environments:
+            if env_name not in self.environments:
+                continue
+            if _file_signatures(live, env_name) == _file_signatures(self, env_name):
+                continue
+            old = self.key_hashes(env_name)
+            new = live.key_hashes(env_name)
+            for key in sorted(old.keys() | new.keys()):
+                if key not in new:
+                    drift.append(BaselineDrift(env_name, key, "removed"))
+                elif key not in old:
+                    drift.append(BaselineDrift(env_name, key, "added"))
+                elif old[key] != new[key]:
+                    drift.append(BaselineDrift(env_name, key, "changed"))
+        return drift
+
+    def save(self, path: Path) -> None:
+        """Write the snapshot as zlib-compressed JSON behind SNAPSHOT_MAGIC"""
+        payload = json.dumps(
+            {
+                "version": __version__,
+                "created": self.created,
+                "key_id": self.key_id,
+                "environments": self.environments,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        tmp_path = Path(f"{path}.tmp")
+        tmp_path.write_bytes(SNAPSHOT_MAGIC + zlib.compress(payload, 6))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Snapshot":
+        """
+        Read a snapshot written by save()
+
+        Raises:
+            ValueError: If the file is not a snapshot of this layout or
+                is corrupt
+        """
+        data = Path(path).read_bytes()
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ValueError(f"Not a sap-config-guard snapshot: {path}")
+        try:
+            payload = zlib.decompress(data[len(SNAPSHOT_MAGIC) :])  # noqa: E203
+            content = json.loads(payload)
+            return cls(
+                content["environments"],
+                created=content["created"],
+                key_id=content["key_id"],
+            )
+        except (
+            zlib.error,
+            KeyError,
+            TypeError,
+            json.JSONDecodeError,
+            UnicodeDecodeError,
+        ) as e:
+            raise ValueError(f"Corrupt snapshot {path}: {e}") from e
+
+
+def _capture_files(
+    env_path: Path, previous_files: Dict[str, Dict[str, Any]], key: bytes
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Build the file records of one environment, reusing unchanged ones"""
+    records = []
+    stats = {"reused": 0, "rehashed": 0, "parsed": 0}
+    for file_path in ConfigLoader.config_files(env_path):
+        st = os.stat(file_path)
+        abspath = os.path.abspath(file_path)
+        signature = [st.st_mtime_ns, st.st_size, st.st_ino]
+        old = previous_files.get(abspath)
+
+        if old is not None and old["stat"] == signature:
+            records.append(old)
+            stats["reused"] += 1
+            continue
+
+        with open(file_path, "rb") as f:
+            digest = hashlib.blake2b(f.read(), key=key).hexdigest()
+        if old is not None and old["digest"] == digest:
+            keys = old["keys"]
+            stats["rehashed"] += 1
+        else:
+            config = ConfigLoader._load_file(file_path)
+            keys = {name: hash_value(str(value), key) for name, value in config.items()}
+            stats["parsed"] += 1
+
+        records.append(
+            {"path": abspath, "stat": signature, "digest": digest, "keys": keys}
+        )
+    return records, stats
+
+
+def _file_signatures(snapshot: Snapshot, env_name: str) -> List[Tuple[str, str]]:
+    """Get (path, content digest) for every file of an environment"""
+    return [
+        (record["path"], record["digest"])
+        for record in snapshot.environments[env_name]["files"]
+    ]
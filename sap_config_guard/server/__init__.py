@@ -0,0 +1 @@
+"""Resident validation server and its client"""
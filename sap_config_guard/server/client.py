@@ -0,0 +1,130 @@
+"""
+Thin client for the resident validation server
+
+Imports only the standard library, so forwarding a request costs a
+connect and one JSON round trip instead of loading the validator.
+"""
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sap_config_guard import __version__
+
+# Seconds to wait for the connect and version ping before running locally
+PING_TIMEOUT = 2.0
+
+
+def default_socket_path() -> Path:
+    """
+    Get the server socket path
+
+    Uses $SAP_CONFIG_GUARD_SOCKET, else server.sock in the cache directory
+    (same lookup as core.cache.default_cache_dir, which is not imported
+    here to keep the client light).
+    """
+    override = os.environ.get("SAP_CONFIG_GUARD_SOCKET")
+    if override:
+        return Path(override)
+    override = os.environ.get("SAP_CONFIG_GUARD_CACHE_DIR")
+    if override:
+        return Path(override) / "server.sock"
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "sap-config-guard" / "server.sock"
+
+
+class ServerClient:
+    """Send requests to a running server over its Unix domain socket"""
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = 60.0):
+        """
+        Connect to the server
+
+        Args:
+            socket_path: Server socket (default: default_socket_path())
+            timeout: Seconds to wait for each response
+
+        Raises:
+            OSError: If no server is listening on the socket
+        """
+        self.socket_path = Path(socket_path or default_socket_path())
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(str(self.socket_path))
+        except OSError:
+            self._sock.close()
+            raise
+        self._file = self._sock.makefile("rb")
+
+    @classmethod
+    def connect(
+        cls, socket_path: Optional[Path] = None, timeout: float = 60.0
+    ) -> Optional["ServerClient"]:
+        """
+        Get a client if a server of this package version is running
+
+        A server started before an upgrade would answer with old code, so
+        one reporting another version is treated as absent, as is one that
+        does not answer the ping within PING_TIMEOUT seconds.
+
+        Args:
+            socket_path: Server socket (default: default_socket_path())
+            timeout: Seconds to wait for each later response
+
+        Returns:
+            Connected ServerClient, or None
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            return None
+        path = Path(socket_path or default_socket_path())
+        if not path.exists():
+            return None
+        try:
+            client = cls(path, timeout=PING_TIMEOUT)
+        except OSError:
+            return None
+        try:
+            version = client.request("ping").get("version")
+        except (OSError, ValueError):
+            version = None
+        if version != __version__:
+            client.close()
+            return None
+        client._sock.settimeout(timeout)
+        return client
+
+    def request(self, command: str, **arguments: Any) -> Dict[str, Any]:
+        """
+        Send one request and wait for its response
+
+        Args:
+            command: ping, stats, validate or diff
+            **arguments: The command's fields (see ValidationService)
+
+        Returns:
+            Decoded response
+
+        Raises:
+            ConnectionError: If the server closed the connection
+        """
+        payload = dict(arguments, command=command)
+        self._sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        return json.loads(line)
+
+    def close(self) -> None:
+        """Close the connection"""
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "ServerClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
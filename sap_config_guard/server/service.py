@@ -0,0 +1,322 @@
+"""
+Resident validation service
+
+Keeps compiled schemas and parsed config files in memory across requests
+and answers validate/diff requests sent as JSON, either one object per
+line over a Unix domain socket or as an HTTP POST on localhost.
+
+The socket file is only accessible to its owner. HTTP requests must carry
+the token from a file with the same protection, so other local users and
+web pages that can reach 127.0.0.1 cannot read configs through either.
+"""
+
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from sap_config_guard import __version__
+from sap_config_guard.core.cache import SchemaCache, default_cache_dir
+from sap_config_guard.core.loader import CachingConfigLoader
+from sap_config_guard.core.schema import ConfigSchema
+from sap_config_guard.core.validator import ConfigValidator
+from sap_config_guard.diff.env_diff import EnvironmentDiff
+
+# Largest request line accepted on the Unix socket
+MAX_REQUEST_BYTES = 1 << 20
+
+# Host header values accepted by the HTTP listener (guards DNS rebinding)
+_LOCAL_HOSTS = ("127.0.0.1", "localhost")
+
+
+def default_token_path() -> Path:
+    """Get the HTTP token file path: server.token in the cache directory"""
+    return default_cache_dir() / "server.token"
+
+
+class ValidationService:
+    """
+    Answer validate/diff requests from warm in-memory state
+
+    One CachingConfigLoader is shared by every request, so an unchanged
+    config file is parsed once and afterwards costs a stat() per load.
+    Validators are kept per schema file and rebuilt when that file's
+    mtime or size changes.
+    """
+
+    def __init__(self, schema_cache: Optional[SchemaCache] = None):
+        """
+        Initialize service
+
+        Args:
+            schema_cache: Compiled-schema cache used when a schema is first
+                          loaded (default: SchemaCache())
+        """
+        self.loader = CachingConfigLoader()
+        self.schema_cache = schema_cache or SchemaCache()
+        self.requests = 0
+        # schema path ("" for the default) -> (stat signature, validator)
+        self._validators: Dict[str, Tuple[Tuple[int, int], ConfigValidator]] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Answer one request
+
+        Args:
+            request: Decoded request with a "command" of ping, validate,
+                     diff or stats plus that command's arguments
+
+        Returns:
+            Response with "ok": True and the command's fields, or
+            "ok": False and an "error" message
+        """
+        with self._lock:
+            self.requests += 1
+        command = request.get("command") if isinstance(request, dict) else None
+        handler = getattr(self, f"_handle_{command}", None)
+        if not isinstance(command, str) or handler is None:
+            return {"ok": False, "error": f"Unknown command: {command!r}"}
+        try:
+            return dict(handler(request), ok=True)
+        except (KeyError, TypeError, ValueError) as e:
+            return {"ok": False, "error": f"Bad {command} request: {e}"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def validator(self, schema_path: Optional[str] = None) -> ConfigValidator:
+        """
+        Get the validator for a schema, building it on first use
+
+        Args:
+            schema_path: Path to schema YAML file (default: built-in schema;
+                         like ConfigSchema, a missing file also falls back
+                         to it)
+
+        Returns:
+            ConfigValidator sharing the service's loader
+        """
+        key = os.path.abspath(schema_path) if schema_path else ""
+        signature = (0, 0)
+        if key:
+            try:
+                st = os.stat(key)
+            except FileNotFoundError:
+                pass
+            else:
+                signature = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._validators.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        schema = ConfigSchema(Path(key) if key else None, cache=self.schema_cache)
+        validator = ConfigValidator(schema=schema, loader=self.loader)
+        with self._lock:
+            self._validators[key] = (signature, validator)
+        return validator
+
+    def _handle_ping(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {"version": __version__}
+
+    def _handle_stats(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "schemas": len(self._validators),
+            "loader_hits": self.loader.hits,
+            "loader_misses": self.loader.misses,
+        }
+
+    def _handle_validate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        config_path = Path(request["config_path"])
+        if not config_path.exists():
+            raise FileNotFoundError(f"Config path not found: {config_path}")
+        validator = self.validator(request.get("schema"))
+        results, is_valid = validator.validate(
+            config_path,
+            environment=request.get("environment", "dev"),
+            fail_on_warning=bool(request.get("fail_on_warning", False)),
+            fail_fast=bool(request.get("fail_fast", False)),
+        )
+        return {
+            "is_valid": is_valid,
+            "results": [dict(r.to_dict(), message=r.message) for r in results],
+        }
+
+    def _handle_diff(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        env_paths = {name: Path(path) for name, path in request["environments"].items()}
+        errors: Dict[str, Exception] = {}
+        results = EnvironmentDiff.compare_environments(
+            env_paths, loader=self.loader, jobs=request.get("jobs"), errors=errors
+        )
+        return {
+            "results": [r.to_dict() for r in results],
+            "errors": {name: str(e) for name, e in errors.items()},
+        }
+
+
+class _SocketHandler(socketserver.StreamRequestHandler):
+    """Serve newline-delimited JSON requests on one connection"""
+
+    def handle(self):
+        service = self.server.service
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line:
+                return
+            if len(line) > MAX_REQUEST_BYTES:
+                response = {"ok": False, "error": "Request too large"}
+            else:
+                try:
+                    response = service.handle(json.loads(line))
+                except ValueError as e:
+                    response = {"ok": False, "error": f"Invalid JSON: {e}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    """
+    Serve POST /<command> with a JSON body
+
+    Requests must name 127.0.0.1 or localhost as Host, send
+    Content-Type: application/json (which browsers cannot send cross-site
+    without a preflight this server never answers) and carry
+    "Authorization: Bearer <token>".
+    """
+
+    def do_POST(self):
+        hostname = self.headers.get("Host", "").partition(":")[0]
+        authorization = self.headers.get("Authorization", "")
+        token = authorization[7:] if authorization.startswith("Bearer ") else ""
+        if hostname not in _LOCAL_HOSTS:
+            self._respond(403, {"ok": False, "error": "Host not allowed"})
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._respond(415, {"ok": False, "error": "Expected application/json"})
+            return
+        if not hmac.compare_digest(token.encode(), self.server.token.encode()):
+            self._respond(401, {"ok": False, "error": "Missing or wrong token"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            response = {"ok": False, "error": f"Invalid JSON: {e}"}
+        else:
+            if not isinstance(body, dict):
+                body = {}
+            body["command"] = self.path.strip("/")
+            response = self.server.service.handle(body)
+        self._respond(200 if response["ok"] else 400, response)
+
+    def _respond(self, status: int, response: Dict[str, Any]) -> None:
+        payload = json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class UnixSocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix domain socket server around a ValidationService"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, service: ValidationService):
+        """
+        Bind the socket, replacing a stale socket file left by a dead server
+
+        Raises:
+            OSError: If another server is already listening on socket_path
+
+        Args:
+            socket_path: Path of the socket file to create
+            service: Service answering the requests
+        """
+        self.service = service
+        self.socket_path = Path(socket_path)
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.socket_path))
+            except OSError:
+                self.socket_path.unlink()
+            else:
+                raise OSError(f"A server is already listening on {socket_path}")
+            finally:
+                probe.close()
+        super().__init__(str(self.socket_path), _SocketHandler)
+
+    def server_bind(self):
+        # Create the socket file owner-only, so no other user can connect
+        # between bind() and a later chmod
+        previous = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+
+class LocalHTTPServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server on 127.0.0.1 around a ValidationService
+
+    A fresh random token is written to token_path (mode 0600) on start
+    and removed on close; clients send it as a bearer token.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int,
+        service: ValidationService,
+        token_path: Optional[Path] = None,
+    ):
+        """
+        Bind to localhost only and publish the access token
+
+        Args:
+            port: TCP port (0 picks a free one)
+            service: Service answering the requests
+            token_path: Token file (default: default_token_path())
+        """
+        self.service = service
+        self.token = secrets.token_urlsafe(32)
+        self.token_path = Path(token_path or default_token_path())
+        super().__init__(("127.0.0.1", port), _HTTPHandler)
+        self.token_path.parent.mkdir(parents=True, exist_ok=True)
+        # mkstemp creates the file with mode 0600
+        fd, tmp_name = tempfile.mkstemp(dir=self.token_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.token)
+        os.replace(tmp_name, self.token_path)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            self.token_path.unlink()
+        except OSError:
+            pass
@@ -36,6 +36,7 @@ setup(
         "pyyaml>=6.0",
     ],
     extras_require={
+        "fast": ["orjson>=3.6"],
         "dev": [
             "pytest>=7.0",
             "pytest-cov>=4.0",
@@ -0,0 +1,136 @@
+"""
+Tests for the validation result and compiled-schema caches
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sap_config_guard.core import backends
+from sap_config_guard.core.cache import ResultCache, SchemaCache, plan_layout
+from sap_config_guard.core.compiled import CompiledSchema
+from sap_config_guard.core.schema import ConfigSchema
+from sap_config_guard.core.loader import ConfigLoader
+from sap_config_guard.core.results import ValidationLevel, ValidationResult
+from sap_config_guard.core.validator import ConfigValidator
+
+
+def test_validate_returns_cached_results(monkeypatch):
+    """Test that unchanged configs are not parsed again"""
+    with TemporaryDirectory() as tmpdir:
+        config_dir = Path(tmpdir) / "config"
+        config_dir.mkdir()
+        (config_dir / ".env").write_text("SAP_CLIENT=123\n")
+        validator = ConfigValidator(cache=ResultCache(Path(tmpdir) / "cache"))
+
+        first, first_valid = validator.validate(config_dir)
+
+        def fail_load(config_path):
+            raise AssertionError("config should not be parsed on a cache hit")
+
+        monkeypatch.setattr(ConfigLoader, "load_from_path", fail_load)
+        second, second_valid = validator.validate(config_dir)
+
+        assert second == first
+        assert (second[0].rule, second[0].key) == ("required", "SAP_SYSTEM_ID")
+        assert second_valid == first_valid is False
+
+
+def test_results_quoting_values_are_not_cached():
+    """Test that offending values (possibly secrets) never reach the disk"""
+    with TemporaryDirectory() as tmpdir:
+        config_dir = Path(tmpdir) / "config"
+        config_dir.mkdir()
+        (config_dir / ".env").write_text("SAP_CLIENT=12\nSAP_SECRET=hunter2-dev\n")
+        cache = ResultCache(Path(tmpdir) / "cache")
+        validator = ConfigValidator(cache=cache)
+
+        results, _ = validator.validate(config_dir, environment="prod")
+
+        assert {"pattern", "forbidden_in_prod"} <= {r.rule for r in results}
+        assert not list(cache.directory.glob("*.json"))
+
+
+def test_cache_key_tracks_content_and_options():
+    """Test that content, environment and strictness change the key"""
+    with TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / ".env"
+        env_file.write_text("SAP_CLIENT=100\n")
+        cache = ResultCache(Path(tmpdir) / "cache")
+
+        key = cache.key([env_file], "schema", "dev", False)
+
+        assert cache.key([env_file], "schema", "prod", False) != key
+        assert cache.key([env_file], "schema", "dev", True) != key
+        assert cache.key([env_file], "other", "dev", False) != key
+        env_file.write_text("SAP_CLIENT=200\n")
+        assert cache.key([env_file], "schema", "dev", False) != key
+
+
+def test_cache_evicts_and_clears():
+    """Test LRU eviction bound and clearing"""
+    with TemporaryDirectory() as tmpdir:
+        cache = ResultCache(Path(tmpdir), max_entries=2)
+        result = [ValidationResult(ValidationLevel.ERROR, "K", rule="required")]
+
+        for key in ("a", "b", "c"):
+            cache.put(key, result, False)
+
+        assert len(list(cache.directory.glob("*.json"))) == 2
+        assert cache.clear() == 2
+        assert cache.get("c") is None
+
+
+def test_schema_cache_skips_parsing_until_schema_changes(monkeypatch):
+    """Test that compiled schemas are reused and rebuilt on edit"""
+    with TemporaryDirectory() as tmpdir:
+        schema_file = Path(tmpdir) / "schema.yaml"
+        schema_file.write_text(
+            "required: [SAP_CLIENT]\npatterns:\n  SAP_CLIENT: '^[0-9]{3}$'\n"
+        )
+        cache = SchemaCache(Path(tmpdir) / "cache")
+        first = ConfigSchema(schema_file, cache=cache)
+
+        def fail(*args):
+            raise AssertionError("schema was parsed again")
+
+        monkeypatch.setattr(backends, "load_yaml", fail)
+        cached = ConfigSchema(schema_file, cache=cache)
+        plan = cached.compile()
+
+        assert cached.schema == first.schema
+        assert plan.fingerprint == first.compile().fingerprint
+        assert plan.validate_pattern("SAP_CLIENT", "100")
+        assert not plan.validate_pattern("SAP_CLIENT", "10")
+
+        monkeypatch.undo()
+        schema_file.write_text("required: [SAP_SYSTEM_ID]\n")
+        changed = ConfigSchema(schema_file, cache=cache)
+
+        assert changed.compile().required == ("SAP_SYSTEM_ID",)
+        assert cache.clear() == 2
+
+
+def test_schema_cache_misses_after_plan_layout_changes(monkeypatch):
+    """Test that plans pickled under another attribute layout are not used"""
+    with TemporaryDirectory() as tmpdir:
+        schema_file = Path(tmpdir) / "schema.yaml"
+        schema_file.write_text("required: [SAP_CLIENT]\n")
+        content = schema_file.read_bytes()
+        cache = SchemaCache(Path(tmpdir) / "cache")
+        ConfigSchema(schema_file, cache=cache)
+        assert cache.get(content) is not None
+
+        original_init = CompiledSchema.__init__
+
+        def init_with_new_attribute(self, schema):
+            original_init(self, schema)
+            self.allowed_values = {}
+
+        monkeypatch.setattr(CompiledSchema, "__init__", init_with_new_attribute)
+        plan_layout.cache_clear()
+        try:
+            assert cache.get(content) is None
+        finally:
+            monkeypatch.undo()
+            plan_layout.cache_clear()
+        assert cache.get(content) is not None
@@ -0,0 +1,147 @@
+"""
+Tests for compiled validation plans
+"""
+
+from sap_config_guard.core.schema import ConfigSchema
+from sap_config_guard.core.validator import ConfigValidator, ValidationLevel
+
+
+def test_compile_is_reused():
+    """Test that the compiled plan is built once per schema"""
+    schema = ConfigSchema()
+
+    assert schema.compile() is schema.compile()
+    assert ConfigValidator(schema=schema).plan is schema.compile()
+
+
+def test_check_groups_results_by_rule_family():
+    """Test that results keep the required/pattern/secure/length order"""
+    plan = ConfigSchema().compile()
+
+    results = plan.check({"SAP_CLIENT": "12", "SAP_PASSWORD": "abc"})
+    families = [r.message.split(":")[0] for r in results]
+
+    assert families == [
+        "Missing required key",
+        "Missing required key",
+        "Invalid pattern",
+        "Secure key seems too short",
+        "Secure key missing or empty",
+        "Secure key missing or empty",
+        "Secure key missing or empty",
+        "Value too short",
+    ]
+
+
+def test_check_keeps_schema_order_within_each_family():
+    """Test that pattern errors follow the patterns section, not required"""
+    plan = ConfigSchema().compile()
+
+    results = plan.check(
+        {"SAP_CLIENT": "100", "SAP_SYSTEM_ID": "x", "SAP_API_URL": "http://x"}
+    )
+    patterns = [r.key for r in results if r.rule == "pattern"]
+
+    assert patterns == ["SAP_API_URL", "SAP_SYSTEM_ID"]
+
+
+def test_check_production_only_when_requested():
+    """Test that forbidden values are only reported for production"""
+    plan = ConfigSchema().compile()
+    config = {
+        "SAP_CLIENT": "100",
+        "SAP_SYSTEM_ID": "ABC",
+        "SAP_API_URL": "https://localhost",
+    }
+
+    assert not any(r.level == ValidationLevel.ERROR for r in plan.check(config))
+    assert any(r.key == "SAP_API_URL" for r in plan.check(config, production=True))
+
+
+def test_compile_tolerates_empty_sections():
+    """Test that null schema sections compile to empty rule tables"""
+    schema = ConfigSchema()
+    schema.schema = {"required": ["SAP_CLIENT"], "patterns": None}
+    schema.invalidate()
+
+    plan = schema.compile()
+
+    assert plan.patterns == {}
+    assert [r.key for r in plan.check({})] == ["SAP_CLIENT"]
+
+
+def test_results_render_messages_from_rule_args():
+    """Test that results keep rule ids and args and render messages lazily"""
+    plan = ConfigSchema().compile()
+    value = "http://localhost/" + "x" * 1000
+
+    results = plan.check({"SAP_API_URL": value}, production=True)
+    violation = results[-1]
+
+    assert not hasattr(violation, "__dict__")
+    assert violation.rule == "forbidden_in_prod"
+    assert violation.args[0] is value
+    assert violation.message.startswith(
+        "Production violation: SAP_API_URL contains forbidden value 'localhost'"
+    )
+
+
+def test_count_matches_check():
+    """Test that counts-only mode agrees with the full result list"""
+    plan = ConfigSchema().compile()
+    config = {"SAP_CLIENT": "12", "SAP_PASSWORD": "abc", "URL": "http://localhost"}
+
+    for production in (False, True):
+        results = plan.check(config, production=production)
+        summary = plan.count(config, production=production)
+
+        assert summary.errors == sum(r.level == ValidationLevel.ERROR for r in results)
+        assert summary.warnings == sum(
+            r.level == ValidationLevel.WARNING for r in results
+        )
+        assert summary.total == len(results)
+
+
+def test_first_failure_runs_cheapest_rules_first():
+    """Test that fail-fast reports required keys before patterns and scans"""
+    plan = ConfigSchema().compile()
+    config = {
+        "SAP_CLIENT": "12",
+        "SAP_SYSTEM_ID": "ABC",
+        "SAP_API_URL": "https://localhost",
+    }
+
+    assert plan.first_failure({"SAP_CLIENT": "12"}).rule == "required"
+    assert plan.first_failure(config).rule == "pattern"
+    config["SAP_CLIENT"] = "100"
+    assert plan.first_failure(config) is None
+    assert plan.first_failure(config, fail_on_warning=True).rule == "secure_missing"
+    assert plan.first_failure(config, production=True).rule == "forbidden_in_prod"
+
+
+def test_first_failure_agrees_with_check():
+    """Test that fail-fast and full validation agree on validity"""
+    plan = ConfigSchema().compile()
+    configs = [
+        {},
+        {"SAP_CLIENT": "100", "SAP_SYSTEM_ID": "ABC", "SAP_API_URL": "https://a"},
+        {"SAP_CLIENT": "100", "SAP_SYSTEM_ID": "ABC", "SAP_API_URL": "http://a"},
+        {"SAP_CLIENT": "1", "SAP_SYSTEM_ID": "ABC", "SAP_API_URL": "https://a"},
+        {
+            "SAP_CLIENT": "100",
+            "SAP_SYSTEM_ID": "ABC",
+            "SAP_API_URL": "https://a",
+            "SAP_PASSWORD": "short",
+            "X": "mock",
+        },
+    ]
+
+    for config in configs:
+        for production in (False, True):
+            for strict in (False, True):
+                levels = {r.level for r in plan.check(config, production)}
+                failing = {ValidationLevel.ERROR}
+                if strict:
+                    failing.add(ValidationLevel.WARNING)
+                failure = plan.first_failure(config, production, strict)
+                assert (failure is None) == (not levels & failing)
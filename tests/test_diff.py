@@ -2,10 +2,17 @@
 Tests for environment diff
 """
 
+import asyncio
+import dataclasses
+import threading
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from sap_config_guard.diff.env_diff import EnvironmentDiff
+from sap_config_guard.diff.env_diff import (
+    DiffResult,
+    EnvironmentDiff,
+    async_compare_environments,
+)
 
 
 def test_compare_environments_same():
@@ -65,3 +72,114 @@ def test_compare_environments_missing():
 
         # Should detect missing key
         assert any(r.key == "SAP_API_URL" and r.status == "missing" for r in results)
+
+
+def test_compare_configs_reports_missing_envs_in_order():
+    """Test that missing_in follows environment order and messages are lazy"""
+    configs = {
+        "dev": {"A": "1", "B": "x"},
+        "qa": {"A": "1"},
+        "prod": {"B": "y"},
+    }
+
+    results = EnvironmentDiff.compare_configs(configs)
+
+    assert [(r.key, r.status, r.missing_in) for r in results] == [
+        ("A", "missing", ("prod",)),
+        ("B", "missing", ("qa",)),
+    ]
+    assert results[0]._message is None
+    assert results[0].message == "Key 'A' missing in: prod"
+
+
+def test_diff_result_keeps_message_field():
+    """Test that message can still be passed in and shows up in asdict()"""
+    given = DiffResult("A", {"dev": "1"}, "missing", "custom")
+    keyword = DiffResult(key="A", environments={"dev": "1"}, status="same", message="m")
+    built = DiffResult("A", {"dev": "1"}, "missing", missing_in=("qa",))
+
+    assert (given.message, given.missing_in) == ("custom", ())
+    assert keyword.message == "m"
+    assert dataclasses.asdict(built) == {
+        "key": "A",
+        "environments": {"dev": "1"},
+        "status": "missing",
+        "message": "Key 'A' missing in: qa",
+        "missing_in": ("qa",),
+    }
+
+
+def test_compare_configs_different_values():
+    """Test that differing values across many environments are reported"""
+    configs = {f"env{i}": {"SAME": "v", "URL": f"https://{i % 2}"} for i in range(6)}
+
+    results = EnvironmentDiff.compare_configs(configs)
+
+    assert len(results) == 1
+    assert results[0].key == "URL"
+    assert results[0].status == "different"
+    assert results[0].message.startswith("Key 'URL' differs: env0=https://0")
+
+
+def test_compare_environments_collects_errors():
+    """Test that load failures are collected per environment"""
+    with TemporaryDirectory() as tmpdir:
+        dev_dir = Path(tmpdir) / "dev"
+        dev_dir.mkdir()
+        (dev_dir / ".env").write_text("SAP_CLIENT=100\n")
+
+        errors = {}
+        results = EnvironmentDiff.compare_environments(
+            {"dev": dev_dir, "qa": Path(tmpdir) / "missing"}, jobs=2, errors=errors
+        )
+
+        assert list(errors) == ["qa"]
+        assert [(r.key, r.missing_in) for r in results] == [("SAP_CLIENT", ("qa",))]
+
+
+def test_load_environments_runs_concurrently():
+    """Test that environments load in parallel and keep their order"""
+    barrier = threading.Barrier(3, timeout=5)
+
+    class SlowLoader:
+        @staticmethod
+        def load_from_path(path):
+            # Deadlocks (and times out) unless all three loads overlap
+            barrier.wait()
+            return {"ENV": str(path)}
+
+    paths = {name: Path(name) for name in ["dev", "qa", "prod"]}
+    configs, errors = EnvironmentDiff.load_environments(
+        paths, jobs=3, loader=SlowLoader
+    )
+
+    assert errors == {}
+    assert list(configs) == ["dev", "qa", "prod"]
+    assert configs["qa"] == {"ENV": "qa"}
+
+
+def test_async_compare_environments():
+    """Test the async diff, including per-environment load errors"""
+    with TemporaryDirectory() as tmpdir:
+        dev_dir = Path(tmpdir) / "dev"
+        qa_dir = Path(tmpdir) / "qa"
+        dev_dir.mkdir()
+        qa_dir.mkdir()
+        (dev_dir / ".env").write_text("SAP_CLIENT=100\n")
+        (qa_dir / ".env").write_text("SAP_CLIENT=200\n")
+
+        results = asyncio.run(
+            async_compare_environments({"dev": str(dev_dir), "qa": str(qa_dir)})
+        )
+        assert [(r.key, r.environments) for r in results] == [
+            ("SAP_CLIENT", {"dev": "100", "qa": "200"})
+        ]
+
+        errors = {}
+        results = asyncio.run(
+            EnvironmentDiff.async_compare_environments(
+                {"dev": dev_dir, "prod": Path(tmpdir) / "missing"}, errors=errors
+            )
+        )
+        assert list(errors) == ["prod"]
+        assert [(r.key, r.missing_in) for r in results] == [("SAP_CLIENT", ("prod",))]
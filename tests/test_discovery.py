@@ -0,0 +1,77 @@
+"""
+Tests for recursive config discovery
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sap_config_guard.core.discovery import TreeLoader, discover_files
+from sap_config_guard.core.schema import ConfigSchema
+from sap_config_guard.core.validator import ConfigValidator
+
+
+def _make_tree(root: Path) -> None:
+    """Build a small landscape with nested component directories"""
+    (root / "components" / "billing").mkdir(parents=True)
+    (root / "components" / "auth").mkdir(parents=True)
+    (root / ".git").mkdir()
+    (root / "config.yaml").write_text("SAP_API_URL: https://api.sap.com\n")
+    (root / ".env").write_text("SAP_CLIENT=100\nSAP_SYSTEM_ID=ABC\n")
+    (root / "components" / "billing" / "app.json").write_text('{"SAP_CLIENT": "200"}')
+    (root / "components" / "auth" / "auth.properties").write_text("AUTH_MODE=oauth\n")
+    (root / "components" / "auth" / "notes.txt").write_text("not a config\n")
+    (root / ".git" / "leak.env").write_text("SAP_CLIENT=999\n")
+
+
+def test_discover_files_orders_by_depth_then_path():
+    """Test deterministic, layered merge order and default exclusions"""
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _make_tree(root)
+
+        files = [p.relative_to(root).as_posix() for p in discover_files(root)]
+
+        assert files == [
+            ".env",
+            "config.yaml",
+            "components/auth/auth.properties",
+            "components/billing/app.json",
+        ]
+        excluded = discover_files(root, exclude=("components/billing/*",))
+        assert root / "components" / "billing" / "app.json" not in excluded
+        assert root / ".git" / "leak.env" in excluded
+
+
+def test_tree_loader_merges_nested_files_in_parallel():
+    """Test that deeper files override their parents and timings are kept"""
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _make_tree(root)
+
+        for workers in (1, 4):
+            loader = TreeLoader(workers=workers)
+            config = loader.load_from_path(root)
+
+            assert config == {
+                "SAP_CLIENT": "200",
+                "SAP_SYSTEM_ID": "ABC",
+                "SAP_API_URL": "https://api.sap.com",
+                "AUTH_MODE": "oauth",
+            }
+            assert [t.keys for t in loader.timings] == [2, 1, 1, 1]
+            assert loader.report().endswith("4 files")
+
+
+def test_validator_accepts_tree_loader():
+    """Test validating a nested landscape with a projected key set"""
+    with TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _make_tree(root)
+        validator = ConfigValidator(
+            schema=ConfigSchema(), loader=TreeLoader(include=("*.env", "*.yaml"))
+        )
+
+        results, is_valid = validator.validate(root)
+
+        assert is_valid
+        assert all(r.rule == "secure_missing" for r in results)
@@ -0,0 +1,79 @@
+"""
+Tests for the validate/diff output formats
+"""
+
+import io
+import json
+from xml.dom import minidom
+
+from sap_config_guard.cli.formats import FORMATS, get_writer
+from sap_config_guard.core.results import ValidationLevel, ValidationResult
+from sap_config_guard.diff.env_diff import DiffResult
+
+RESULTS = [
+    ValidationResult(ValidationLevel.ERROR, "SAP_CLIENT", rule="required"),
+    ValidationResult(ValidationLevel.WARNING, "SAP_PASSWORD", rule="secure_short"),
+]
+SUMMARY = {"errors": 1, "warnings": 1, "is_valid": False}
+
+
+def _render(fmt, kind, items, summary):
+    stream = io.StringIO()
+    writer = get_writer(fmt, stream, kind, "./config/<dev>")
+    writer.begin()
+    for item in items:
+        writer.write(item)
+    writer.end(summary)
+    return stream.getvalue()
+
+
+def test_writers_stream_each_result():
+    """Test that each result is written before the report ends"""
+    for fmt in FORMATS:
+        stream = io.StringIO()
+        writer = get_writer(fmt, stream, "validate", "dev")
+        writer.begin()
+        writer.write(RESULTS[0])
+        assert "SAP_CLIENT" in stream.getvalue(), fmt
+
+
+def test_machine_formats_parse():
+    """Test that json, jsonl, SARIF and JUnit output are well formed"""
+    lines = _render("jsonl", "validate", RESULTS, SUMMARY).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [r["type"] for r in records] == ["result", "result", "summary"]
+    assert records[0]["rule"] == "required"
+
+    document = json.loads(_render("json", "validate", RESULTS, SUMMARY))
+    assert document["summary"] == SUMMARY
+    assert [r["key"] for r in document["results"]] == ["SAP_CLIENT", "SAP_PASSWORD"]
+    assert json.loads(_render("json", "validate", [], {}))["results"] == []
+
+    sarif = json.loads(_render("sarif", "validate", RESULTS, SUMMARY))
+    run = sarif["runs"][0]
+    assert sarif["version"] == "2.1.0"
+    assert [(r["ruleId"], r["level"]) for r in run["results"]] == [
+        ("required", "error"),
+        ("secure_short", "warning"),
+    ]
+
+    junit = minidom.parseString(_render("junit", "validate", RESULTS, SUMMARY))
+    cases = junit.getElementsByTagName("testcase")
+    assert [c.getAttribute("name") for c in cases] == ["SAP_CLIENT", "SAP_PASSWORD"]
+    assert len(junit.getElementsByTagName("failure")) == 1
+
+
+def test_diff_formats():
+    """Test diff results in the text and JUnit formats"""
+    drift = [
+        DiffResult("A", {"dev": "1"}, "missing", missing_in=("qa",)),
+        DiffResult("B", {"dev": "1", "qa": "2"}, "different"),
+    ]
+
+    text = _render("text", "diff", drift, {})
+    assert text.splitlines()[0] == "⚠️  Drift detected:"
+    assert "  ❌ Key 'A' missing in: qa" in text
+    assert _render("text", "diff", [], {}) == "✅ No differences detected\n"
+
+    junit = minidom.parseString(_render("junit", "diff", drift, {}))
+    assert len(junit.getElementsByTagName("failure")) == 2
@@ -5,7 +5,8 @@ Tests for configuration loader
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from sap_config_guard.core.loader import ConfigLoader
+from sap_config_guard.core import backends, mmap_parser
+from sap_config_guard.core.loader import CachingConfigLoader, ConfigLoader
 
 
 def test_load_env_file():
@@ -98,3 +99,179 @@ def test_load_directory():
 
         assert "SAP_CLIENT" in config
         assert "SAP_API_URL" in config
+
+
+def test_caching_loader_reuses_unchanged_files(monkeypatch):
+    """Test that unchanged files are served from the stat-keyed cache"""
+    with TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / ".env"
+        env_file.write_text("SAP_CLIENT=100\n")
+        loader = CachingConfigLoader()
+
+        first = loader.load_from_path(Path(tmpdir))
+        parsed = []
+        original = ConfigLoader._load_file
+        monkeypatch.setattr(
+            ConfigLoader,
+            "_load_file",
+            staticmethod(lambda path: parsed.append(path) or original(path)),
+        )
+        second = loader.load_from_path(Path(tmpdir))
+
+        assert second == first == {"SAP_CLIENT": "100"}
+        assert parsed == []
+        assert (loader.hits, loader.misses) == (1, 1)
+
+        env_file.write_text("SAP_CLIENT=1000\n")
+        assert loader.load_from_path(Path(tmpdir)) == {"SAP_CLIENT": "1000"}
+        assert parsed == [env_file]
+
+
+def test_iter_pairs_streams_in_merge_order():
+    """Test that iter_pairs yields every definition lazily"""
+    with TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / ".env").write_text("SAP_CLIENT=100\nSAP_CLIENT=200\n")
+        (Path(tmpdir) / "config.properties").write_text("SAP_SYSTEM_ID=ABC\n")
+
+        pairs = ConfigLoader.iter_pairs(Path(tmpdir))
+
+        assert next(pairs) == ("SAP_CLIENT", "100")
+        assert list(pairs) == [("SAP_CLIENT", "200"), ("SAP_SYSTEM_ID", "ABC")]
+
+
+def test_load_env_syntax():
+    """Test export prefixes, continuations and quoted values in .env files"""
+    with TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / ".env"
+        env_file.write_text(
+            "export SAP_CLIENT=100\n"
+            "  SAP_SYSTEM_ID = ABC  \n"
+            'SAP_DESC="say \\"hi\\" \\\\ bye"\n'
+            "SAP_RAW='keep \\\" as is'\n"
+            "SAP_HOSTS=a,\\\n"
+            "  b\n"
+            "SAP_URL=https://x?a=b\n"
+        )
+
+        config = ConfigLoader.load_from_path(env_file)
+
+        assert config == {
+            "SAP_CLIENT": "100",
+            "SAP_SYSTEM_ID": "ABC",
+            "SAP_DESC": 'say "hi" \\ bye',
+            "SAP_RAW": 'keep \\" as is',
+            "SAP_HOSTS": "a,b",
+            "SAP_URL": "https://x?a=b",
+        }
+
+
+def test_env_values_are_trimmed_unless_quoted():
+    """Test that spaces around '=' are not part of .env values"""
+    with TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / ".env"
+        env_file.write_text(
+            "SAP_CLIENT = 100\n"
+            "SAP_PASSWORD =   abc\t\n"
+            'SAP_BANNER = "  padded  "\n'
+        )
+
+        config = ConfigLoader.load_from_path(env_file)
+
+        assert config == {
+            "SAP_CLIENT": "100",
+            "SAP_PASSWORD": "abc",
+            "SAP_BANNER": "  padded  ",
+        }
+
+
+def test_cr_and_crlf_line_endings(monkeypatch):
+    """Test that CR-only and CRLF files split into lines like LF files"""
+    # Small windows so that line ends also fall on window boundaries
+    monkeypatch.setattr(mmap_parser, "CHUNK_SIZE", 8)
+    with TemporaryDirectory() as tmpdir:
+        for newline in ("\r", "\r\n"):
+            for name in (".env", "app.properties"):
+                config_file = Path(tmpdir) / name
+                config_file.write_bytes(
+                    newline.join(
+                        ["SAP_CLIENT=100", "SAP_URL=https://a\\", "  .b", "X=1", ""]
+                    ).encode("utf-8")
+                )
+
+                assert ConfigLoader.load_from_path(config_file) == {
+                    "SAP_CLIENT": "100",
+                    "SAP_URL": "https://a.b",
+                    "X": "1",
+                }
+
+
+def test_load_empty_env_file():
+    """Test that empty files load as empty configs"""
+    with TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / ".env"
+        env_file.write_text("")
+
+        assert ConfigLoader.load_from_path(env_file) == {}
+
+
+def test_flatten_dict_options():
+    """Test separator, list indexing and depth limit when flattening"""
+    data = {"a": {"b": {"c": 1}}, "hosts": ["x", {"port": 80}]}
+
+    assert ConfigLoader._flatten_dict(data) == {
+        "a_b_c": "1",
+        "hosts": "x,{'port': 80}",
+    }
+    assert ConfigLoader._flatten_dict(data, sep=".", list_mode="index") == {
+        "a.b.c": "1",
+        "hosts.0": "x",
+        "hosts.1.port": "80",
+    }
+    assert ConfigLoader._flatten_dict(data, max_depth=1) == {
+        "a": '{"b": {"c": 1}}',
+        "hosts": "x,{'port': 80}",
+    }
+
+
+def test_flatten_dict_deep_nesting_and_laziness():
+    """Test that deep documents flatten without recursion and lazily"""
+    data = leaf = {}
+    for _ in range(5000):
+        leaf["k"] = {}
+        leaf = leaf["k"]
+    leaf["v"] = "deep"
+
+    assert list(ConfigLoader._flatten_dict(data).values()) == ["deep"]
+
+    pairs = ConfigLoader.iter_flat_items({"first": 1, "rest": {"x": 2}})
+    assert next(pairs) == ("first", "1")
+
+
+def test_load_with_key_projection():
+    """Test that only projected keys are loaded from every format"""
+    with TemporaryDirectory() as tmpdir:
+        config_dir = Path(tmpdir)
+        (config_dir / "config.yaml").write_text(
+            "SAP:\n  CLIENT: 100\n  NOISE: {a: 1}\nOTHER:\n  deep: {x: 1}\n"
+        )
+        (config_dir / ".env").write_text(
+            "SKIPPED=line one \\\n  SAP_PASSWORD=not-a-key\nSAP_PASSWORD=secret\n"
+        )
+
+        config = ConfigLoader.load_from_path(
+            config_dir, keys={"SAP_CLIENT", "SAP_PASSWORD"}
+        )
+
+        assert config == {"SAP_PASSWORD": "secret", "SAP_CLIENT": "100"}
+
+
+def test_json_backend_falls_back_for_non_strict_documents():
+    """Test that documents the fast backend rejects still load"""
+    with TemporaryDirectory() as tmpdir:
+        config_file = Path(tmpdir) / "config.json"
+        config_file.write_text('{"SAP_RATIO": NaN, "SAP_BIG": 123456789012345678901}')
+
+        config = ConfigLoader.load_from_path(config_file)
+
+        assert config == {"SAP_RATIO": "nan", "SAP_BIG": "123456789012345678901"}
+    assert set(backends.describe()) == {"yaml", "json"}
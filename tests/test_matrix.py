@@ -0,0 +1,109 @@
+"""
+Tests for the columnar multi-environment config matrix
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sap_config_guard.core.matrix import ConfigMatrix
+from sap_config_guard.core.validator import ConfigValidator
+from sap_config_guard.diff.env_diff import EnvironmentDiff
+
+CONFIGS = {
+    "dev": {"SAP_CLIENT": "100", "SAP_API_URL": "http://localhost:8080"},
+    "qa": {"SAP_CLIENT": "100", "SAP_API_URL": "https://qa.sap.com"},
+    "prod": {"SAP_CLIENT": "100", "SAP_SECRET": "s3cret-value"},
+}
+
+
+def test_matrix_shares_keys_and_values():
+    """Test that keys and values are stored once and views round-trip"""
+    matrix = ConfigMatrix.from_configs(CONFIGS)
+
+    assert matrix.environments == ["dev", "qa", "prod"]
+    assert matrix.values.count("100") == 1
+    assert len(matrix.keys) == 3
+    assert matrix.get("prod", "SAP_API_URL") is None
+    assert matrix.to_dict("qa") == CONFIGS["qa"]
+    assert dict(matrix.config("prod")) == CONFIGS["prod"]
+
+
+def test_environment_items_is_an_items_view():
+    """Test that items() keeps the ItemsView contract"""
+    items = ConfigMatrix.from_configs(CONFIGS).config("qa").items()
+
+    assert len(items) == 2
+    assert ("SAP_CLIENT", "100") in items
+    assert ("SAP_SECRET", "s3cret-value") not in items
+    assert list(items) == list(items) == list(CONFIGS["qa"].items())
+    assert items == CONFIGS["qa"].items()
+    assert items - {("SAP_CLIENT", "100")} == {("SAP_API_URL", "https://qa.sap.com")}
+
+
+def test_compare_matrix_matches_compare_configs():
+    """Test that the matrix diff reports the same drift as the dict diff"""
+    expected = EnvironmentDiff.compare_configs(CONFIGS)
+    results = EnvironmentDiff.compare_matrix(ConfigMatrix.from_configs(CONFIGS))
+
+    assert [(r.key, r.status, r.environments, r.missing_in) for r in results] == [
+        (r.key, r.status, r.environments, r.missing_in) for r in expected
+    ]
+
+
+def test_validate_matrix_applies_prod_rules_by_name():
+    """Test that each environment is validated under its own name"""
+    validator = ConfigValidator()
+    matrix = ConfigMatrix.from_configs(
+        {
+            "dev": {"SAP_API_URL": "https://localhost"},
+            "prod": {"SAP_API_URL": "https://localhost"},
+        }
+    )
+
+    outcomes = validator.validate_matrix(matrix)
+
+    assert not any("Production" in r.message for r in outcomes["dev"][0])
+    assert any("Production" in r.message for r in outcomes["prod"][0])
+
+
+def test_from_paths_collects_errors():
+    """Test loading environments straight into a matrix"""
+    with TemporaryDirectory() as tmpdir:
+        dev_dir = Path(tmpdir) / "dev"
+        dev_dir.mkdir()
+        (dev_dir / ".env").write_text("SAP_CLIENT=100\n")
+
+        matrix, errors = ConfigMatrix.from_paths(
+            {"dev": dev_dir, "qa": Path(tmpdir) / "missing"}
+        )
+
+        assert list(errors) == ["qa"]
+        assert matrix.environments == ["dev", "qa"]
+        assert matrix.to_dict("dev") == {"SAP_CLIENT": "100"}
+        assert matrix.to_dict("qa") == {}
+
+
+def test_from_paths_bounds_loads_in_flight():
+    """Test that at most jobs parsed configs wait to be folded in"""
+    outstanding = []
+    state = {"started": 0, "folded": 0}
+
+    class CountingLoader:
+        @staticmethod
+        def load_from_path(config_path):
+            state["started"] += 1
+            outstanding.append(state["started"] - state["folded"])
+            return {"ENV": config_path.name}
+
+    class CountingMatrix(ConfigMatrix):
+        def add(self, env_name, config):
+            state["folded"] += 1
+            super().add(env_name, config)
+
+    env_paths = {f"env{i}": Path(f"env{i}") for i in range(8)}
+    matrix, errors = CountingMatrix.from_paths(env_paths, jobs=2, loader=CountingLoader)
+
+    assert not errors
+    assert matrix.environments == list(env_paths)
+    assert matrix.to_dict("env5") == {"ENV": "env5"}
+    assert max(outstanding) <= 2
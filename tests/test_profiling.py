@@ -0,0 +1,137 @@
+"""
+Tests for profiling hooks
+"""
+
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sap_config_guard.core import profiling
+from sap_config_guard.core.compiled import CompiledSchema
+from sap_config_guard.core.profiling import Profiler
+from sap_config_guard.core.schema import ConfigSchema
+from sap_config_guard.core.validator import ConfigValidator
+from sap_config_guard.diff.env_diff import EnvironmentDiff
+
+
+def test_profiler_records_load_and_check_stages():
+    """Test stage timings, counters and hooks for a validate run"""
+    with TemporaryDirectory() as tmpdir:
+        config_dir = Path(tmpdir)
+        (config_dir / ".env").write_text("SAP_CLIENT=100\nSAP_SYSTEM_ID=DEV\n")
+        (config_dir / "config.yaml").write_text("SAP:\n  API_URL: https://x\n")
+
+        seen = []
+        validator = ConfigValidator(ConfigSchema())
+        with Profiler(hooks=[lambda name, seconds: seen.append(name)]) as profiler:
+            validator.validate(config_dir, environment="prod")
+
+        summary = profiler.summary()
+        for name in (
+            "load",
+            "load.parse.env",
+            "load.parse.yaml",
+            "load.flatten",
+            "check.required",
+            "check.patterns",
+            "check.production",
+        ):
+            assert summary["stages"][name]["calls"] == 1
+        assert summary["counters"]["files"] == 2
+        assert summary["counters"]["keys"] == 3
+        assert summary["counters"]["values_scanned"] == 3
+        assert summary["counters"]["rules_evaluated"] > 0
+        assert "check.secure" in seen
+        assert json.loads(profiler.report("json")) == summary
+        assert "load.parse.yaml" in profiler.report()
+
+
+def test_profiled_check_matches_check():
+    """Test per-family profiled checks return the same results"""
+    plan = CompiledSchema(
+        {
+            "required": ["A", "B", "S"],
+            "patterns": {"A": r"^\d+$"},
+            "secure": ["S", "T"],
+            "min_lengths": {"B": 3},
+            "forbidden_in_prod": ["dev"],
+        }
+    )
+    config = {"A": "x1", "B": "ab", "S": "short", "V": "dev-host"}
+
+    expected = plan.check(config, production=True)
+    with Profiler():
+        assert plan.check(config, production=True) == expected
+    assert profiling.active() is None
+
+
+def test_diff_profiling_and_disabled_profiler():
+    """Test diff stages, and that nothing is recorded when inactive"""
+    with TemporaryDirectory() as tmpdir:
+        dev = Path(tmpdir) / "dev"
+        qa = Path(tmpdir) / "qa"
+        dev.mkdir()
+        qa.mkdir()
+        (dev / ".env").write_text("A=1\nB=2\n")
+        (qa / ".env").write_text("A=1\nC=3\n")
+
+        profiler = Profiler()
+        EnvironmentDiff.compare_environments({"dev": dev, "qa": qa})
+        assert profiler.summary() == {"stages": {}, "counters": {}}
+
+        with profiler:
+            EnvironmentDiff.compare_environments({"dev": dev, "qa": qa})
+        summary = profiler.summary()
+        assert summary["stages"]["diff.load"]["calls"] == 1
+        assert summary["stages"]["diff.compare"]["calls"] == 1
+        assert summary["stages"]["load"]["calls"] == 2
+        assert summary["counters"]["keys_compared"] == 3
+
+
+def test_overlapping_profilers_in_threads_stay_separate():
+    """Test that profilers entered in threads never leak into each other"""
+    import threading
+
+    entered = threading.Barrier(2)
+    seen = {}
+
+    def profile(name, leave_first):
+        with Profiler() as profiler:
+            entered.wait()
+            if not leave_first:
+                entered.wait()
+            seen[name] = profiling.active() is profiler
+        if leave_first:
+            entered.wait()
+
+    threads = [
+        threading.Thread(target=profile, args=("a", True)),
+        threading.Thread(target=profile, args=("b", False)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {"a": True, "b": True}
+    assert profiling.active() is None
+
+
+def test_thread_pool_loads_report_to_the_submitter():
+    """Test that loader threads record into the profiler that started them"""
+    from sap_config_guard.core.discovery import TreeLoader
+    from sap_config_guard.core.matrix import ConfigMatrix
+
+    with TemporaryDirectory() as tmpdir:
+        for name in ("dev", "qa"):
+            (Path(tmpdir) / name).mkdir()
+            (Path(tmpdir) / name / ".env").write_text("SAP_CLIENT=100\n")
+            (Path(tmpdir) / name / "app.properties").write_text("a.b=1\n")
+        env_paths = {name: Path(tmpdir) / name for name in ("dev", "qa")}
+
+        with Profiler() as profiler:
+            EnvironmentDiff.load_environments(env_paths, jobs=2)
+            ConfigMatrix.from_paths(env_paths, jobs=2)
+            TreeLoader(workers=2).load_from_path(env_paths["dev"])
+
+        assert profiler.summary()["counters"]["files"] == 6
@@ -0,0 +1,65 @@
+"""
+Tests for the forbidden-term scanner
+"""
+
+from sap_config_guard.core.scanner import ForbiddenScanner
+from sap_config_guard.core.schema import ConfigSchema
+
+
+def test_find_reports_matched_term():
+    """Test that the scanner reports which term matched"""
+    scanner = ForbiddenScanner(["mock", "localhost", "127.0.0.1"])
+
+    assert scanner.find("http://LOCALHOST:8080") == "localhost"
+    assert scanner.find("http://127.0.0.1/api") == "127.0.0.1"
+    assert scanner.find("https://prod.sap.com") is None
+
+
+def test_mixed_case_terms_match_any_case():
+    """Test that term case is folded like value case, and empty terms skipped"""
+    scanner = ForbiddenScanner(["MockServer", ""])
+    schema = ConfigSchema()
+    schema.schema = {"forbidden_in_prod": ["MockServer", ""]}
+    schema.invalidate()
+
+    assert scanner.terms == ("mockserver",)
+    assert scanner.find("http://mockserver:1080") == "mockserver"
+    assert scanner.find("http://MOCKSERVER:1080") == "mockserver"
+    assert scanner.find("https://prod.sap.com") is None
+    assert schema.is_forbidden_in_prod("https://MockServer.local")
+    assert not schema.is_forbidden_in_prod("https://prod.sap.com")
+
+
+def test_find_prefers_longest_term_with_shared_prefix():
+    """Test that overlapping prefixes resolve to the longest term"""
+    scanner = ForbiddenScanner(["local", "localhost", "lo"])
+
+    assert scanner.find("https://localhost") == "localhost"
+    assert scanner.find("https://local.net") == "local"
+    assert scanner.find("slow") == "lo"
+
+
+def test_regex_metacharacters_are_literal():
+    """Test that terms are matched literally"""
+    scanner = ForbiddenScanner(["a.b", "(x)"])
+
+    assert scanner.find("axb") is None
+    assert scanner.find("a.b") == "a.b"
+    assert scanner.find("f(x)") == "(x)"
+
+
+def test_empty_scanner_matches_nothing():
+    """Test that a schema without forbidden terms never matches"""
+    scanner = ForbiddenScanner(["", None])
+
+    assert not scanner
+    assert scanner.find("localhost") is None
+
+
+def test_schema_find_forbidden_in_prod():
+    """Test the ConfigSchema helper for forbidden terms"""
+    schema = ConfigSchema()
+
+    assert schema.find_forbidden_in_prod("http://mock-server") == "mock"
+    assert schema.is_forbidden_in_prod("http://mock-server")
+    assert not schema.is_forbidden_in_prod("https://api.sap.com")
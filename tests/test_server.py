@@ -0,0 +1,213 @@
+"""
+Tests for the resident validation server
+"""
+
+import json
+import os
+import socket
+import stat
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sap_config_guard.core.cache import SchemaCache
+from sap_config_guard.server import client as server_client
+from sap_config_guard.server.client import ServerClient
+from sap_config_guard.server.service import (
+    LocalHTTPServer,
+    UnixSocketServer,
+    ValidationService,
+)
+
+
+def _start(server):
+    """Serve in a background thread"""
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_socket_validate_and_diff():
+    """Test validate and diff over the Unix socket, reusing parsed files"""
+    with TemporaryDirectory() as tmpdir:
+        dev_dir = Path(tmpdir) / "dev"
+        qa_dir = Path(tmpdir) / "qa"
+        dev_dir.mkdir()
+        qa_dir.mkdir()
+        (dev_dir / ".env").write_text("SAP_CLIENT=100\n")
+        (qa_dir / ".env").write_text("SAP_CLIENT=200\n")
+
+        service = ValidationService(SchemaCache(Path(tmpdir) / "cache"))
+        socket_path = Path(tmpdir) / "server.sock"
+        umask = os.umask(0o022)
+        os.umask(umask)
+        server = _start(UnixSocketServer(socket_path, service))
+        mode = stat.S_IMODE(socket_path.stat().st_mode)
+        try:
+            with ServerClient.connect(socket_path) as client:
+                first = client.request("validate", config_path=str(dev_dir))
+                second = client.request("validate", config_path=str(dev_dir))
+                diff = client.request(
+                    "diff", environments={"dev": str(dev_dir), "qa": str(qa_dir)}
+                )
+                stats = client.request("stats")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert first["ok"] and not first["is_valid"]
+        assert second == first
+        assert {r["key"] for r in first["results"]} >= {"SAP_SYSTEM_ID"}
+        assert diff["results"] == [
+            {
+                "key": "SAP_CLIENT",
+                "environments": {"dev": "100", "qa": "200"},
+                "status": "different",
+                "missing_in": [],
+            }
+        ]
+        assert stats["loader_misses"] == 2 and stats["loader_hits"] >= 2
+        assert mode == 0o600
+        assert os.umask(umask) == umask
+        assert not socket_path.exists()
+
+
+def test_bad_requests_get_error_responses():
+    """Test that malformed requests are answered, not dropped"""
+    service = ValidationService(SchemaCache())
+    assert service.handle({"command": "explode"})["ok"] is False
+    assert "config_path" in service.handle({"command": "validate"})["error"]
+    missing = service.handle({"command": "validate", "config_path": "/nonexistent"})
+    assert missing["ok"] is False
+
+
+def _post(server, path, body, headers):
+    """POST to the HTTP listener, returning (status, decoded body)"""
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_port}{path}",
+        data=body,
+        headers=headers,
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_http_validate():
+    """Test POSTing a validate request to the localhost HTTP listener"""
+    with TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / ".env").write_text(
+            "SAP_CLIENT=100\nSAP_SYSTEM_ID=PRD\nSAP_API_URL=https://api.sap.com\n"
+        )
+        service = ValidationService(SchemaCache(Path(tmpdir) / "cache"))
+        token_path = Path(tmpdir) / "server.token"
+        server = _start(LocalHTTPServer(0, service, token_path))
+        try:
+            token = token_path.read_text()
+            status, body = _post(
+                server,
+                "/validate",
+                json.dumps({"config_path": tmpdir}).encode("utf-8"),
+                {
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {token}",
+                },
+            )
+            mode = token_path.stat().st_mode & 0o777
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert status == 200
+        assert body["ok"] and body["is_valid"]
+        assert all(r["level"] == "warning" for r in body["results"])
+        assert mode == 0o600
+        assert not token_path.exists()
+
+
+def test_http_rejects_foreign_hosts_types_and_tokens():
+    """Test that DNS-rebound, simple cross-site and tokenless posts fail"""
+    with TemporaryDirectory() as tmpdir:
+        service = ValidationService(SchemaCache(Path(tmpdir) / "cache"))
+        token_path = Path(tmpdir) / "server.token"
+        server = _start(LocalHTTPServer(0, service, token_path))
+        body = json.dumps({"environments": {"a": tmpdir}}).encode("utf-8")
+        try:
+            token = token_path.read_text()
+            good = {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {token}",
+            }
+            variants = [
+                ("/diff", dict(good, Host="evil.example")),
+                ("/diff", dict(good, **{"Content-Type": "text/plain"})),
+                ("/diff", {"Content-Type": "application/json"}),
+                ("/diff", dict(good, Authorization="Bearer x")),
+                ("/ping", dict(good, Host="localhost:1")),
+            ]
+            statuses = [_post(server, path, body, h)[0] for path, h in variants]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert statuses == [403, 415, 401, 401, 200]
+
+
+def test_missing_schema_falls_back_like_local_runs():
+    """Test that a nonexistent schema path uses the default schema"""
+    with TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / ".env").write_text(
+            "SAP_CLIENT=100\nSAP_SYSTEM_ID=PRD\nSAP_API_URL=https://api.sap.com\n"
+        )
+        service = ValidationService(SchemaCache(Path(tmpdir) / "cache"))
+
+        response = service.handle(
+            {
+                "command": "validate",
+                "config_path": tmpdir,
+                "schema": str(Path(tmpdir) / "missing.yaml"),
+            }
+        )
+
+        assert response["ok"] and response["is_valid"]
+        assert response == service.handle(
+            {"command": "validate", "config_path": tmpdir}
+        )
+
+
+def test_client_ignores_server_of_another_version(monkeypatch):
+    """Test that a server left running across an upgrade is not used"""
+    with TemporaryDirectory() as tmpdir:
+        service = ValidationService(SchemaCache(Path(tmpdir) / "cache"))
+        socket_path = Path(tmpdir) / "server.sock"
+        server = _start(UnixSocketServer(socket_path, service))
+        try:
+            client = ServerClient.connect(socket_path)
+            assert client is not None
+            client.close()
+
+            monkeypatch.setattr(service, "_handle_ping", lambda r: {"version": "0.0"})
+            assert ServerClient.connect(socket_path) is None
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_client_gives_up_quickly_on_a_wedged_server(monkeypatch):
+    """Test that a server that never answers the ping is treated as absent"""
+    monkeypatch.setattr(server_client, "PING_TIMEOUT", 0.2)
+    with TemporaryDirectory() as tmpdir:
+        socket_path = Path(tmpdir) / "server.sock"
+        wedged = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        wedged.bind(str(socket_path))
+        wedged.listen(1)
+        try:
+            start = time.monotonic()
+            assert ServerClient.connect(socket_path) is None
+            assert time.monotonic() - start < 5
+        finally:
+            wedged.close()
@@ -0,0 +1,143 @@
+"""
+Tests for baseline snapshots
+"""
+
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import hashlib
+import stat
+import zlib
+
+import pytest
+
+from sap_config_guard.diff.snapshot import SNAPSHOT_MAGIC, Snapshot, snapshot_key
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(monkeypatch, tmp_path):
+    """Keep the snapshot key out of the real cache directory"""
+    monkeypatch.setenv("SAP_CONFIG_GUARD_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("SAP_CONFIG_GUARD_SNAPSHOT_KEY", raising=False)
+
+
+def test_snapshot_round_trip_without_raw_values():
+    """Test that snapshots persist key hashes but not values"""
+    with TemporaryDirectory() as tmpdir:
+        dev_dir = Path(tmpdir) / "dev"
+        dev_dir.mkdir()
+        (dev_dir / ".env").write_text("SAP_CLIENT=100\nSAP_PASSWORD=hunter22\n")
+        snapshot_path = Path(tmpdir) / "baseline.snap"
+
+        snapshot, errors = Snapshot.capture({"dev": dev_dir})
+        snapshot.save(snapshot_path)
+        loaded = Snapshot.load(snapshot_path)
+
+        assert errors == {}
+        assert snapshot_path.read_bytes().startswith(SNAPSHOT_MAGIC)
+        assert b"hunter22" not in snapshot_path.read_bytes()
+        assert loaded.key_hashes("dev") == snapshot.key_hashes("dev")
+        assert set(loaded.key_hashes("dev")) == {"SAP_CLIENT", "SAP_PASSWORD"}
+
+
+def test_compare_reports_changes_and_reparses_only_changed_files():
+    """Test drift detection and incremental re-reading"""
+    with TemporaryDirectory() as tmpdir:
+        dev_dir = Path(tmpdir) / "dev"
+        qa_dir = Path(tmpdir) / "qa"
+        dev_dir.mkdir()
+        qa_dir.mkdir()
+        (dev_dir / ".env").write_text("SAP_CLIENT=100\nSAP_TIMEOUT=30\n")
+        (qa_dir / ".env").write_text("SAP_CLIENT=200\n")
+        baseline, _ = Snapshot.capture({"dev": dev_dir, "qa": qa_dir})
+
+        # Same content, new mtime: hashed again but not parsed
+        qa_env = qa_dir / ".env"
+        os.utime(qa_env, ns=(0, qa_env.stat().st_mtime_ns + 10**9))
+        (dev_dir / ".env").write_text("SAP_CLIENT=101\nSAP_URL=https://x\n")
+
+        live, errors = Snapshot.capture(baseline.paths(), previous=baseline)
+        drift = baseline.compare(live)
+
+        assert errors == {}
+        assert live.stats == {"reused": 0, "rehashed": 1, "parsed": 1}
+        assert [(d.environment, d.key, d.status) for d in drift] == [
+            ("dev", "SAP_CLIENT", "changed"),
+            ("dev", "SAP_TIMEOUT", "removed"),
+            ("dev", "SAP_URL", "added"),
+        ]
+
+
+def test_compare_reports_environments_on_one_side_only():
+    """Test that removed and new environments count as drift"""
+    with TemporaryDirectory() as tmpdir:
+        for name in ("dev", "qa", "prd"):
+            (Path(tmpdir) / name).mkdir()
+            (Path(tmpdir) / name / ".env").write_text("SAP_CLIENT=100\n")
+        paths = {name: Path(tmpdir) / name for name in ("dev", "qa", "prd")}
+        baseline, _ = Snapshot.capture({"dev": paths["dev"], "qa": paths["qa"]})
+
+        live, _ = Snapshot.capture({"dev": paths["dev"], "prd": paths["prd"]})
+        drift = baseline.compare(live)
+
+        assert [(d.environment, d.key, d.status) for d in drift] == [
+            ("qa", None, "removed"),
+            ("prd", None, "added"),
+        ]
+        assert "qa" in drift[0].message and "not captured" in drift[0].message
+
+
+def test_load_rejects_corrupt_snapshots():
+    """Test that truncated or malformed payloads raise ValueError"""
+    with TemporaryDirectory() as tmpdir:
+        dev_dir = Path(tmpdir) / "dev"
+        dev_dir.mkdir()
+        (dev_dir / ".env").write_text("SAP_CLIENT=100\n")
+        snapshot_path = Path(tmpdir) / "baseline.snap"
+        Snapshot.capture({"dev": dev_dir})[0].save(snapshot_path)
+        data = snapshot_path.read_bytes()
+
+        for payload in (
+            data[: len(data) // 2],
+            SNAPSHOT_MAGIC + zlib.compress(b"{}"),
+            SNAPSHOT_MAGIC + zlib.compress(b"[]"),
+            SNAPSHOT_MAGIC + zlib.compress(b"{not json"),
+        ):
+            snapshot_path.write_bytes(payload)
+            with pytest.raises(ValueError, match="Corrupt snapshot"):
+                Snapshot.load(snapshot_path)
+
+
+def test_capture_collects_errors():
+    """Test that an unreadable environment is reported, not raised"""
+    with TemporaryDirectory() as tmpdir:
+        snapshot, errors = Snapshot.capture({"qa": Path(tmpdir) / "missing"})
+
+        assert list(errors) == ["qa"]
+        assert snapshot.environments == {}
+
+
+def test_hashes_are_keyed_with_a_private_key(monkeypatch):
+    """Test that value hashes cannot be reproduced without the key"""
+    with TemporaryDirectory() as tmpdir:
+        dev_dir = Path(tmpdir) / "dev"
+        dev_dir.mkdir()
+        (dev_dir / ".env").write_text("SAP_PASSWORD=hunter22\n")
+
+        snapshot, _ = Snapshot.capture({"dev": dev_dir})
+        stored = snapshot.key_hashes("dev")["SAP_PASSWORD"]
+        guess = hashlib.blake2b(b"hunter22", digest_size=8).hexdigest()
+        key_file = Path(os.environ["SAP_CONFIG_GUARD_CACHE_DIR"]) / "snapshot.key"
+
+        assert stored != guess
+        assert snapshot_key() == key_file.read_bytes()
+        assert stat.S_IMODE(key_file.stat().st_mode) == 0o600
+
+        monkeypatch.setenv("SAP_CONFIG_GUARD_SNAPSHOT_KEY", "shared-ci-secret")
+        other, _ = Snapshot.capture({"dev": dev_dir}, previous=snapshot)
+
+        assert other.key_hashes("dev")["SAP_PASSWORD"] != stored
+        assert other.stats["parsed"] == 1
+        with pytest.raises(ValueError):
+            snapshot.compare(other)
@@ -0,0 +1,95 @@
+"""
+Tests for CLI startup cost
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+
+# Cumulative -X importtime budget for sap_config_guard.cli.main, in ms
+IMPORT_BUDGET_MS = 100
+
+HEAVY_MODULES = [
+    "yaml",
+    "orjson",
+    "concurrent.futures",
+    "multiprocessing",
+    "sap_config_guard.core.validator",
+    "sap_config_guard.diff.env_diff",
+]
+
+
+def _run(code, cwd, *flags):
+    """Run Python code in a fresh interpreter with the repo importable"""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, SAP_CONFIG_GUARD_CACHE_DIR=cwd)
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def _loaded_after(code, cwd):
+    """Get which of HEAVY_MODULES are imported after running code"""
+    probe = (
+        "import sys, json\n"
+        f"{code}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    proc = _run(probe, cwd)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def test_help_imports_no_subsystems():
+    """Test that --help does not import parsers, pools or the validator"""
+    with TemporaryDirectory() as tmpdir:
+        code = (
+            "sys.argv = ['sap-config-guard', '--help']\n"
+            "from sap_config_guard.cli import main\n"
+            "try:\n"
+            "    main.main()\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+        assert _loaded_after(code, tmpdir) == []
+
+
+def test_env_validation_skips_yaml_and_process_pool():
+    """Test that validating .env files leaves YAML and multiprocessing unloaded"""
+    with TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / ".env").write_text("SAP_CLIENT=100\n")
+        code = (
+            "sys.argv = ['sap-config-guard', 'validate', '.', '--no-cache']\n"
+            "from sap_config_guard.cli import main\n"
+            "try:\n"
+            "    main.main()\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+        loaded = _loaded_after(code, tmpdir)
+        assert "sap_config_guard.core.validator" in loaded
+        for module in ("yaml", "orjson", "multiprocessing"):
+            assert module not in loaded
+
+
+def test_cli_import_within_budget():
+    """Test that importing the CLI stays within the startup budget"""
+    with TemporaryDirectory() as tmpdir:
+        proc = _run("import sap_config_guard.cli.main", tmpdir, "-X", "importtime")
+        assert proc.returncode == 0, proc.stderr
+        for line in proc.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == "sap_config_guard.cli.main":
+                cumulative_ms = int(fields[1]) / 1000
+                break
+        else:
+            raise AssertionError("no import time reported for the CLI module")
+        assert cumulative_ms < IMPORT_BUDGET_MS
@@ -2,10 +2,19 @@
 Tests for configuration validator
 """
 
+import asyncio
+import threading
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from sap_config_guard.core.validator import ConfigValidator, ValidationLevel
+import pytest
+
+from sap_config_guard.core.loader import ConfigLoader
+from sap_config_guard.core.validator import (
+    ConfigValidator,
+    ValidationLevel,
+    async_validate,
+)
 from sap_config_guard.core.schema import ConfigSchema
 
 
@@ -104,3 +113,177 @@ def test_min_length_validation():
 
         assert not is_valid
         assert any("too short" in str(r).lower() or "8" in str(r) for r in results)
+
+
+def test_validate_many():
+    """Test batch validation across worker processes"""
+    validator = ConfigValidator(schema=ConfigSchema())
+
+    with TemporaryDirectory() as tmpdir:
+        good_dir = Path(tmpdir) / "good"
+        bad_dir = Path(tmpdir) / "bad"
+        good_dir.mkdir()
+        bad_dir.mkdir()
+        (good_dir / ".env").write_text(
+            "SAP_CLIENT=100\nSAP_SYSTEM_ID=ABC\nSAP_API_URL=https://api.sap.com\n"
+        )
+        (bad_dir / ".env").write_text("SAP_CLIENT=12\n")
+
+        for workers in (1, 2):
+            outcomes = {
+                path: is_valid
+                for path, _, is_valid in validator.validate_many(
+                    [good_dir, bad_dir], workers=workers
+                )
+            }
+
+            assert outcomes == {good_dir: True, bad_dir: False}
+
+
+def test_iter_validate_streams_results():
+    """Test streaming validation agrees with validate()"""
+    validator = ConfigValidator(schema=ConfigSchema())
+
+    with TemporaryDirectory() as tmpdir:
+        config_file = Path(tmpdir) / "config.env"
+        config_file.write_text(
+            "SAP_CLIENT=12\nSAP_API_URL=http://localhost\nSAP_SYSTEM_ID=\n"
+        )
+
+        results = list(validator.iter_validate(config_file, environment="prod"))
+        expected, _ = validator.validate(config_file, environment="prod")
+
+        assert results == expected
+        assert results[0].message == "Missing required key: SAP_SYSTEM_ID"
+        assert "Production violation" in results[-1].message
+
+
+def test_iter_validate_last_definition_wins():
+    """Test that overridden definitions do not produce results"""
+    validator = ConfigValidator(schema=ConfigSchema())
+
+    with TemporaryDirectory() as tmpdir:
+        config_file = Path(tmpdir) / "config.env"
+        config_file.write_text(
+            "SAP_CLIENT=abc\nDB_HOST=localhost\nSAP_SYSTEM_ID=PRD\n"
+            "SAP_API_URL=https://api.sap.com\nSAP_CLIENT=100\n"
+            "DB_HOST=db.prod\n"
+        )
+
+        results = list(validator.iter_validate(config_file, environment="prod"))
+        expected, is_valid = validator.validate(config_file, environment="prod")
+
+        assert results == expected
+        assert is_valid
+        assert not [r for r in results if r.level.value == "error"]
+
+
+def test_iter_validate_orders_violations_by_first_violation():
+    """Test a clean definition followed by a dirty redefinition"""
+    validator = ConfigValidator(schema=ConfigSchema())
+
+    with TemporaryDirectory() as tmpdir:
+        config_file = Path(tmpdir) / "config.env"
+        config_file.write_text("B=https://x\nA=devx\nB=mock1\n")
+
+        results = list(validator.iter_validate(config_file, environment="prod"))
+        expected, _ = validator.validate(config_file, environment="prod")
+        violations = [r.key for r in results if r.rule == "forbidden_in_prod"]
+
+        assert sorted(results, key=repr) == sorted(expected, key=repr)
+        assert violations == ["A", "B"]
+        assert [r.key for r in expected if r.rule == "forbidden_in_prod"] == [
+            "B",
+            "A",
+        ]
+
+
+def test_async_validate_runs_concurrently():
+    """Test that several async validations are multiplexed on one loop"""
+    with TemporaryDirectory() as tmpdir:
+        paths = []
+        for name, client in [("a", "100"), ("b", "12"), ("c", "300")]:
+            config_dir = Path(tmpdir) / name
+            config_dir.mkdir()
+            (config_dir / ".env").write_text(
+                f"SAP_CLIENT={client}\nSAP_SYSTEM_ID=ABC\n"
+                "SAP_API_URL=https://api.sap.com\n"
+            )
+            paths.append(str(config_dir))
+
+        async def main():
+            validator = ConfigValidator(schema=ConfigSchema())
+            return await asyncio.gather(
+                *(async_validate(p, validator=validator, timeout=10) for p in paths)
+            )
+
+        outcomes = asyncio.run(main())
+
+        assert [is_valid for _, is_valid in outcomes] == [True, False, True]
+
+
+def test_async_validate_timeout():
+    """Test that a stalled load raises TimeoutError without blocking the loop"""
+    release = threading.Event()
+
+    class StalledLoader(ConfigLoader):
+        @staticmethod
+        def load_from_path(config_path, keys=None):
+            release.wait(5)
+            return {}
+
+    async def main():
+        validator = ConfigValidator(schema=ConfigSchema(), loader=StalledLoader)
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.ensure_future(tick())
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await async_validate(".", validator=validator, timeout=0.2)
+        finally:
+            ticker.cancel()
+            release.set()
+        return ticks
+
+    assert asyncio.run(main()) > 5
+
+
+def test_summarize_counts_results():
+    """Test the counts-only validation mode"""
+    validator = ConfigValidator(schema=ConfigSchema())
+
+    with TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / ".env").write_text(
+            "SAP_CLIENT=100\nSAP_SYSTEM_ID=ABC\nSAP_API_URL=https://localhost\n"
+        )
+
+        summary, is_valid = validator.summarize(Path(tmpdir))
+        prod_summary, prod_valid = validator.summarize(Path(tmpdir), "prod")
+        strict_summary, strict_valid = validator.summarize(
+            Path(tmpdir), fail_on_warning=True
+        )
+
+        assert (summary.errors, summary.warnings, is_valid) == (0, 4, True)
+        assert (prod_summary.errors, prod_valid) == (1, False)
+        assert strict_summary == summary and not strict_valid
+
+
+def test_validate_fail_fast_reports_one_failure():
+    """Test that fail-fast stops at the first error"""
+    validator = ConfigValidator(schema=ConfigSchema())
+
+    with TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / ".env").write_text("SAP_CLIENT=12\n")
+
+        full, full_valid = validator.validate(Path(tmpdir))
+        fast, fast_valid = validator.validate(Path(tmpdir), fail_fast=True)
+
+        assert full_valid is fast_valid is False
+        assert len(full) > 1
+        assert [r.message for r in fast] == ["Missing required key: SAP_SYSTEM_ID"]
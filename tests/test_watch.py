@@ -0,0 +1,55 @@
+"""
+Tests for watch mode
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sap_config_guard.core.schema import ConfigSchema
+from sap_config_guard.core.validator import ConfigValidator
+from sap_config_guard.core.watch import ConfigWatcher
+
+
+def test_watch_revalidates_changed_keys():
+    """Test that polling picks up changes and re-checks only those keys"""
+    validator = ConfigValidator(schema=ConfigSchema())
+
+    with TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / ".env"
+        env_file.write_text(
+            "SAP_CLIENT=12\nSAP_SYSTEM_ID=ABC\nSAP_API_URL=https://api.sap.com\n"
+        )
+        watcher = ConfigWatcher(validator, Path(tmpdir))
+
+        initial = watcher.start()
+        assert not initial.is_valid
+        assert watcher.poll() is None
+
+        env_file.write_text(
+            "SAP_CLIENT=100\nSAP_SYSTEM_ID=ABC\nSAP_API_URL=https://api.sap.com\n"
+        )
+        update = watcher.poll()
+
+        assert update.changed_keys == ["SAP_CLIENT"]
+        assert update.is_valid
+        assert not any(r.key == "SAP_CLIENT" for r in update.results)
+
+
+def test_watch_production_checks_new_keys():
+    """Test that new values are scanned for production violations"""
+    validator = ConfigValidator(schema=ConfigSchema())
+
+    with TemporaryDirectory() as tmpdir:
+        env_file = Path(tmpdir) / ".env"
+        base = "SAP_CLIENT=100\nSAP_SYSTEM_ID=ABC\nSAP_API_URL=https://api.sap.com\n"
+        env_file.write_text(base)
+        watcher = ConfigWatcher(validator, Path(tmpdir), environment="prod")
+
+        assert watcher.start().is_valid
+
+        env_file.write_text(base + "BACKEND_URL=http://localhost:8080\n")
+        update = watcher.poll()
+
+        assert update.changed_keys == ["BACKEND_URL"]
+        assert not update.is_valid
+        assert any(r.key == "BACKEND_URL" for r in update.results)